@@ -3,23 +3,55 @@ FastAPI Server for NEXUS Agent
 Provides REST API endpoints for frontend integration
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import msgspec
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import uvicorn
 import asyncio
+from contextlib import asynccontextmanager
+import hashlib
+import orjson
 from datetime import datetime
+from operator import attrgetter
 
 from agent.orchestration import OrchestrationEngine
 from agent.gemini_analyzer import TradePlan
 from agent.log_manager import get_log_manager
 
+# Reused msgspec encoder for Struct responses (built once, not per request)
+_json_encoder = msgspec.json.Encoder()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize and pre-warm the orchestration engine, clean up on shutdown"""
+    global engine, is_running
+    engine = OrchestrationEngine(
+        batch_size=100,
+        tier1_mock=True,  # Use mock mode for demo
+        tier2_mock=True
+    )
+    await engine.warmup()
+    print("NEXUS Agent API started successfully")
+    
+    yield
+    
+    is_running = False
+    stop_event.set()
+    await engine.aclose()
+    print("NEXUS Agent API shutting down")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="NEXUS Agent API",
     description="Two-tier crypto shorting signal screener",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -31,20 +63,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (/positions/*, /logs, /stats); small responses pass through
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Global engine instance
 engine = None
 is_running = False
+stop_event = asyncio.Event()  # Set to stop the background screening loop
 
 
 # Response models
-class StatusResponse(BaseModel):
+class StatusResponse(msgspec.Struct):
     status: str
     is_running: bool
     cycles_completed: int
-    timestamp: str
+    timestamp: datetime
 
 
-class CycleSummary(BaseModel):
+class CycleSummary(msgspec.Struct):
     cycle_number: int
     cycle_time_seconds: float
     signals_processed: int
@@ -54,7 +90,7 @@ class CycleSummary(BaseModel):
     gemini_api_cost: float
 
 
-class TradePlanResponse(BaseModel):
+class TradePlanResponse(msgspec.Struct):
     token_symbol: str
     token_address: str
     chain: str
@@ -70,37 +106,68 @@ class TradePlanResponse(BaseModel):
     risk_factors: List[str]
 
 
-# Startup/shutdown events
-@app.on_event("startup")
-async def startup():
-    """Initialize orchestration engine on startup"""
-    global engine
-    engine = OrchestrationEngine(
-        batch_size=100,
-        tier1_mock=True,  # Use mock mode for demo
-        tier2_mock=True
-    )
-    print("NEXUS Agent API started successfully")
+# Fields exposed by the /positions/* endpoints
+_TRADE_PLAN_FIELDS = TradePlanResponse.__struct_fields__
+_get_trade_plan_fields = attrgetter(*_TRADE_PLAN_FIELDS)
 
 
-@app.on_event("shutdown")
-async def shutdown():
-    """Cleanup on shutdown"""
-    global is_running
-    is_running = False
-    print("NEXUS Agent API shutting down")
+def _trade_plan_to_dict(tp: TradePlan) -> Dict[str, Any]:
+    """Plain dict view of a TradePlan - attributes are passed through unvalidated"""
+    return dict(zip(_TRADE_PLAN_FIELDS, _get_trade_plan_fields(tp)))
+
+
+# Serialized /positions/* payloads: key -> (body, etag), valid for one trade_plans_version.
+# Keys are bounded by the endpoints' validated query params (min_confidence is 0-100)
+_positions_cache: Dict[Tuple, Tuple[bytes, str]] = {}
+_positions_cache_version = -1
+_stats_etag: Tuple[Optional[bytes], str] = (None, "")
+
+
+def _make_etag(body: bytes) -> str:
+    """Strong ETag from a BLAKE2b digest of the response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _cached_positions(key: Tuple, get_plans: Callable[[], List[TradePlan]]) -> Tuple[bytes, str]:
+    """Serialize a /positions/* payload once per trade_plans change"""
+    global _positions_cache_version
+    
+    if _positions_cache_version != engine.trade_plans_version:
+        _positions_cache.clear()
+        _positions_cache_version = engine.trade_plans_version
+    
+    cached = _positions_cache.get(key)
+    if cached is None:
+        body = orjson.dumps([_trade_plan_to_dict(tp) for tp in get_plans()])
+        cached = _positions_cache[key] = (body, _make_etag(body))
+    
+    return cached
+
+
+def _etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return 304 when the client already holds this ETag, else the JSON body"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 # Endpoints
-@app.get("/", response_model=StatusResponse)
+@app.get("/", response_model=None)
 async def root():
     """Health check and status"""
-    return StatusResponse(
+    status = StatusResponse(
         status="online",
         is_running=is_running,
         cycles_completed=engine.stats["cycles_completed"] if engine else 0,
-        timestamp=datetime.utcnow().isoformat()
+        timestamp=datetime.utcnow()
     )
+    return Response(content=_json_encoder.encode(status), media_type="application/json")
 
 
 @app.post("/agent/start")
@@ -112,6 +179,7 @@ async def start_agent(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=400, detail="Agent is already running")
     
     is_running = True
+    stop_event.clear()
     
     # Run cycle in background
     background_tasks.add_task(run_screening_cycle)
@@ -128,84 +196,65 @@ async def stop_agent():
         raise HTTPException(status_code=400, detail="Agent is not running")
     
     is_running = False
+    stop_event.set()
     
     return {"message": "Agent stopped", "status": "stopped"}
 
 
-@app.post("/agent/cycle", response_model=CycleSummary)
+@app.post("/agent/cycle", response_model=None)
 async def run_single_cycle(signals: int = 500):
     """Run a single screening cycle manually"""
     if not engine:
         raise HTTPException(status_code=500, detail="Engine not initialized")
     
-    summary = engine.run_cycle(signals_per_cycle=signals)
+    summary = await engine.run_cycle(signals_per_cycle=signals)
     
-    return CycleSummary(**summary)
+    # convert() drops summary keys that CycleSummary doesn't declare
+    return Response(
+        content=_json_encoder.encode(msgspec.convert(summary, CycleSummary)),
+        media_type="application/json"
+    )
 
 
-@app.get("/positions/shorts", response_model=List[TradePlanResponse])
-async def get_short_positions(min_confidence: int = 70):
+@app.get("/positions/shorts", response_model=None)
+async def get_short_positions(request: Request, min_confidence: int = Query(70, ge=0, le=100)):
     """Get all SHORT recommendations"""
     if not engine:
         raise HTTPException(status_code=500, detail="Engine not initialized")
     
-    shorts = engine.get_short_recommendations(min_confidence=min_confidence)
+    body, etag = _cached_positions(
+        ("shorts", min_confidence),
+        lambda: engine.get_short_recommendations(min_confidence=min_confidence)
+    )
     
-    return [
-        TradePlanResponse(
-            token_symbol=tp.token_symbol,
-            token_address=tp.token_address,
-            chain=tp.chain,
-            decision=tp.decision,
-            confidence=tp.confidence,
-            position_size_percent=tp.position_size_percent,
-            take_profit_1_percent=tp.take_profit_1_percent,
-            take_profit_2_percent=tp.take_profit_2_percent,
-            take_profit_3_percent=tp.take_profit_3_percent,
-            stop_loss_percent=tp.stop_loss_percent,
-            best_execution_chain=tp.best_execution_chain,
-            reasoning=tp.reasoning,
-            risk_factors=tp.risk_factors
-        )
-        for tp in shorts
-    ]
+    return _etag_response(request, body, etag)
 
 
-@app.get("/positions/monitors", response_model=List[TradePlanResponse])
-async def get_monitor_list():
+@app.get("/positions/monitors", response_model=None)
+async def get_monitor_list(request: Request):
     """Get all tokens on MONITOR list"""
     if not engine:
         raise HTTPException(status_code=500, detail="Engine not initialized")
     
-    monitors = engine.get_monitor_list()
+    body, etag = _cached_positions(("monitors",), engine.get_monitor_list)
     
-    return [
-        TradePlanResponse(
-            token_symbol=tp.token_symbol,
-            token_address=tp.token_address,
-            chain=tp.chain,
-            decision=tp.decision,
-            confidence=tp.confidence,
-            position_size_percent=tp.position_size_percent,
-            take_profit_1_percent=tp.take_profit_1_percent,
-            take_profit_2_percent=tp.take_profit_2_percent,
-            take_profit_3_percent=tp.take_profit_3_percent,
-            stop_loss_percent=tp.stop_loss_percent,
-            best_execution_chain=tp.best_execution_chain,
-            reasoning=tp.reasoning,
-            risk_factors=tp.risk_factors
-        )
-        for tp in monitors
-    ]
+    return _etag_response(request, body, etag)
 
 
 @app.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get complete system statistics"""
+    global _stats_etag
     if not engine:
         raise HTTPException(status_code=500, detail="Engine not initialized")
     
-    return engine.get_full_stats()
+    body = engine.get_stats_snapshot()
+    
+    # The snapshot object only changes when a cycle completes
+    if _stats_etag[0] is not body:
+        _stats_etag = (body, _make_etag(body))
+    
+    return _etag_response(request, body, _stats_etag[1])
 
 
 @app.get("/logs")
@@ -217,13 +266,24 @@ async def get_recent_logs(
     """Get recent agent logs with optional filtering"""
     log_manager = get_log_manager()
     
-    logs = log_manager.get_logs(
+    logs = log_manager.iter_logs(
         limit=limit,
         log_type=log_type,
         severity=severity
     )
     
-    return {"logs": logs}
+    # Stream the JSON array entry by entry instead of building it in memory
+    def generate():
+        yield b'{"logs":['
+        first = True
+        for log in logs:
+            if not first:
+                yield b','
+            yield orjson.dumps(log)
+            first = False
+        yield b']}'
+    
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @app.get("/logs/stats")
@@ -246,24 +306,46 @@ async def run_screening_cycle():
     """Background task that runs continuous screening cycles"""
     global is_running, engine
     
-    while is_running:
+    while not stop_event.is_set():
         try:
-            # Run one cycle
-            engine.run_cycle(signals_per_cycle=500)
+            # Run one cycle (CPU-bound stages run in a worker thread)
+            await engine.run_cycle(signals_per_cycle=500)
             
-            # Wait before next cycle (10 seconds for demo)
-            await asyncio.sleep(10)
+            # Wait before next cycle (10 seconds for demo), waking early on stop
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                pass
         
         except Exception as e:
             print(f"Error in screening cycle: {e}")
-            is_running = False
+            stop_event.set()
+    
+    is_running = False
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "api_server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    import os
+    
+    # Development: auto-reload on code changes (NEXUS_API_DEV=true)
+    if os.getenv("NEXUS_API_DEV", "false").lower() == "true":
+        uvicorn.run(
+            "api_server:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Production: uvloop event loop + httptools parser, quiet logging.
+        # Engine state lives in-process, so workers default to 1.
+        uvicorn.run(
+            "api_server:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            log_level="warning",
+            workers=int(os.getenv("NEXUS_API_WORKERS", "1"))
+        )
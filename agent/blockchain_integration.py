@@ -3,14 +3,137 @@ Blockchain Integration Module
 Connects Python AI Agent to Blockchain Service (Node.js) and Smart Contracts
 """
 
+import asyncio
 import logging
-import requests
-from typing import List, Dict, Any, Optional
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import httpx
+import numpy as np
+import orjson
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
-import json
+from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Simplified (chain, symbol) -> token address mapping
+# In production: Use real token registry or API
+_TOKEN_ADDRESSES = {
+    ('arbitrum', 'USDC'): '0xaf88d065e77c8cC2239327C5EDb3A432268e5831',
+    ('arbitrum', 'WETH'): '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1',
+    ('arbitrum', 'WBTC'): '0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f',
+    ('arbitrum', 'LINK'): '0xf97f4df75117a78c1A5a0DBb814Af92458539FB4',
+    ('arbitrum', 'UNI'): '0xFa7F8980b0f1E64A2062791cc3b0871572f1F7f0',
+    ('arbitrum', 'ARB'): '0x912CE59144191C1204E64559FE8253a0e49E6548',
+    ('base', 'USDC'): '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913',
+    ('base', 'WETH'): '0x4200000000000000000000000000000000000006',
+    ('optimism', 'USDC'): '0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85',
+    ('optimism', 'WETH'): '0x4200000000000000000000000000000000000006',
+    ('optimism', 'OP'): '0x4200000000000000000000000000000000000042',
+}
+
+
+@lru_cache(maxsize=256)
+def _resolve_token_address(chain: str, symbol: str) -> Optional[str]:
+    """Memoized (chain, symbol) lookup - symbols are matched case-insensitively"""
+    return _TOKEN_ADDRESSES.get((chain, symbol.upper()))
+
+def _extract_token_address(signal: Dict[str, Any]) -> str:
+    """Extract or lookup token address from signal"""
+    # Try to get from signal metadata
+    if 'token_address' in signal:
+        return signal['token_address']
+    
+    # Try to extract from tokens list
+    tokens = signal.get('tokens', [])
+    if tokens and len(tokens) > 0:
+        # TODO: Lookup actual address
+        return '0x0000000000000000000000000000000000000000'
+    
+    return '0x0000000000000000000000000000000000000000'
+
+
+# Batches at least this large are hashed in a process pool instead of inline
+PARALLEL_HASH_MIN_SIGNALS = 2000
+
+_HASH_POOL_WORKERS = os.cpu_count() or 1
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Create the metadata-hash process pool on first use
+    
+    Workers are spawned, not forked: the pool starts from inside the running
+    event loop of a multi-threaded server, where forking is unsafe.
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=_HASH_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+
+def _shutdown_hash_pool():
+    """Stop the metadata-hash workers; the next large batch starts a new pool"""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
+
+def _hash_signals(signals: List[Dict[str, Any]]) -> List[str]:
+    """Create metadata hashes for signals (simplified - in production upload to IPFS)"""
+    # In production: Upload full signal JSON to IPFS, return hash
+    # For now: Create simple hash of the key-sorted JSON
+    dumps = orjson.dumps
+    sha256 = hashlib.sha256
+    sort_keys = orjson.OPT_SORT_KEYS
+    return ['0x' + sha256(dumps(s, option=sort_keys)).hexdigest() for s in signals]
+
+
+@dataclass(slots=True)
+class SignalBatch:
+    """Column-oriented (SoA) view of a batch of signal dicts for publishing"""
+    urgency: np.ndarray  # int16
+    signal_type: List[str]
+    chain: List[str]
+    token_address: List[str]
+    signals: List[Dict[str, Any]]  # Original dicts, hashed into metadataHash
+    
+    @classmethod
+    def from_signals(cls, signals: List[Dict[str, Any]]) -> "SignalBatch":
+        """Split signal dicts into aligned columns in a single pass"""
+        n = len(signals)
+        urgency = np.empty(n, dtype=np.int16)
+        signal_type, chain, token_address = [None] * n, [None] * n, [None] * n
+        get = dict.get
+        
+        for i, s in enumerate(signals):
+            urgency[i] = get(s, 'urgency', 0)
+            signal_type[i] = get(s, 'signal_type', 'REGULATORY_RISK')
+            chain[i] = get(s, 'chain', 'arbitrum')
+            token_address[i] = _extract_token_address(s)
+        
+        return cls(urgency, signal_type, chain, token_address, list(signals))
+
+
+@dataclass(slots=True)
+class IntegrationStats:
+    """Counters for blockchain publish/execution activity"""
+    signals_published: int = 0
+    shorts_executed: int = 0
+    dip_buys_executed: int = 0
+    positions_closed: int = 0
+    publish_errors: int = 0
+    execution_errors: int = 0
+
+
 class BlockchainIntegration:
     """Publishes signals and executes shorts via blockchain"""
     
@@ -26,26 +149,35 @@ class BlockchainIntegration:
         self.min_confidence_short = min_confidence_for_short
         self.enabled = enabled
         
-        self.stats = {
-            "signals_published": 0,
-            "shorts_executed": 0,
-            "dip_buys_executed": 0,
-            "positions_closed": 0,
-            "publish_errors": 0,
-            "execution_errors": 0
-        }
+        # Shared async client - created once, closed via aclose() on shutdown.
+        # Keep-alive pool so publishes/executions reuse connections (HTTP/2 when served over TLS)
+        self._client: Optional[httpx.AsyncClient] = (
+            httpx.AsyncClient(
+                base_url=blockchain_service_url,
+                timeout=httpx.Timeout(120.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=2,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+                )
+            )
+            if enabled else None
+        )
+        
+        self.stats = IntegrationStats()
         
         if self.enabled:
             logger.info(f"Blockchain integration initialized: {blockchain_service_url}")
         else:
             logger.info("Blockchain integration DISABLED")
     
-    def publish_signals(self, signals: List[Dict[str, Any]]) -> Optional[str]:
+    async def publish_signals(self, signals: Union[List[Dict[str, Any]], SignalBatch]) -> Optional[str]:
         """
         Publish signals to SignalOracle contract
         
         Args:
-            signals: List of signal dicts with urgency, type, tokens, etc.
+            signals: List of signal dicts with urgency, type, tokens, etc.,
+                or a SignalBatch already split into columns
         
         Returns:
             Transaction hash if successful, None otherwise
@@ -54,33 +186,39 @@ class BlockchainIntegration:
             logger.debug("Blockchain disabled - skipping signal publish")
             return None
         
-        # Filter signals above minimum confidence
-        high_confidence = [
-            s for s in signals 
-            if s.get('urgency', 0) >= self.min_confidence_publish
-        ]
+        batch = signals if isinstance(signals, SignalBatch) else SignalBatch.from_signals(signals)
+        
+        # Filter signals above minimum confidence (vectorized mask over the urgency column)
+        selected = np.flatnonzero(batch.urgency >= self.min_confidence_publish)
         
-        if not high_confidence:
+        if not selected.size:
             logger.debug(f"No signals above {self.min_confidence_publish} confidence threshold")
             return None
         
         try:
-            # Format signals for blockchain
-            blockchain_signals = []
-            for signal in high_confidence:
-                blockchain_signals.append({
-                    'type': signal.get('signal_type', 'REGULATORY_RISK'),
-                    'tokenAddress': self._extract_token_address(signal),
-                    'chain': signal.get('chain', 'arbitrum'),
-                    'score': min(100, signal.get('urgency', 50) * 10),
-                    'urgency': signal.get('urgency', 5),
-                    'metadataHash': self._create_metadata_hash(signal)
-                })
+            # Format signals for blockchain from the aligned columns
+            urgencies = batch.urgency[selected]
+            scores = np.minimum(urgencies * 10, 100).tolist()
+            selected = selected.tolist()
+            metadata_hashes = await self._create_metadata_hashes([batch.signals[i] for i in selected])
+            signal_type, chain, token_address = batch.signal_type, batch.chain, batch.token_address
+            blockchain_signals = [
+                {
+                    'type': signal_type[i],
+                    'tokenAddress': token_address[i],
+                    'chain': chain[i],
+                    'score': score,
+                    'urgency': urgency,
+                    'metadataHash': metadata_hash
+                }
+                for i, score, urgency, metadata_hash
+                in zip(selected, scores, urgencies.tolist(), metadata_hashes)
+            ]
             
             logger.info(f"📡 Publishing {len(blockchain_signals)} signals to blockchain...")
             
-            response = requests.post(
-                f"{self.blockchain_url}/api/signals/publish",
+            response = await self._client.post(
+                "/api/signals/publish",
                 json={'signals': blockchain_signals},
                 timeout=30
             )
@@ -89,21 +227,21 @@ class BlockchainIntegration:
                 result = response.json()
                 tx_hash = result.get('txHash')
                 
-                self.stats['signals_published'] += len(blockchain_signals)
+                self.stats.signals_published += len(blockchain_signals)
                 logger.info(f"✅ Signals published on-chain: {tx_hash}")
                 
                 return tx_hash
             else:
                 logger.error(f"❌ Signal publish failed: {response.status_code} - {response.text}")
-                self.stats['publish_errors'] += 1
+                self.stats.publish_errors += 1
                 return None
                 
         except Exception as e:
             logger.error(f"❌ Blockchain publish error: {e}")
-            self.stats['publish_errors'] += 1
+            self.stats.publish_errors += 1
             return None
     
-    def execute_short(
+    async def execute_short(
         self,
         index_token: str,
         collateral_usdc: int,
@@ -151,8 +289,8 @@ class BlockchainIntegration:
             logger.info(f"Leverage: {leverage}x")
             logger.info(f"Confidence: {confidence}%")
             
-            response = requests.post(
-                f"{self.blockchain_url}/api/shorts/execute",
+            response = await self._client.post(
+                "/api/shorts/execute",
                 json={
                     'indexToken': token_address,
                     'collateralUSDC': collateral_usdc,
@@ -165,7 +303,7 @@ class BlockchainIntegration:
             if response.status_code == 200:
                 result = response.json()
                 
-                self.stats['shorts_executed'] += 1
+                self.stats.shorts_executed += 1
                 logger.info(f"✅ GMX SHORT executed successfully!")
                 logger.info(f"TX: {result.get('txHash')}")
                 logger.info(f"Position ID: {result.get('positionId')}")
@@ -174,15 +312,15 @@ class BlockchainIntegration:
                 return result
             else:
                 logger.error(f"❌ Short execution failed: {response.status_code} - {response.text}")
-                self.stats['execution_errors'] += 1
+                self.stats.execution_errors += 1
                 return None
                 
         except Exception as e:
             logger.error(f"❌ Short execution error: {e}")
-            self.stats['execution_errors'] += 1
+            self.stats.execution_errors += 1
             return None
     
-    def execute_dip_buy(
+    async def execute_dip_buy(
         self,
         token: str,
         chain: str,
@@ -218,8 +356,8 @@ class BlockchainIntegration:
             logger.info(f"Stop Loss: ${stop_loss_price:.8f}")
             logger.info(f"Confidence: {confidence}%")
             
-            response = requests.post(
-                f"{self.blockchain_url}/api/dip-buys/execute",
+            response = await self._client.post(
+                "/api/dip-buys/execute",
                 json={
                     'token': token,
                     'chain': chain,
@@ -233,7 +371,7 @@ class BlockchainIntegration:
             if response.status_code == 200:
                 result = response.json()
                 
-                self.stats['dip_buys_executed'] += 1
+                self.stats.dip_buys_executed += 1
                 logger.info(f"✅ DIP BUY executed successfully!")
                 logger.info(f"TX: {result.get('txHash')}")
                 logger.info(f"Position ID: {result.get('positionId')}")
@@ -241,15 +379,15 @@ class BlockchainIntegration:
                 return result
             else:
                 logger.error(f"❌ Dip buy failed: {response.status_code} - {response.text}")
-                self.stats['execution_errors'] += 1
+                self.stats.execution_errors += 1
                 return None
                 
         except Exception as e:
             logger.error(f"❌ Dip buy error: {e}")
-            self.stats['execution_errors'] += 1
+            self.stats.execution_errors += 1
             return None
     
-    def get_bridge_quote(self, from_chain: str, to_chain: str, amount_usdc: int) -> Optional[Dict[str, Any]]:
+    async def get_bridge_quote(self, from_chain: str, to_chain: str, amount_usdc: int) -> Optional[Dict[str, Any]]:
         """
         Get a quote for bridging USDC between chains
         
@@ -265,8 +403,8 @@ class BlockchainIntegration:
             return None
             
         try:
-            response = requests.post(
-                f"{self.blockchain_url}/api/bridge/quote",
+            response = await self._client.post(
+                "/api/bridge/quote",
                 json={
                     'fromChain': from_chain,
                     'toChain': to_chain,
@@ -283,14 +421,14 @@ class BlockchainIntegration:
             logger.error(f"Bridge quote error: {e}")
             return None
             
-    def get_vault_balance(self) -> float:
+    async def get_vault_balance(self) -> float:
         """Get vault USDC balance"""
         if not self.enabled:
             return 0.0
         
         try:
-            response = requests.get(
-                f"{self.blockchain_url}/api/vault/balance",
+            response = await self._client.get(
+                "/api/vault/balance",
                 timeout=10
             )
             
@@ -303,7 +441,7 @@ class BlockchainIntegration:
             logger.error(f"Vault balance fetch error: {e}")
             return 0.0
     
-    def close_position(
+    async def close_position(
         self,
         position_id: int,
         token_address: str,
@@ -317,8 +455,8 @@ class BlockchainIntegration:
         try:
             logger.info(f"\n🔄 CLOSING POSITION #{position_id}")
             
-            response = requests.post(
-                f"{self.blockchain_url}/api/shorts/close",
+            response = await self._client.post(
+                "/api/shorts/close",
                 json={
                     'positionId': position_id,
                     'tokenAddress': token_address,
@@ -332,7 +470,7 @@ class BlockchainIntegration:
             if response.status_code == 200:
                 result = response.json()
                 
-                self.stats['positions_closed'] += 1
+                self.stats.positions_closed += 1
                 logger.info(f"✅ Position closed!")
                 logger.info(f"TX: {result.get('txHash')}")
                 logger.info(f"P&L: {result.get('pnl')} USDC")
@@ -346,14 +484,14 @@ class BlockchainIntegration:
             logger.error(f"❌ Close error: {e}")
             return None
     
-    def get_performance_metrics(self) -> Optional[Dict[str, Any]]:
+    async def get_performance_metrics(self) -> Optional[Dict[str, Any]]:
         """Get on-chain performance metrics"""
         if not self.enabled:
             return None
         
         try:
-            response = requests.get(
-                f"{self.blockchain_url}/api/metrics",
+            response = await self._client.get(
+                "/api/metrics",
                 timeout=10
             )
             
@@ -365,14 +503,14 @@ class BlockchainIntegration:
             logger.error(f"Metrics fetch error: {e}")
             return None
     
-    def get_open_positions(self) -> List[Dict[str, Any]]:
+    async def get_open_positions(self) -> List[Dict[str, Any]]:
         """Get all open positions"""
         if not self.enabled:
             return []
         
         try:
-            response = requests.get(
-                f"{self.blockchain_url}/api/positions/open",
+            response = await self._client.get(
+                "/api/positions/open",
                 timeout=10
             )
             
@@ -384,60 +522,35 @@ class BlockchainIntegration:
             logger.error(f"Positions fetch error: {e}")
             return []
     
+    async def aclose(self):
+        """Close the shared HTTP client and the metadata-hash process pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await asyncio.to_thread(_shutdown_hash_pool)
+    
     def get_stats(self) -> Dict[str, int]:
         """Get integration stats"""
-        return self.stats.copy()
+        return asdict(self.stats)
     
     # ========================================
     # HELPER METHODS
     # ========================================
     
-    def _extract_token_address(self, signal: Dict[str, Any]) -> str:
-        """Extract or lookup token address from signal"""
-        # Try to get from signal metadata
-        if 'token_address' in signal:
-            return signal['token_address']
-        
-        # Try to extract from tokens list
-        tokens = signal.get('tokens', [])
-        if tokens and len(tokens) > 0:
-            # TODO: Lookup actual address
-            return '0x0000000000000000000000000000000000000000'
+    async def _create_metadata_hashes(self, signals: List[Dict[str, Any]]) -> List[str]:
+        """Create metadata hashes, sharding large batches across a process pool"""
+        if len(signals) < PARALLEL_HASH_MIN_SIGNALS:
+            return _hash_signals(signals)
         
-        return '0x0000000000000000000000000000000000000000'
-    
-    def _create_metadata_hash(self, signal: Dict[str, Any]) -> str:
-        """Create metadata hash (simplified - in production upload to IPFS)"""
-        # In production: Upload full signal JSON to IPFS, return hash
-        # For now: Create simple hash
-        import hashlib
-        metadata_json = json.dumps(signal, sort_keys=True)
-        hash_bytes = hashlib.sha256(metadata_json.encode()).digest()
-        return '0x' + hash_bytes.hex()
+        pool = _get_hash_pool()
+        shard_size = -(-len(signals) // _HASH_POOL_WORKERS)  # ceil division
+        loop = asyncio.get_running_loop()
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(pool, _hash_signals, signals[i:i + shard_size])
+            for i in range(0, len(signals), shard_size)
+        ))
+        return [h for shard in shards for h in shard]
     
     def _lookup_token_address(self, symbol: str, chain: str) -> Optional[str]:
         """Lookup token contract address by symbol"""
-        # Simplified token address mapping
-        # In production: Use real token registry or API
-        
-        token_addresses = {
-            'arbitrum': {
-                'USDC': '0xaf88d065e77c8cC2239327C5EDb3A432268e5831',
-                'WETH': '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1',
-                'WBTC': '0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f',
-                'LINK': '0xf97f4df75117a78c1A5a0DBb814Af92458539FB4',
-                'UNI': '0xFa7F8980b0f1E64A2062791cc3b0871572f1F7f0',
-                'ARB': '0x912CE59144191C1204E64559FE8253a0e49E6548',
-            },
-            'base': {
-                'USDC': '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913',
-                'WETH': '0x4200000000000000000000000000000000000006',
-            },
-            'optimism': {
-                'USDC': '0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85',
-                'WETH': '0x4200000000000000000000000000000000000006',
-                'OP': '0x4200000000000000000000000000000000000042',
-            }
-        }
-        
-        return token_addresses.get(chain, {}).get(symbol.upper())
+        return _resolve_token_address(chain, symbol)
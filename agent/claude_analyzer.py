@@ -3,30 +3,267 @@ Gemini Analyzer (Tier 2)
 Deep analysis using Google Gemini with intelligent rate limiting and batch splitting
 """
 
+import asyncio
+import hashlib
 import logging
 import json
+import struct
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+from typing import Dict, Any, Optional, List, Tuple, Iterator, AsyncIterator
+from contextlib import aclosing
+from datetime import datetime, timezone
+from functools import lru_cache
 import os
 import math
 
-# Import genai correctly
+import httpx
+import msgspec
+import numpy as np
+import orjson
+
+# Optional JIT for the single-token mock scoring kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Import genai correctly (google-genai SDK, provides genai.Client and client.aio)
 try:
-    import google.generativeai as genai
+    from google import genai
+    from google.genai import types
 except ImportError:
     genai = None
+    types = None
 
 from .local_llm_screener import FlaggedToken
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class TradePlan:
-    """Structured trade recommendation from Claude"""
+# Mock red flags: (risk factor, confidence points), in scoring order
+# (interned: every plan's risk_factors tuple shares these string objects)
+_MOCK_RISK_FACTORS = tuple(map(sys.intern, (
+    "Major insider dump detected",
+    "Severe liquidity removal",
+    "TVL collapse",
+    "Twitter engagement crash",
+    "Multiple developer exits",
+    "Prolonged influencer silence",
+    "Treasury raid vote passed",
+    "Token inflation approved",
+)))
+_MOCK_RISK_POINT_VALUES = (25, 20, 20, 15, 10, 10, 15, 10)
+_MOCK_RISK_POINTS = np.array(_MOCK_RISK_POINT_VALUES, dtype=np.int64)
+
+# Signal fields the mock scorer reads, packed column-wise by _batch_to_soa
+_SOA_FIELDS = (
+    "insider_sells_24h",
+    "insider_sell_volume_usd",
+    "liquidity_change_24h",
+    "tvl_change_24h",
+    "twitter_engagement_change_48h",
+    "dev_departures_30d",
+    "influencer_silence_hours",
+    "vote_passed",
+    "recent_vote_type",
+    "market_cap_usd",
+)
+
+
+# Mock liquidity split is a fixed share of TVL per chain (ethereum 50%,
+# arbitrum 30%, base 15%, optimism 5%), so the deepest chain never changes
+_MOCK_BEST_CHAIN = "ethereum"
+
+# Mock take-profit levels (%) per token category
+_TP_BY_CATEGORY = {
+    "memecoin": (-33, -67, -85),
+    "defi": (-25, -50, -70),
+}
+_DEFAULT_TP_LEVELS = (-20, -40, -60)
+
+# Estimated gas per execution chain (USD)
+_GAS_COSTS_USD = {
+    "ethereum": 25.0,
+    "arbitrum": 2.0,
+    "base": 0.5,
+    "optimism": 1.5
+}
+
+# Kernel encodings: recent_vote_type -> int code, decision code -> decision
+_VOTE_TYPE_CODES = {"treasury_raid": 1, "inflation": 2}
+_DECISIONS = ("PASS", "MONITOR", "SHORT")
+
+
+def _score_kernel(insider_sells, insider_vol, liq_chg, tvl_chg, tw_chg, devs,
+                  inf_silence, vote_passed, vote_type_code):
+    """
+    Pure-numeric mock scoring for one token
+    
+    Returns (confidence, position_size, decision_code, flags) where bit i of
+    flags selects _MOCK_RISK_FACTORS[i].
+    """
+    # Branchless: each predicate sets one bit, points are summed per set bit
+    flags = (
+        int((insider_sells > 5) & (insider_vol > 500000))
+        | int(liq_chg < -40) << 1
+        | int(tvl_chg < -40) << 2
+        | int(tw_chg < -60) << 3
+        | int(devs > 2) << 4
+        | int(inf_silence > 72) << 5
+        | int(vote_passed & (vote_type_code == 1)) << 6
+        | int(vote_passed & (vote_type_code == 2)) << 7
+    )
+    
+    confidence = 0
+    for i in range(8):
+        confidence += _MOCK_RISK_POINT_VALUES[i] * (flags >> i & 1)
+    
+    # 0 = PASS, 1 = MONITOR, 2 = SHORT; size steps 10% / 15% / 20% at 70 / 80 / 90
+    decision_code = int(confidence >= 70) + int(confidence >= 50)
+    position_size = 10.0 * (confidence >= 70) + 5.0 * (confidence >= 80) + 5.0 * (confidence >= 90)
+    
+    return confidence, position_size, decision_code, flags
+
+
+if njit is not None:
+    _score_kernel = njit(cache=True, fastmath=True)(_score_kernel)
+    _score_kernel(0, 0.0, 0.0, 0.0, 0.0, 0, 0.0, False, 0)  # Compile at import, not on first analysis
+
+
+@lru_cache(maxsize=1)
+def _iso_at_second(epoch_second: int) -> str:
+    """ISO-8601 UTC timestamp for a whole second (memoized for the current second)"""
+    return datetime.fromtimestamp(epoch_second, timezone.utc).isoformat()
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601, at 1-second granularity"""
+    return _iso_at_second(int(time.time()))
+
+
+# Per-token block of the batch prompt; fields are read as attributes of the
+# signal (s) and the flagged token (f) in a single str.format call
+_TOKEN_TEMPLATE = """
+TOKEN {idx}:
+Symbol: {s.token_symbol}
+Address: {s.token_address}
+Chain: {s.chain}
+Category: {s.category}
+Market Cap: ${s.market_cap_usd:,.0f}
+Urgency Score: {f.urgency_score}/10
+
+ON-CHAIN SIGNALS (24h):
+- TVL: ${s.tvl_usd:,.0f} ({s.tvl_change_24h:+.1f}%)
+- Liquidity Change: {s.liquidity_change_24h:+.1f}%
+- Top 10 Holder Concentration: {s.holder_concentration_top10:.1f}%
+- Insider Sells: {s.insider_sells_24h} transactions, ${s.insider_sell_volume_usd:,.0f}
+
+SOCIAL SIGNALS:
+- Twitter Engagement Change (48h): {s.twitter_engagement_change_48h:+.1f}%
+- Twitter Mentions (24h): {s.twitter_mentions_24h}
+- Sentiment Score: {s.twitter_sentiment_score:.2f}
+- Influencer Silence: {s.influencer_silence_hours:.0f} hours
+
+PROTOCOL HEALTH:
+- GitHub Commits (7d): {s.github_commits_7d}
+- Commit Change: {s.github_commit_change:+.1f}%
+- Developer Departures (30d): {s.dev_departures_30d}
+
+GOVERNANCE:
+- Recent Vote: {s.recent_vote_type}
+- Vote Passed: {s.vote_passed}
+
+TIER 1 REASONING: {f.reasoning}
+"""
+
+def _strip_json_fence(text: str) -> str:
+    """Return the body of the first markdown code fence (```json ... ```), or the text itself"""
+    start = text.find("```")
+    if start < 0:
+        return text.strip()
+    start += 3
+    if text.startswith("json", start):
+        start += 4
+    end = text.find("```", start)
+    return text[start:end if end >= 0 else len(text)].strip()
+
+
+class _JsonStreamScanner:
+    """Tracks bracket depth over streamed text to spot when the top-level JSON value closes"""
+    __slots__ = ("parts", "depth", "started", "in_string", "escape")
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, text: str) -> bool:
+        """Append a chunk; returns True once the outermost array/object is closed"""
+        self.parts.append(text)
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == "[" or ch == "{":
+                self.depth += 1
+                self.started = True
+            elif (ch == "]" or ch == "}") and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.parts[-1] = text[:i + 1]  # Drop anything after the closing bracket
+                    return True
+        return False
+    
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+# Numeric signal fields that feed the analysis prompt, packed into the result-cache digest
+_SIGNAL_KEY_STRUCT = struct.Struct("!10d5i?")
+
+
+def _result_cache_key(flagged: FlaggedToken) -> tuple:
+    """(address, chain, category, vote type, 8-byte BLAKE2b of the numeric signals)"""
+    s = flagged.signal
+    packed = _SIGNAL_KEY_STRUCT.pack(
+        s.market_cap_usd, s.tvl_usd, s.tvl_change_24h, s.liquidity_change_24h,
+        s.holder_concentration_top10, s.insider_sell_volume_usd,
+        s.twitter_engagement_change_48h, s.twitter_sentiment_score,
+        s.influencer_silence_hours, s.github_commit_change,
+        s.insider_sells_24h, s.twitter_mentions_24h, s.github_commits_7d,
+        s.dev_departures_30d, flagged.urgency_score,
+        s.vote_passed
+    )
+    return (
+        s.token_address, s.chain, s.category, s.recent_vote_type,
+        hashlib.blake2b(packed, digest_size=8).digest()
+    )
+
+
+def _batch_to_soa(flagged_tokens: List[FlaggedToken]) -> Dict[str, np.ndarray]:
+    """Pack the scored signal fields of a batch into one array per field (SoA)"""
+    signals = [flagged.signal for flagged in flagged_tokens]
+    soa = {field: np.array([getattr(s, field) for s in signals]) for field in _SOA_FIELDS}
+    soa["vote_passed"] = soa["vote_passed"].astype(bool)
+    return soa
+
+
+class TradePlan(msgspec.Struct, kw_only=True):
+    """Structured trade recommendation from Claude (msgspec.json.encode-able, slotted)"""
     token_symbol: str
     token_address: str
     chain: str
@@ -51,7 +288,7 @@ class TradePlan:
     estimated_gas_usd: float
     
     reasoning: str  # Human-readable explanation
-    risk_factors: List[str]
+    risk_factors: Tuple[str, ...]
     
     analyzed_at: str
     urgency_score: int  # From Tier 1
@@ -71,6 +308,12 @@ class GeminiAnalyzer:
     MAX_TOKENS_PER_BATCH = 30000  # Conservative estimate for free tier
     MAX_BATCH_SIZE = 20  # Max tokens per API call
     RETRY_DELAYS = [3, 6, 12]  # Exponential backoff delays (seconds)
+    MAX_CONCURRENT_REQUESTS = 4  # In-flight sub-batches for analyze_batch_async
+    MAX_WORKERS = 4  # Threads fanning out split sub-batches on the sync path
+    STREAM_TIMEOUT_S = 120  # Upper bound on one streamed response
+    MOCK_GATE = 40  # Tokens the rule engine scores below this never reach the API
+    RESULT_CACHE_SIZE = 1024  # API results kept for re-flagged tokens with unchanged signals
+    RESULT_CACHE_TTL_S = 60
     
     # Models in order of preference (will fallback if quota exceeded)
     MODELS = [
@@ -79,13 +322,11 @@ class GeminiAnalyzer:
         "gemini-1.5-pro",         # Pro fallback (if available)
     ]
     
-    # Gemini batch analysis prompt
-    BATCH_ANALYSIS_PROMPT = """You are an expert crypto trading analyst specializing in short-selling opportunities. 
+    # Static instructions, sent as the system instruction so the identical
+    # prefix is served from Gemini's context cache on repeat requests
+    SYSTEM_INSTRUCTION = """You are an expert crypto trading analyst specializing in short-selling opportunities. 
 
-I will provide you with {num_tokens} flagged tokens that have been pre-screened. Analyze ALL of them in a SINGLE response and provide trade recommendations for each.
-
-FLAGGED TOKENS DATA:
-{tokens_data}
+You will be given a batch of flagged tokens that have been pre-screened. Analyze ALL of them in a SINGLE response and provide trade recommendations for each.
 
 ANALYSIS REQUIREMENTS FOR EACH TOKEN:
 1. Evaluate if this is a HIGH-CONFIDENCE short opportunity (≥70% confidence)
@@ -96,7 +337,7 @@ ANALYSIS REQUIREMENTS FOR EACH TOKEN:
 
 OUTPUT FORMAT (JSON ARRAY - ONE OBJECT PER TOKEN):
 [
-  {{
+  {
     "token_symbol": "TOKEN1",
     "token_address": "0x...",
     "chain": "ethereum",
@@ -104,15 +345,15 @@ OUTPUT FORMAT (JSON ARRAY - ONE OBJECT PER TOKEN):
     "confidence": 0-100,
     "position_size_percent": 0-20,
     "take_profit_levels": [
-      {{"level": 1, "price_target": -20.0, "close_percent": 30}},
-      {{"level": 2, "price_target": -50.0, "close_percent": 40}},
-      {{"level": 3, "price_target": -75.0, "close_percent": 30}}
+      {"level": 1, "price_target": -20.0, "close_percent": 30},
+      {"level": 2, "price_target": -50.0, "close_percent": 40},
+      {"level": 3, "price_target": -75.0, "close_percent": 30}
     ],
     "stop_loss_percent": 12.0,
     "best_execution_chain": "ethereum" | "arbitrum" | "base" | "optimism",
     "reasoning": "2-3 sentence explanation focusing on strongest signals",
     "risk_factors": ["list", "of", "3-5", "key", "risks"]
-  }},
+  },
   ... (repeat for all tokens)
 ]
 
@@ -126,9 +367,15 @@ CRITICAL CONSIDERATIONS:
 - Twitter silence + dev exits = STRONG SHORT
 - Governance risks alone = MONITOR unless severe
 - Position sizing: Higher confidence = larger position (max 20%)
-- Chain selection: Deepest liquidity = best execution
+- Chain selection: Deepest liquidity = best execution"""
 
-Analyze all tokens and return a JSON array with complete analysis for each token:"""
+    # Per-request batch prompt (only the dynamic token data), parsed once at class load
+    BATCH_ANALYSIS_PROMPT = Template("""I will provide you with $num_tokens flagged tokens.
+
+FLAGGED TOKENS DATA:
+$tokens_data
+
+Analyze all tokens and return a JSON array with complete analysis for each token:""")
 
     def __init__(self, api_key: Optional[str] = None, mock_mode: bool = True):
         """
@@ -140,9 +387,15 @@ Analyze all tokens and return a JSON array with complete analysis for each token
         """
         self.mock_mode = mock_mode
         self.client = None
+        self.aclient = None  # Async surface of the same client (client.aio)
         self.current_model_index = 0  # Track which model we're using
         self.last_request_time = 0
         self.min_request_interval = 1.0  # Minimum seconds between requests
+        self._rate_lock = threading.Lock()  # Spaces request starts across worker threads
+        self._stats_lock = threading.Lock()  # Guards stats/model index shared by worker threads
+        self._result_cache: "OrderedDict[tuple, Tuple[float, TradePlan]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.mock_gate = int(os.getenv("GEMINI_MOCK_GATE", self.MOCK_GATE))
         
         self.stats = {
             "total_analyzed": 0,
@@ -150,12 +403,15 @@ Analyze all tokens and return a JSON array with complete analysis for each token
             "total_monitors": 0,
             "total_passes": 0,
             "total_api_cost_usd": 0.0,
-            "avg_processing_time_ms": 0,
+            "sum_processing_time_ms": 0.0,  # Averaged per token in get_stats
             "api_errors": 0,
             "batch_requests": 0,
             "rate_limit_hits": 0,
             "model_fallbacks": 0,
-            "batches_split": 0
+            "batches_split": 0,
+            "cached_input_tokens": 0,
+            "api_calls_skipped": 0,  # Tokens answered by the rule-engine pre-gate
+            "cache_hits": 0  # Tokens answered from the TTL result cache
         }
         
         if not mock_mode:
@@ -170,16 +426,47 @@ Analyze all tokens and return a JSON array with complete analysis for each token
             raise ValueError("Gemini API key required. Set GEMINI_API_KEY env var.")
         
         os.environ["GOOGLE_API_KEY"] = api_key
-        self.client = genai.Client(api_key=api_key)
-        logger.info(f"✅ Gemini API client initialized (model: {self.MODELS[0]})")
+        # One pooled HTTP/2 transport for the client's lifetime; passing a transport
+        # also keeps the async (incl. streaming) path on httpx rather than aiohttp
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                async_client_args={
+                    "transport": httpx.AsyncHTTPTransport(
+                        http2=True,
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+                    )
+                }
+            )
+        )
+        self.aclient = self.client.aio
+        logger.info("✅ Gemini API client initialized (model: %s)", self.MODELS[0])
+    
+    async def aclose(self):
+        """Close the pooled async HTTP connections"""
+        if self.aclient is not None:
+            await self.aclient.aclose()
+            self.aclient = None
+    
+    async def __aenter__(self) -> "GeminiAnalyzer":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
     def _rate_limit(self):
         """Enforce minimum time between API requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                sleep_time = self.min_request_interval - elapsed
+                time.sleep(sleep_time)
+            self.last_request_time = time.time()
+    
+    def _incr_stat(self, key: str, amount=1):
+        """Thread-safe stats counter increment"""
+        with self._stats_lock:
+            self.stats[key] += amount
     
     def _get_current_model(self) -> str:
         """Get the current model to use"""
@@ -187,13 +474,14 @@ Analyze all tokens and return a JSON array with complete analysis for each token
     
     def _fallback_to_next_model(self):
         """Switch to the next model in the fallback chain"""
-        if self.current_model_index < len(self.MODELS) - 1:
+        with self._stats_lock:
+            if self.current_model_index >= len(self.MODELS) - 1:
+                return False
             self.current_model_index += 1
             self.stats["model_fallbacks"] += 1
             new_model = self._get_current_model()
-            logger.warning(f"⚠️  Falling back to model: {new_model}")
-            return True
-        return False
+        logger.warning("⚠️  Falling back to model: %s", new_model)
+        return True
     
     def _estimate_token_count(self, text: str) -> int:
         """Rough estimate of token count"""
@@ -213,176 +501,145 @@ Analyze all tokens and return a JSON array with complete analysis for each token
     
     def _format_tokens_batch(self, flagged_tokens: List[FlaggedToken]) -> str:
         """Format multiple flagged tokens for batch analysis"""
-        tokens_text = []
-        
-        for idx, flagged in enumerate(flagged_tokens, 1):
-            signal = flagged.signal
-            token_text = f"""
-TOKEN {idx}:
-Symbol: {signal.token_symbol}
-Address: {signal.token_address}
-Chain: {signal.chain}
-Category: {signal.category}
-Market Cap: ${signal.market_cap_usd:,.0f}
-Urgency Score: {flagged.urgency_score}/10
-
-ON-CHAIN SIGNALS (24h):
-- TVL: ${signal.tvl_usd:,.0f} ({signal.tvl_change_24h:+.1f}%)
-- Liquidity Change: {signal.liquidity_change_24h:+.1f}%
-- Top 10 Holder Concentration: {signal.holder_concentration_top10:.1f}%
-- Insider Sells: {signal.insider_sells_24h} transactions, ${signal.insider_sell_volume_usd:,.0f}
-
-SOCIAL SIGNALS:
-- Twitter Engagement Change (48h): {signal.twitter_engagement_change_48h:+.1f}%
-- Twitter Mentions (24h): {signal.twitter_mentions_24h}
-- Sentiment Score: {signal.twitter_sentiment_score:.2f}
-- Influencer Silence: {signal.influencer_silence_hours:.0f} hours
-
-PROTOCOL HEALTH:
-- GitHub Commits (7d): {signal.github_commits_7d}
-- Commit Change: {signal.github_commit_change:+.1f}%
-- Developer Departures (30d): {signal.dev_departures_30d}
-
-GOVERNANCE:
-- Recent Vote: {signal.recent_vote_type}
-- Vote Passed: {signal.vote_passed}
-
-TIER 1 REASONING: {flagged.reasoning}
-"""
-            tokens_text.append(token_text)
+        tokens_text = [
+            _TOKEN_TEMPLATE.format(idx=idx, s=flagged.signal, f=flagged)
+            for idx, flagged in enumerate(flagged_tokens, 1)
+        ]
         
         return "\n" + "="*80 + "\n".join(tokens_text)
     
     def _mock_analyze_batch(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
         """
         Rule-based batch analysis for testing (mock Gemini)
+        
+        Scoring is vectorized over the whole batch; TradePlan objects (and
+        their risk_factors tuples) are only materialized at the end.
         """
-        trade_plans = []
+        if not flagged_tokens:
+            return []
         
-        for flagged in flagged_tokens:
-            signal = flagged.signal
-            
-            # Calculate confidence based on red flags
-            confidence = 0
-            risk_factors = []
-            
+        # Singletons skip the array packing and go through the scalar kernel
+        if len(flagged_tokens) == 1:
+            return [self._mock_analyze(flagged_tokens[0])]
+        
+        soa = _batch_to_soa(flagged_tokens)
+        
+        # One boolean mask per red flag, in the same order as _MOCK_RISK_FACTORS
+        vote_passed = soa["vote_passed"]
+        flags = np.stack([
             # High-impact signals
-            if signal.insider_sells_24h > 5 and signal.insider_sell_volume_usd > 500000:
-                confidence += 25
-                risk_factors.append("Major insider dump detected")
-            
-            if signal.liquidity_change_24h < -40:
-                confidence += 20
-                risk_factors.append("Severe liquidity removal")
-            
-            if signal.tvl_change_24h < -40:
-                confidence += 20
-                risk_factors.append("TVL collapse")
-            
+            (soa["insider_sells_24h"] > 5) & (soa["insider_sell_volume_usd"] > 500000),
+            soa["liquidity_change_24h"] < -40,
+            soa["tvl_change_24h"] < -40,
             # Medium-impact signals
-            if signal.twitter_engagement_change_48h < -60:
-                confidence += 15
-                risk_factors.append("Twitter engagement crash")
-            
-            if signal.dev_departures_30d > 2:
-                confidence += 10
-                risk_factors.append("Multiple developer exits")
-            
-            if signal.influencer_silence_hours > 72:
-                confidence += 10
-                risk_factors.append("Prolonged influencer silence")
-            
+            soa["twitter_engagement_change_48h"] < -60,
+            soa["dev_departures_30d"] > 2,
+            soa["influencer_silence_hours"] > 72,
             # Governance risks
-            if signal.vote_passed and signal.recent_vote_type == "treasury_raid":
-                confidence += 15
-                risk_factors.append("Treasury raid vote passed")
-            elif signal.vote_passed and signal.recent_vote_type == "inflation":
-                confidence += 10
-                risk_factors.append("Token inflation approved")
-            
-            # Determine decision
-            if confidence >= 70:
-                decision = "SHORT"
-            elif confidence >= 50:
-                decision = "MONITOR"
-            else:
-                decision = "PASS"
-            
-            # Position sizing based on confidence
-            if confidence >= 90:
-                position_size = 20.0
-            elif confidence >= 80:
-                position_size = 15.0
-            elif confidence >= 70:
-                position_size = 10.0
-            else:
-                position_size = 0.0
-            
-            # Estimate current price (mock)
-            current_price = 1.0 if signal.market_cap_usd > 10_000_000 else 0.50
-            
-            # Take-profit levels based on category
-            if signal.category == "memecoin":
-                tp1_pct, tp2_pct, tp3_pct = -33, -67, -85
-            elif signal.category == "defi":
-                tp1_pct, tp2_pct, tp3_pct = -25, -50, -70
-            else:
-                tp1_pct, tp2_pct, tp3_pct = -20, -40, -60
-            
-            # Best chain selection (prefer deepest liquidity)
-            chain_liquidity = {
-                "ethereum": signal.tvl_usd * 0.5,
-                "arbitrum": signal.tvl_usd * 0.3,
-                "base": signal.tvl_usd * 0.15,
-                "optimism": signal.tvl_usd * 0.05
-            }
-            best_chain = max(chain_liquidity, key=chain_liquidity.get)
-            
-            # Estimate gas
-            gas_costs = {
-                "ethereum": 25.0,
-                "arbitrum": 2.0,
-                "base": 0.5,
-                "optimism": 1.5
-            }
-            
-            # Generate reasoning
-            if decision == "SHORT":
-                top_risks = risk_factors[:3]
-                reasoning = f"High-confidence short opportunity. {' + '.join(top_risks)}. "
-                reasoning += f"Execute on {best_chain} for optimal liquidity."
-            elif decision == "MONITOR":
-                reasoning = f"Moderate concerns detected: {', '.join(risk_factors[:2])}. "
-                reasoning += "Requires additional confirmation before entering position."
-            else:
-                reasoning = "Insufficient evidence for short position. Signals below confidence threshold."
-            
-            trade_plan = TradePlan(
-                token_symbol=signal.token_symbol,
-                token_address=signal.token_address,
-                chain=signal.chain,
-                decision=decision,
-                confidence=min(confidence, 100),
-                position_size_percent=position_size,
-                entry_price=current_price,
-                take_profit_1=current_price * (1 + tp1_pct/100),
-                take_profit_1_percent=tp1_pct,
-                take_profit_2=current_price * (1 + tp2_pct/100),
-                take_profit_2_percent=tp2_pct,
-                take_profit_3=current_price * (1 + tp3_pct/100),
-                take_profit_3_percent=tp3_pct,
-                stop_loss=current_price * 1.12,
-                stop_loss_percent=12.0,
-                best_execution_chain=best_chain,
-                estimated_gas_usd=gas_costs.get(best_chain, 5.0),
-                reasoning=reasoning,
-                risk_factors=risk_factors,
-                analyzed_at=datetime.utcnow().isoformat(),
-                urgency_score=flagged.urgency_score
+            vote_passed & (soa["recent_vote_type"] == "treasury_raid"),
+            vote_passed & (soa["recent_vote_type"] == "inflation"),
+        ], axis=1)
+        
+        # Calculate confidence based on red flags
+        confidence = flags.astype(np.int64) @ _MOCK_RISK_POINTS
+        
+        # Determine decision
+        decisions = np.select([confidence >= 70, confidence >= 50], ["SHORT", "MONITOR"], "PASS")
+        
+        # Position sizing based on confidence
+        position_sizes = np.select(
+            [confidence >= 90, confidence >= 80, confidence >= 70], [20.0, 15.0, 10.0], 0.0
+        )
+        
+        # Estimate current price (mock)
+        current_prices = np.where(soa["market_cap_usd"] > 10_000_000, 1.0, 0.50)
+        
+        analyzed_at = _utc_now_iso()
+        
+        return [
+            self._build_mock_trade_plan(
+                flagged,
+                decision=str(decisions[i]),
+                confidence=int(confidence[i]),
+                position_size=float(position_sizes[i]),
+                risk_factors=tuple(reason for reason, hit in zip(_MOCK_RISK_FACTORS, flags[i]) if hit),
+                current_price=float(current_prices[i]),
+                analyzed_at=analyzed_at
             )
-            trade_plans.append(trade_plan)
+            for i, flagged in enumerate(flagged_tokens)
+        ]
+    
+    def _mock_analyze(self, flagged: FlaggedToken) -> TradePlan:
+        """Rule-based analysis of a single token via the (JIT-compiled) scoring kernel"""
+        signal = flagged.signal
+        confidence, position_size, decision_code, flags = _score_kernel(
+            signal.insider_sells_24h,
+            signal.insider_sell_volume_usd,
+            signal.liquidity_change_24h,
+            signal.tvl_change_24h,
+            signal.twitter_engagement_change_48h,
+            signal.dev_departures_30d,
+            signal.influencer_silence_hours,
+            signal.vote_passed,
+            _VOTE_TYPE_CODES.get(signal.recent_vote_type, 0)
+        )
         
-        return trade_plans
+        return self._build_mock_trade_plan(
+            flagged,
+            decision=_DECISIONS[decision_code],
+            confidence=confidence,
+            position_size=position_size,
+            risk_factors=tuple(reason for i, reason in enumerate(_MOCK_RISK_FACTORS) if flags >> i & 1),
+            current_price=1.0 if signal.market_cap_usd > 10_000_000 else 0.50,
+            analyzed_at=_utc_now_iso()
+        )
+    
+    def _build_mock_trade_plan(self, flagged: FlaggedToken, decision: str, confidence: int,
+                               position_size: float, risk_factors: Tuple[str, ...],
+                               current_price: float, analyzed_at: str) -> TradePlan:
+        """Wrap scored mock outputs for one token into a TradePlan"""
+        signal = flagged.signal
+        
+        # Take-profit levels based on category
+        tp1_pct, tp2_pct, tp3_pct = _TP_BY_CATEGORY.get(signal.category, _DEFAULT_TP_LEVELS)
+        
+        # Best chain selection (prefer deepest liquidity)
+        best_chain = _MOCK_BEST_CHAIN
+        
+        # Generate reasoning
+        if decision == "SHORT":
+            top_risks = risk_factors[:3]
+            reasoning = f"High-confidence short opportunity. {' + '.join(top_risks)}. "
+            reasoning += f"Execute on {best_chain} for optimal liquidity."
+        elif decision == "MONITOR":
+            reasoning = f"Moderate concerns detected: {', '.join(risk_factors[:2])}. "
+            reasoning += "Requires additional confirmation before entering position."
+        else:
+            reasoning = "Insufficient evidence for short position. Signals below confidence threshold."
+        
+        return TradePlan(
+            token_symbol=signal.token_symbol,
+            token_address=signal.token_address,
+            chain=signal.chain,
+            decision=decision,
+            confidence=min(confidence, 100),
+            position_size_percent=position_size,
+            entry_price=current_price,
+            take_profit_1=current_price * (1 + tp1_pct/100),
+            take_profit_1_percent=tp1_pct,
+            take_profit_2=current_price * (1 + tp2_pct/100),
+            take_profit_2_percent=tp2_pct,
+            take_profit_3=current_price * (1 + tp3_pct/100),
+            take_profit_3_percent=tp3_pct,
+            stop_loss=current_price * 1.12,
+            stop_loss_percent=12.0,
+            best_execution_chain=best_chain,
+            estimated_gas_usd=_GAS_COSTS_USD.get(best_chain, 5.0),
+            reasoning=reasoning,
+            risk_factors=risk_factors,
+            analyzed_at=analyzed_at,
+            urgency_score=flagged.urgency_score
+        )
     
     def _gemini_analyze_batch(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
         """
@@ -396,11 +653,7 @@ TIER 1 REASONING: {flagged.reasoning}
             return self._analyze_with_splitting(flagged_tokens)
         
         # Single batch processing with retry logic
-        tokens_data = self._format_tokens_batch(flagged_tokens)
-        prompt = self.BATCH_ANALYSIS_PROMPT.format(
-            num_tokens=len(flagged_tokens),
-            tokens_data=tokens_data
-        )
+        prompt = self._build_batch_prompt(flagged_tokens)
         
         # Try with retries and model fallbacks
         for retry_attempt in range(len(self.RETRY_DELAYS) + 1):
@@ -409,79 +662,53 @@ TIER 1 REASONING: {flagged.reasoning}
                 self._rate_limit()
                 
                 current_model = self._get_current_model()
-                logger.info(f"📡 Sending BATCH request to Gemini ({current_model}) for {len(flagged_tokens)} tokens...")
+                logger.info("📡 Sending BATCH request to Gemini (%s) for %d tokens...", current_model, len(flagged_tokens))
                 
                 response = self.client.models.generate_content(
                     model=current_model,
                     contents=prompt,
                     config=types.GenerateContentConfig(
+                        system_instruction=self.SYSTEM_INSTRUCTION,
                         temperature=0.3,
                         response_mime_type="application/json"
                     )
                 )
                 
-                # Parse JSON response
-                content = response.text
-                
-                # Extract JSON if wrapped in markdown
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0]
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0]
-                
-                analyses = json.loads(content.strip())
-                
-                # Estimate API cost (Gemini Flash is free tier friendly)
-                input_chars = len(prompt)
-                output_chars = len(content)
-                input_tokens = input_chars / 4
-                output_tokens = output_chars / 4
-                
-                # Cost varies by model (Flash is essentially free)
-                if "flash" in current_model.lower():
-                    cost = 0.0  # Free tier
-                else:
-                    cost = (input_tokens / 1_000_000 * 1.25) + (output_tokens / 1_000_000 * 5.0)
-                
-                self.stats["total_api_cost_usd"] += cost
-                self.stats["batch_requests"] += 1
-                
-                logger.info(f"✅ Received Gemini batch analysis for {len(analyses)} tokens (cost: ${cost:.4f})")
-                
-                # Build TradePlans from Gemini response
-                return self._parse_gemini_response(analyses, flagged_tokens)
+                return self._handle_batch_response(
+                    response.text, response.usage_metadata, prompt, current_model, flagged_tokens
+                )
                 
             except Exception as e:
                 error_str = str(e)
                 
                 # Handle rate limit (429)
                 if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    self.stats["rate_limit_hits"] += 1
+                    self._incr_stat("rate_limit_hits")
                     
                     # Try to fallback to next model
                     if self._fallback_to_next_model():
-                        logger.warning(f"⚠️  Rate limit hit, trying next model...")
+                        logger.warning("⚠️  Rate limit hit, trying next model...")
                         continue
                     
                     # Or retry with delay
                     if retry_attempt < len(self.RETRY_DELAYS):
                         delay = self.RETRY_DELAYS[retry_attempt]
-                        logger.warning(f"⚠️  Rate limit hit, retrying in {delay}s...")
+                        logger.warning("⚠️  Rate limit hit, retrying in %ss...", delay)
                         time.sleep(delay)
                         continue
                 
                 # Handle quota exhausted - split into smaller batches
                 if "quota" in error_str.lower() or len(flagged_tokens) > 1:
-                    logger.warning(f"⚠️  Quota issue, splitting batch...")
+                    logger.warning("⚠️  Quota issue, splitting batch...")
                     return self._analyze_with_splitting(flagged_tokens)
                 
                 # Other errors
-                logger.error(f"Gemini API error: {e}")
-                self.stats["api_errors"] += 1
+                logger.error("Gemini API error: %s", e)
+                self._incr_stat("api_errors")
                 
                 if retry_attempt < len(self.RETRY_DELAYS):
                     delay = self.RETRY_DELAYS[retry_attempt]
-                    logger.warning(f"Retrying in {delay}s...")
+                    logger.warning("Retrying in %ss...", delay)
                     time.sleep(delay)
                 else:
                     # Final fallback to mock
@@ -491,29 +718,121 @@ TIER 1 REASONING: {flagged.reasoning}
         # Should never reach here, but fallback to mock
         return self._mock_analyze_batch(flagged_tokens)
     
+    def _build_batch_prompt(self, flagged_tokens: List[FlaggedToken]) -> str:
+        """Render the batch analysis prompt for a list of flagged tokens"""
+        tokens_data = self._format_tokens_batch(flagged_tokens)
+        return self.BATCH_ANALYSIS_PROMPT.substitute(
+            num_tokens=len(flagged_tokens),
+            tokens_data=tokens_data
+        )
+    
+    def _handle_batch_response(self, content: str, usage, prompt: str, current_model: str,
+                               flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """Parse a Gemini batch response, record its cost and build TradePlans"""
+        # Extract JSON if wrapped in markdown; malformed JSON raises ValueError
+        analyses = orjson.loads(_strip_json_fence(content))
+        
+        # Use reported token usage when available, otherwise estimate from length
+        if usage is not None and usage.prompt_token_count:
+            input_tokens = usage.prompt_token_count
+            cached_tokens = usage.cached_content_token_count or 0
+            output_tokens = usage.candidates_token_count or 0
+        else:
+            input_tokens = (len(self.SYSTEM_INSTRUCTION) + len(prompt)) / 4
+            cached_tokens = 0
+            output_tokens = len(content) / 4
+        
+        # Cost varies by model (Flash is essentially free); cached input bills at 25%
+        if "flash" in current_model.lower():
+            cost = 0.0  # Free tier
+        else:
+            cost = (
+                ((input_tokens - cached_tokens) / 1_000_000 * 1.25)
+                + (cached_tokens / 1_000_000 * 0.3125)
+                + (output_tokens / 1_000_000 * 5.0)
+            )
+        
+        with self._stats_lock:
+            self.stats["cached_input_tokens"] += cached_tokens
+            self.stats["total_api_cost_usd"] += cost
+            self.stats["batch_requests"] += 1
+        
+        logger.info("✅ Received Gemini batch analysis for %d tokens (cost: $%.4f)", len(analyses), cost)
+        
+        # Build TradePlans from Gemini response
+        return self._parse_gemini_response(analyses, flagged_tokens)
+    
+    async def _gemini_analyze_chunk_async(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """
+        Analyze one sub-batch through the async client, retrying on rate limits
+        with non-blocking backoff. Falls back to mock analysis once retries run out.
+        
+        The response is streamed and parsed as soon as the top-level JSON array
+        closes, instead of waiting for the stream to finish.
+        """
+        prompt = self._build_batch_prompt(flagged_tokens)
+        
+        for retry_attempt in range(len(self.RETRY_DELAYS) + 1):
+            current_model = self._get_current_model()
+            try:
+                logger.info("📡 Streaming async BATCH request to Gemini (%s) for %d tokens...", current_model, len(flagged_tokens))
+                scanner = _JsonStreamScanner()
+                usage = None
+                
+                async with asyncio.timeout(self.STREAM_TIMEOUT_S):
+                    stream = await self.aclient.models.generate_content_stream(
+                        model=current_model,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            system_instruction=self.SYSTEM_INSTRUCTION,
+                            temperature=0.3,
+                            response_mime_type="application/json"
+                        )
+                    )
+                    async with aclosing(stream):
+                        async for chunk in stream:
+                            usage = chunk.usage_metadata or usage
+                            if chunk.text and scanner.feed(chunk.text):
+                                break  # JSON complete, don't wait for the stream to finish
+                
+                return self._handle_batch_response(scanner.text, usage, prompt, current_model, flagged_tokens)
+            
+            except Exception as e:
+                error_str = str(e)
+                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+                    self._incr_stat("rate_limit_hits")
+                    if self._fallback_to_next_model():
+                        continue
+                else:
+                    logger.error("Gemini API error: %s", e)
+                    self._incr_stat("api_errors")
+                
+                if retry_attempt < len(self.RETRY_DELAYS):
+                    delay = self.RETRY_DELAYS[retry_attempt]
+                    logger.warning("Retrying in %ss...", delay)
+                    await asyncio.sleep(delay)
+        
+        logger.error("All retries exhausted, using mock analysis")
+        return self._mock_analyze_batch(flagged_tokens)
+    
     def _analyze_with_splitting(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
-        """Split large batch into smaller chunks and process sequentially"""
+        """Split large batch into smaller chunks and process them on a thread pool"""
         chunk_size = min(self.MAX_BATCH_SIZE, math.ceil(len(flagged_tokens) / 3))
         chunks = [flagged_tokens[i:i + chunk_size] for i in range(0, len(flagged_tokens), chunk_size)]
         
-        self.stats["batches_split"] += 1
-        logger.info(f"📦 Splitting {len(flagged_tokens)} tokens into {len(chunks)} batches of ~{chunk_size}")
+        self._incr_stat("batches_split")
+        logger.info("📦 Splitting %d tokens into %d batches of ~%d", len(flagged_tokens), len(chunks), chunk_size)
         
-        all_trade_plans = []
-        for idx, chunk in enumerate(chunks, 1):
-            logger.info(f"  Processing chunk {idx}/{len(chunks)} ({len(chunk)} tokens)...")
-            trade_plans = self._gemini_analyze_batch(chunk)
-            all_trade_plans.extend(trade_plans)
-            
-            # Add delay between chunks to avoid rate limits
-            if idx < len(chunks):
-                time.sleep(2)
-        
-        return all_trade_plans
+        # API calls are I/O bound, so threads overlap them; _rate_limit still
+        # spaces request starts by min_request_interval across all workers
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as executor:
+            results = executor.map(self._gemini_analyze_batch, chunks)
+            return [trade_plan for trade_plans in results for trade_plan in trade_plans]
     
     def _parse_gemini_response(self, analyses: List[Dict], flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
         """Parse Gemini JSON response into TradePlan objects"""
         trade_plans = []
+        analyzed_at = _utc_now_iso()
         
         for analysis, flagged in zip(analyses, flagged_tokens):
             signal = flagged.signal
@@ -538,16 +857,17 @@ TIER 1 REASONING: {flagged.reasoning}
                 best_execution_chain=analysis["best_execution_chain"],
                 estimated_gas_usd=5.0,  # Would come from gas oracle
                 reasoning=analysis["reasoning"],
-                risk_factors=analysis["risk_factors"],
-                analyzed_at=datetime.utcnow().isoformat(),
+                risk_factors=tuple(analysis["risk_factors"]),
+                analyzed_at=analyzed_at,
                 urgency_score=flagged.urgency_score
             )
             
             trade_plans.append(trade_plan)
+            self._cache_put(flagged, trade_plan)
             
             logger.info(
-                f"  └─ {trade_plan.token_symbol}: {trade_plan.decision} "
-                f"(conf: {trade_plan.confidence}%)"
+                "  └─ %s: %s (conf: %s%%)",
+                trade_plan.token_symbol, trade_plan.decision, trade_plan.confidence
             )
         
         return trade_plans
@@ -579,59 +899,226 @@ TIER 1 REASONING: {flagged.reasoning}
         if not flagged_tokens:
             return []
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        logger.info(f"🔍 Analyzing {len(flagged_tokens)} tokens in SINGLE BATCH request...")
+        logger.info("🔍 Analyzing %d tokens in SINGLE BATCH request...", len(flagged_tokens))
         
         if self.mock_mode:
             trade_plans = self._mock_analyze_batch(flagged_tokens)
         else:
-            trade_plans = self._gemini_analyze_batch(flagged_tokens)
+            trade_plans, send_idx = self._pre_gate(flagged_tokens)
+            if send_idx:
+                api_plans = self._gemini_analyze_batch([flagged_tokens[i] for i in send_idx])
+                for i, plan in zip(send_idx, api_plans):
+                    trade_plans[i] = plan
+        
+        processing_time_ms = (time.perf_counter() - start_time) * 1000
+        self._record_batch_stats(trade_plans, processing_time_ms)
         
-        processing_time_ms = (time.time() - start_time) * 1000
+        return trade_plans
+    
+    def iter_analyze_batch(self, flagged_tokens: List[FlaggedToken]) -> Iterator[TradePlan]:
+        """
+        Lazily analyze a batch, one MAX_BATCH_SIZE sub-batch at a time
         
-        # Update stats
-        for trade_plan in trade_plans:
-            self.stats["total_analyzed"] += 1
-            if trade_plan.decision == "SHORT":
-                self.stats["total_shorts"] += 1
-            elif trade_plan.decision == "MONITOR":
-                self.stats["total_monitors"] += 1
+        Consumers can act on the first plans before the rest of the batch has
+        been analyzed, and only one sub-batch of plans is held at a time.
+        """
+        for i in range(0, len(flagged_tokens), self.MAX_BATCH_SIZE):
+            yield from self.analyze_batch(flagged_tokens[i:i + self.MAX_BATCH_SIZE])
+    
+    def _pre_gate(self, flagged_tokens: List[FlaggedToken]) -> Tuple[List[TradePlan], List[int]]:
+        """
+        Score the batch with the rule engine before spending API tokens
+        
+        Tokens below mock_gate keep their rule-engine plan, and tokens analyzed
+        within RESULT_CACHE_TTL_S with identical signals reuse the cached API
+        plan. Returns the plans and the indices still to send to Gemini;
+        callers overwrite those entries with the API plans.
+        """
+        trade_plans = self._mock_analyze_batch(flagged_tokens)
+        send_idx = []
+        skipped = cache_hits = 0
+        
+        for i, plan in enumerate(trade_plans):
+            if plan.confidence < self.mock_gate:
+                plan.reasoning = f"Pre-gated by rule engine. {plan.reasoning}"
+                skipped += 1
+                continue
+            
+            cached = self._cache_get(flagged_tokens[i])
+            if cached is not None:
+                trade_plans[i] = cached
+                cache_hits += 1
             else:
-                self.stats["total_passes"] += 1
-        
-        # Update avg processing time
-        if self.stats["total_analyzed"] > 0:
-            self.stats["avg_processing_time_ms"] = (
-                (self.stats["avg_processing_time_ms"] * (self.stats["total_analyzed"] - len(trade_plans)) 
-                 + processing_time_ms)
-                / self.stats["total_analyzed"]
+                send_idx.append(i)
+        
+        self._incr_stat("api_calls_skipped", skipped)
+        self._incr_stat("cache_hits", cache_hits)
+        if skipped or cache_hits:
+            logger.info(
+                "⏭️  Kept %d/%d tokens out of the API request (%d pre-gated, %d cached)",
+                skipped + cache_hits, len(trade_plans), skipped, cache_hits
             )
         
+        return trade_plans, send_idx
+    
+    def _cache_get(self, flagged: FlaggedToken) -> Optional[TradePlan]:
+        """Return a cached API plan for this token if its signals are unchanged and fresh"""
+        key = _result_cache_key(flagged)
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._result_cache[key]
+                return None
+            return entry[1]
+    
+    def _cache_put(self, flagged: FlaggedToken, trade_plan: TradePlan):
+        """Remember an API plan for RESULT_CACHE_TTL_S, evicting the oldest entry when full"""
+        key = _result_cache_key(flagged)
+        with self._cache_lock:
+            self._result_cache[key] = (time.monotonic() + self.RESULT_CACHE_TTL_S, trade_plan)
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _record_batch_stats(self, trade_plans: List[TradePlan], processing_time_ms: float):
+        """Update decision counters and timing after a batch completes"""
+        with self._stats_lock:
+            # Update stats
+            for trade_plan in trade_plans:
+                self.stats["total_analyzed"] += 1
+                if trade_plan.decision == "SHORT":
+                    self.stats["total_shorts"] += 1
+                elif trade_plan.decision == "MONITOR":
+                    self.stats["total_monitors"] += 1
+                else:
+                    self.stats["total_passes"] += 1
+            
+            # Accumulate processing time (averaged lazily in get_stats)
+            self.stats["sum_processing_time_ms"] += processing_time_ms
+        
         # Log batch results
-        shorts = sum(1 for tp in trade_plans if tp.decision == "SHORT")
-        monitors = sum(1 for tp in trade_plans if tp.decision == "MONITOR")
-        passes = sum(1 for tp in trade_plans if tp.decision == "PASS")
+        if logger.isEnabledFor(logging.INFO):
+            shorts = sum(1 for tp in trade_plans if tp.decision == "SHORT")
+            monitors = sum(1 for tp in trade_plans if tp.decision == "MONITOR")
+            passes = sum(1 for tp in trade_plans if tp.decision == "PASS")
+            
+            logger.info(
+                "✅ Batch analysis complete: %d SHORT, %d MONITOR, %d PASS (processed in %.0fms)",
+                shorts, monitors, passes, processing_time_ms
+            )
+    
+    async def analyze_batch_async(self, flagged_tokens: List[FlaggedToken],
+                                  concurrency: Optional[int] = None) -> List[TradePlan]:
+        """
+        Analyze a batch of flagged tokens with concurrent API requests
         
-        logger.info(
-            f"✅ Batch analysis complete: {shorts} SHORT, {monitors} MONITOR, "
-            f"{passes} PASS (processed in {processing_time_ms:.0f}ms)"
-        )
+        The batch is split into sub-batches of MAX_BATCH_SIZE which are sent
+        concurrently, bounded by a semaphore so we stay under the rate limit.
+        
+        Args:
+            flagged_tokens: List of FlaggedToken from Tier 1 screening
+            concurrency: Max in-flight requests (default MAX_CONCURRENT_REQUESTS)
+        
+        Returns:
+            List of TradePlan in the same order as the input batch
+        """
+        if not flagged_tokens:
+            return []
+        
+        if self.mock_mode:
+            return self.analyze_batch(flagged_tokens)
+        
+        start_time = time.perf_counter()
+        
+        trade_plans, send_idx = self._pre_gate(flagged_tokens)
+        async for idx_chunk, plans in self._analyze_sub_batches_async(flagged_tokens, send_idx, concurrency):
+            for i, plan in zip(idx_chunk, plans):
+                trade_plans[i] = plan
+        
+        processing_time_ms = (time.perf_counter() - start_time) * 1000
+        self._record_batch_stats(trade_plans, processing_time_ms)
         
         return trade_plans
     
+    async def iter_analyze_batch_async(self, flagged_tokens: List[FlaggedToken],
+                                       concurrency: Optional[int] = None) -> AsyncIterator[TradePlan]:
+        """
+        Like analyze_batch_async, but yields TradePlans as they become available
+        
+        Pre-gated plans come first, then each sub-batch's plans as soon as that
+        request completes (completion order, not input order).
+        """
+        if self.mock_mode:
+            for trade_plan in self.iter_analyze_batch(flagged_tokens):
+                yield trade_plan
+            return
+        
+        if not flagged_tokens:
+            return
+        
+        start_time = time.perf_counter()
+        
+        trade_plans, send_idx = self._pre_gate(flagged_tokens)
+        sent = set(send_idx)
+        for i, trade_plan in enumerate(trade_plans):
+            if i not in sent:
+                yield trade_plan
+        
+        async for idx_chunk, plans in self._analyze_sub_batches_async(flagged_tokens, send_idx, concurrency):
+            for i, plan in zip(idx_chunk, plans):
+                trade_plans[i] = plan
+            for i in idx_chunk:
+                yield trade_plans[i]
+        
+        processing_time_ms = (time.perf_counter() - start_time) * 1000
+        self._record_batch_stats(trade_plans, processing_time_ms)
+    
+    async def _analyze_sub_batches_async(
+        self, flagged_tokens: List[FlaggedToken], send_idx: List[int], concurrency: Optional[int]
+    ) -> AsyncIterator[Tuple[List[int], List[TradePlan]]]:
+        """
+        Send the tokens at send_idx in concurrent sub-batches of MAX_BATCH_SIZE
+        and yield (token indices, plans) for each one as soon as it completes
+        """
+        idx_chunks = [
+            send_idx[i:i + self.MAX_BATCH_SIZE]
+            for i in range(0, len(send_idx), self.MAX_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(concurrency or self.MAX_CONCURRENT_REQUESTS)
+        
+        async def bounded(idx_chunk: List[int]) -> Tuple[List[int], List[TradePlan]]:
+            chunk = [flagged_tokens[i] for i in idx_chunk]
+            try:
+                async with semaphore:
+                    return idx_chunk, await self._gemini_analyze_chunk_async(chunk)
+            except Exception as e:
+                logger.error("Sub-batch failed (%s), using mock analysis", e)
+                self._incr_stat("api_errors")
+                return idx_chunk, self._mock_analyze_batch(chunk)
+        
+        logger.info("🔍 Analyzing %d tokens in %d concurrent requests...", len(send_idx), len(idx_chunks))
+        for next_done in asyncio.as_completed([bounded(idx_chunk) for idx_chunk in idx_chunks]):
+            yield await next_done
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get analysis statistics including rate limiting info"""
         return {
             **self.stats,
             "short_rate": self.stats["total_shorts"] / max(self.stats["total_analyzed"], 1),
+            "avg_processing_time_ms": self.stats["sum_processing_time_ms"] / max(self.stats["total_analyzed"], 1),
             "current_model": self._get_current_model() if not self.mock_mode else "mock",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     from data_ingestion import DataIngestion
     from local_llm_screener import LocalLLMScreener
     
@@ -7,20 +7,212 @@ smart contract on Arbitrum. It bridges the gap between off-chain AI decisions an
 on-chain execution.
 
 Key Features:
-- Web3.py integration for Arbitrum
+- Web3.py (AsyncWeb3) integration for Arbitrum
 - Transaction signing with agent private key
 - Nonce management and gas estimation
 - Error handling and retry logic
 - LI.FI route data preparation
 """
 
-from web3 import Web3
+from eth_abi import encode as abi_encode
+from web3 import AsyncWeb3, Web3
+from web3.providers.rpc import AsyncHTTPProvider
+from web3.exceptions import TimeExhausted, TransactionNotFound
 from eth_account import Account
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+import asyncio
+import logging
 import os
 import json
 import time
 from dataclasses import dataclass
+from functools import lru_cache
+from statistics import median
+import httpx
+
+try:
+    import coincurve  # eth-keys picks its libsecp256k1 backend automatically when importable
+except ImportError:  # Signing falls back to eth-keys' pure-Python secp256k1
+    coincurve = None
+
+logger = logging.getLogger(__name__)
+
+# Token symbols -> Arbitrum addresses, checksummed once at import
+_TOKEN_ADDRESSES = {
+    symbol: Web3.to_checksum_address(address)
+    for symbol, address in {
+        "WETH": "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1",  # Wrapped ETH on Arbitrum
+        "WBTC": "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f",  # Wrapped BTC on Arbitrum
+        "ARB": "0x912CE59144191C1204E64559FE8253a0e49E6548",   # Arbitrum token
+        "USDC": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",  # USDC on Arbitrum
+        "USDT": "0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9",  # USDT on Arbitrum
+    }.items()
+}
+
+
+# EIP-1559 fee sampling: median priority fee at this reward percentile over the last N blocks
+_FEE_HISTORY_BLOCKS = 5
+_FEE_HISTORY_PERCENTILE = 50
+
+# Calldata for the two state-changing vault calls is encoded by hand: the
+# selector is computed once here and eth-abi encodes the arguments directly,
+# skipping web3's per-call ABI lookup and argument matching
+_BRIDGE_DATA_TYPE = "(bytes32,string,address,uint256,uint256)"
+_EXECUTE_SHORT_TYPES = ("address", "uint256", "uint256", "uint256", "string", _BRIDGE_DATA_TYPE)
+_CLOSE_POSITION_TYPES = ("uint256", "uint256", "bool", "string", "address", _BRIDGE_DATA_TYPE)
+_EXECUTE_SHORT_SELECTOR = Web3.keccak(text=f"executeShort({','.join(_EXECUTE_SHORT_TYPES)})")[:4]
+_CLOSE_POSITION_SELECTOR = Web3.keccak(text=f"closePosition({','.join(_CLOSE_POSITION_TYPES)})")[:4]
+
+
+_ZERO_TXID = b'\x00' * 32  # bytes32 transaction ID for direct (unbridged) execution
+
+
+def _encode_call(selector: bytes, types: Tuple[str, ...], args: tuple) -> str:
+    """Hex calldata for a contract call: 4-byte selector + ABI-encoded arguments"""
+    return "0x" + (selector + abi_encode(types, args)).hex()
+
+
+# topic0 of NexusVault's ShortExecuted event (positionId is the first indexed arg)
+_SHORT_EXECUTED_TOPIC = Web3.keccak(
+    text="ShortExecuted(uint256,address,uint256,uint256,uint256,uint16,bytes32)"
+)
+
+# Receipt polling: start fast (Arbitrum blocks are ~250ms) and back off
+_RECEIPT_TIMEOUT_S = 120
+_RECEIPT_POLL_INITIAL_S = 0.05
+_RECEIPT_POLL_BACKOFF = 1.3
+_RECEIPT_POLL_MAX_S = 1.0
+
+# Gas limits: eth_estimateGas result (cached per contract method) plus a safety
+# margin; the fixed defaults are only used if estimation fails
+_GAS_LIMIT_BUFFER = 1.1
+_DEFAULT_GAS_LIMITS = {
+    'executeShort': 800000,
+    'closePosition': 500000,
+}
+
+
+@lru_cache(maxsize=256)
+def _checksum_address(address: str) -> str:
+    """Memoized EIP-55 checksum - the same few addresses are traded repeatedly"""
+    return Web3.to_checksum_address(address)
+
+
+# Simplified NexusVault ABI with just the functions we need, built once at import
+_VAULT_ABI = [
+    {
+        "inputs": [
+            {"name": "indexToken", "type": "address"},
+            {"name": "amountUSDC", "type": "uint256"},
+            {"name": "leverage", "type": "uint256"},
+            {"name": "acceptablePrice", "type": "uint256"},
+            {"name": "sourceChain", "type": "string"},
+            {
+                "name": "bridgeData",
+                "type": "tuple",
+                "components": [
+                    {"name": "transactionId", "type": "bytes32"},
+                    {"name": "bridge", "type": "string"},
+                    {"name": "receiver", "type": "address"},
+                    {"name": "destinationChainId", "type": "uint256"},
+                    {"name": "minAmount", "type": "uint256"}
+                ]
+            }
+        ],
+        "name": "executeShort",
+        "outputs": [{"name": "positionId", "type": "uint256"}],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "positionId", "type": "uint256"},
+            {"name": "minExitPrice", "type": "uint256"},
+            {"name": "bridgeBack", "type": "bool"},
+            {"name": "destinationChain", "type": "string"},
+            {"name": "recipient", "type": "address"},
+            {
+                "name": "bridgeData",
+                "type": "tuple",
+                "components": [
+                    {"name": "transactionId", "type": "bytes32"},
+                    {"name": "bridge", "type": "string"},
+                    {"name": "receiver", "type": "address"},
+                    {"name": "destinationChainId", "type": "uint256"},
+                    {"name": "minAmount", "type": "uint256"}
+                ]
+            }
+        ],
+        "name": "closePosition",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getTotalVaultValue",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getOpenPositions",
+        "outputs": [{
+            "name": "",
+            "type": "tuple[]",
+            "components": [
+                {"name": "id", "type": "uint256"},
+                {"name": "indexToken", "type": "address"},
+                {"name": "collateralUSDC", "type": "uint256"},
+                {"name": "positionSizeUSD", "type": "uint256"},
+                {"name": "leverage", "type": "uint256"},
+                {"name": "entryPrice", "type": "uint256"},
+                {"name": "entryTimestamp", "type": "uint256"},
+                {"name": "gmxPositionKey", "type": "bytes32"},
+                {"name": "isOpen", "type": "bool"},
+                {"name": "sourceChain", "type": "string"}
+            ]
+        }],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+
+class _PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that posts through a shared httpx client
+    
+    One pooled keep-alive client (HTTP/2 when the RPC is served over TLS)
+    carries every call, so concurrent trades multiplex over warm connections
+    instead of each paying a fresh TCP+TLS handshake. Encoding, decoding and
+    web3's request caching are inherited unchanged.
+    """
+    
+    def __init__(self, endpoint_uri: str, client: httpx.AsyncClient):
+        super().__init__(endpoint_uri)
+        self._client = client
+    
+    async def _post(self, request_data: bytes) -> bytes:
+        response = await self._client.post(
+            self.endpoint_uri, content=request_data, headers=self.get_request_headers()
+        )
+        response.raise_for_status()
+        return response.content
+    
+    async def _make_request(self, method, request_data: bytes) -> bytes:
+        return await self._post(request_data)
+    
+    async def make_batch_request(self, batch_requests):
+        response = self.decode_rpc_response(
+            await self._post(self.encode_batch_rpc_request(batch_requests))
+        )
+        if not isinstance(response, list):
+            return response  # RPC errors come back as one error object
+        # JSON-RPC doesn't guarantee batch response order
+        return sorted(response, key=lambda r: r["id"])
+
 
 @dataclass
 class TradePlan:
@@ -51,117 +243,63 @@ class ContractExecutor:
     def __init__(self):
         # Load environment variables
         self.rpc_url = os.getenv('RPC_URL', 'https://sepolia-rollup.arbitrum.io/rpc')
-        self.agent_key = os.getenv('AGENT_PRIVATE_KEY')
+        agent_key = os.getenv('AGENT_PRIVATE_KEY')
         self.vault_address = os.getenv('NEXUS_VAULT_ADDRESS')
         
-        if not self.agent_key:
+        if not agent_key:
             raise ValueError("AGENT_PRIVATE_KEY not set")
         if not self.vault_address:
             raise ValueError("NEXUS_VAULT_ADDRESS not set")
         
-        # Setup Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        
-        if not self.w3.is_connected():
+        # Setup Web3: async client so concurrent trades overlap their RPC waits;
+        # the one-off connectivity check runs synchronously so __init__ can fail fast
+        if not Web3(Web3.HTTPProvider(self.rpc_url)).is_connected():
             raise ConnectionError("Failed to connect to Arbitrum RPC")
-        
-        # Setup account
-        self.account = Account.from_key(self.agent_key)
+        # Both clients share one keep-alive connection pool
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=10)
+            )
+        )
+        self.w3 = AsyncWeb3(_PooledHTTPProvider(self.rpc_url, self._http))
+        # web3's batching flag lives on the provider, so while a batch is in
+        # flight every other request on that provider is queued into it too.
+        # Tx param batches get their own client (only used under _nonce_lock)
+        # so they can't swallow concurrent trades' receipt polls or estimates.
+        self._batch_w3 = AsyncWeb3(_PooledHTTPProvider(self.rpc_url, self._http))
+        
+        # Setup account: the key is parsed once here and transactions are signed
+        # with the account's key object rather than re-parsing the hex string
+        self.account = Account.from_key(agent_key)
         self.agent_address = self.account.address
-        
-        print(f"✅ Connected to Arbitrum")
-        print(f"   Agent address: {self.agent_address}")
-        print(f"   Vault address: {self.vault_address}")
+        self._chain_id: Optional[int] = None  # Fetched with the first tx params batch
+        self._nonce: Optional[int] = None  # Next nonce to use, seeded from the 'pending' count
+        self._nonce_lock = asyncio.Lock()
+        self._nonces_in_flight = 0  # Reserved nonces whose transaction hasn't been sent or dropped yet
+        self._nonce_stale = False  # Re-sync from the node once nothing is in flight
+        self._gas_cache: Dict[str, int] = {}  # Contract method -> buffered gas limit
+        # Bridge data struct for direct execution on Arbitrum: no transaction ID or
+        # bridge, proceeds to the agent on Arbitrum (chain 42161), no minimum amount
+        self._direct_bridge_data = (_ZERO_TXID, "", self.agent_address, 42161, 0)
+        
+        logger.info("✅ Connected to Arbitrum (agent %s, vault %s)", self.agent_address, self.vault_address)
+        if coincurve is None:
+            logger.warning("coincurve not installed, transactions are signed with pure-Python secp256k1")
         
         # Load contract ABI
+        self._vault_cs = Web3.to_checksum_address(self.vault_address)
         self.vault_abi = self._load_vault_abi()
         self.vault = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.vault_address),
+            address=self._vault_cs,
             abi=self.vault_abi
         )
     
     def _load_vault_abi(self) -> List:
-        """Load NexusVault ABI from file or define inline"""
-        # Simplified ABI with just the functions we need
-        return [
-            {
-                "inputs": [
-                    {"name": "indexToken", "type": "address"},
-                    {"name": "amountUSDC", "type": "uint256"},
-                    {"name": "leverage", "type": "uint256"},
-                    {"name": "acceptablePrice", "type": "uint256"},
-                    {"name": "sourceChain", "type": "string"},
-                    {
-                        "name": "bridgeData",
-                        "type": "tuple",
-                        "components": [
-                            {"name": "transactionId", "type": "bytes32"},
-                            {"name": "bridge", "type": "string"},
-                            {"name": "receiver", "type": "address"},
-                            {"name": "destinationChainId", "type": "uint256"},
-                            {"name": "minAmount", "type": "uint256"}
-                        ]
-                    }
-                ],
-                "name": "executeShort",
-                "outputs": [{"name": "positionId", "type": "uint256"}],
-                "stateMutability": "payable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"name": "positionId", "type": "uint256"},
-                    {"name": "minExitPrice", "type": "uint256"},
-                    {"name": "bridgeBack", "type": "bool"},
-                    {"name": "destinationChain", "type": "string"},
-                    {"name": "recipient", "type": "address"},
-                    {
-                        "name": "bridgeData",
-                        "type": "tuple",
-                        "components": [
-                            {"name": "transactionId", "type": "bytes32"},
-                            {"name": "bridge", "type": "string"},
-                            {"name": "receiver", "type": "address"},
-                            {"name": "destinationChainId", "type": "uint256"},
-                            {"name": "minAmount", "type": "uint256"}
-                        ]
-                    }
-                ],
-                "name": "closePosition",
-                "outputs": [],
-                "stateMutability": "payable",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "getTotalVaultValue",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "getOpenPositions",
-                "outputs": [{
-                    "name": "",
-                    "type": "tuple[]",
-                    "components": [
-                        {"name": "id", "type": "uint256"},
-                        {"name": "indexToken", "type": "address"},
-                        {"name": "collateralUSDC", "type": "uint256"},
-                        {"name": "positionSizeUSD", "type": "uint256"},
-                        {"name": "leverage", "type": "uint256"},
-                        {"name": "entryPrice", "type": "uint256"},
-                        {"name": "entryTimestamp", "type": "uint256"},
-                        {"name": "gmxPositionKey", "type": "bytes32"},
-                        {"name": "isOpen", "type": "bool"},
-                        {"name": "sourceChain", "type": "string"}
-                    ]
-                }],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
+        """NexusVault ABI (module-level, shared by every executor instance)"""
+        return _VAULT_ABI
     
     async def execute_trade(self, trade_plan) -> str:
         """
@@ -175,17 +313,8 @@ class ContractExecutor:
         """
         from agent.gemini_analyzer import TradePlan as GeminiTradePlan
         
-        # Map token symbols to actual Arbitrum addresses
-        TOKEN_ADDRESSES = {
-            "WETH": "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1",  # Wrapped ETH on Arbitrum
-            "WBTC": "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f",  # Wrapped BTC on Arbitrum
-            "ARB": "0x912CE59144191C1204E64559FE8253a0e49E6548",   # Arbitrum token
-            "USDC": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",  # USDC on Arbitrum
-            "USDT": "0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9",  # USDT on Arbitrum
-        }
-        
         # Default to WETH if token not found or invalid
-        token_address = TOKEN_ADDRESSES.get(trade_plan.token_symbol, TOKEN_ADDRESSES["WETH"])
+        token_address = _TOKEN_ADDRESSES.get(trade_plan.token_symbol, _TOKEN_ADDRESSES["WETH"])
         
         # Convert to ContractExecutor TradePlan format
         executor_plan = TradePlan(
@@ -200,16 +329,12 @@ class ContractExecutor:
         )
         
         # Execute the short
-        print(f"\n🚀 Executing SHORT position...")
-        print(f"   Token: {executor_plan.token_symbol} ({token_address})")
-        print(f"   Amount: ${executor_plan.collateral_usdc / 1_000_000:.2f} USDC")
-        print(f"   Leverage: {executor_plan.leverage}x")
-        print(f"   Entry Price: ${executor_plan.entry_price / 10**30:.2f}")
+        logger.info("🚀 Executing SHORT position on %s (%s)", executor_plan.token_symbol, token_address)
         
-        tx_hash = self.execute_short(executor_plan)
+        tx_hash = await self.execute_short(executor_plan)
         return tx_hash
     
-    def execute_short(
+    async def execute_short(
         self,
         trade_plan: TradePlan,
         lifi_route: Optional[Dict] = None
@@ -224,83 +349,84 @@ class ContractExecutor:
         Returns:
             Transaction hash (0x...)
         """
-        print(f"\n⚡ Executing SHORT on {trade_plan.token_symbol}")
-        print(f"   Collateral: ${trade_plan.collateral_usdc / 1e6:.2f} USDC")
-        print(f"   Leverage: {trade_plan.leverage}x")
-        print(f"   Entry price: ${trade_plan.entry_price / 1e30:.2f}")
-        print(f"   Confidence: {trade_plan.confidence}%")
+        logger.info("⚡ Executing SHORT on %s", trade_plan.token_symbol)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "   Collateral: $%.2f USDC, leverage: %dx, entry price: $%.2f, confidence: %d%%",
+                trade_plan.collateral_usdc / 1e6, trade_plan.leverage,
+                trade_plan.entry_price / 1e30, trade_plan.confidence
+            )
         
         # Prepare bridge data (if cross-chain)
         if trade_plan.source_chain.lower() != "arbitrum" and lifi_route:
             bridge_data = self._prepare_bridge_data(lifi_route)
         else:
             # Direct execution on Arbitrum (no bridge needed)
-            bridge_data = (
-                b'\x00' * 32,  # Empty transaction ID
-                "",  # Empty bridge name
-                self.agent_address,  # Receiver
-                42161,  # Arbitrum chain ID
-                0  # Min amount
-            )
+            bridge_data = self._direct_bridge_data
         
         # Get GMX execution fee (usually ~0.0001 ETH)
         gmx_fee = self.w3.to_wei(0.0001, 'ether')
         
         # Build transaction
+        nonce = None
         try:
-            # Get current gas price and increase it by 20% to ensure it goes through
-            base_gas_price = self.w3.eth.gas_price
-            gas_price = int(base_gas_price * 1.2)
-            
-            tx = self.vault.functions.executeShort(
-                Web3.to_checksum_address(trade_plan.token_address),
-                trade_plan.collateral_usdc,
-                trade_plan.leverage,
-                trade_plan.entry_price,
-                trade_plan.source_chain,
-                bridge_data
-            ).build_transaction({
+            tx = {
                 'from': self.agent_address,
+                'to': self._vault_cs,
                 'value': gmx_fee,
-                'gas': 800000,  # Gas limit
-                'gasPrice': gas_price,  # Use increased gas price
-                'nonce': self.w3.eth.get_transaction_count(self.agent_address),
-                'chainId': 421614  # Arbitrum Sepolia testnet
+                'data': _encode_call(_EXECUTE_SHORT_SELECTOR, _EXECUTE_SHORT_TYPES, (
+                    _checksum_address(trade_plan.token_address),
+                    trade_plan.collateral_usdc,
+                    trade_plan.leverage,
+                    trade_plan.entry_price,
+                    trade_plan.source_chain,
+                    bridge_data
+                )),
+            }
+            gas_limit = await self._gas_limit('executeShort', tx)
+            max_fee, priority_fee, nonce = await self._fetch_tx_params()
+            
+            tx.update({
+                'gas': gas_limit,
+                'maxFeePerGas': max_fee,
+                'maxPriorityFeePerGas': priority_fee,
+                'type': 2,  # EIP-1559
+                'nonce': nonce,
+                'chainId': self._chain_id
             })
         except Exception as e:
-            print(f"❌ Failed to build transaction: {e}")
+            if nonce is not None:
+                await self._settle_nonce(nonce, sent=False)  # Reserved but never used
+            logger.error("❌ Failed to build transaction: %s", e)
             raise
         
-        # Sign transaction
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.agent_key)
-        
-        # Send transaction
+        # Sign and send transaction
         try:
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            print(f"✅ Transaction sent: {tx_hash.hex()}")
+            tx_hash = await self._sign_and_send(tx)
+            logger.info("✅ Transaction sent: %s", tx_hash.hex())
             
             # Wait for confirmation
-            print("   Waiting for confirmation...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            receipt = await self._wait_for_receipt(tx_hash)
             
             if receipt['status'] == 1:
-                print(f"✅ Transaction confirmed in block {receipt['blockNumber']}")
+                logger.info("✅ Transaction confirmed in block %d", receipt['blockNumber'])
                 
                 # Parse position ID from logs
                 position_id = self._parse_position_id(receipt)
                 if position_id:
-                    print(f"   Position ID: {position_id}")
+                    logger.info("   Position ID: %d", position_id)
                 
                 return tx_hash.hex()
             else:
-                print(f"❌ Transaction reverted")
+                logger.error("❌ Transaction reverted")
+                self._gas_cache.pop('executeShort', None)  # Re-estimate in case it ran out of gas
                 raise Exception("Transaction failed on-chain")
                 
         except Exception as e:
-            print(f"❌ Transaction failed: {e}")
+            logger.error("❌ Transaction failed: %s", e)
             raise
     
-    def close_position(
+    async def close_position(
         self,
         position_id: int,
         min_exit_price: int,
@@ -321,58 +447,204 @@ class ContractExecutor:
         Returns:
             Transaction hash
         """
-        print(f"\n🔚 Closing position #{position_id}")
-        print(f"   Min exit price: ${min_exit_price / 1e30:.2f}")
+        logger.info("🔚 Closing position #%d", position_id)
+        logger.debug("   Min exit price: $%.2f", min_exit_price / 1e30)
         
         # Empty bridge data for now (can be enhanced with LI.FI)
+        recipient = _checksum_address(recipient) if recipient else self.agent_address
         bridge_data = (
-            b'\x00' * 32,
+            _ZERO_TXID,
             "",
-            recipient or self.agent_address,
+            recipient,
             0,
             0
         )
         
         gmx_fee = self.w3.to_wei(0.0001, 'ether')
-        
-        tx = self.vault.functions.closePosition(
-            position_id,
-            min_exit_price,
-            bridge_back,
-            destination_chain,
-            Web3.to_checksum_address(recipient or self.agent_address),
-            bridge_data
-        ).build_transaction({
+        tx = {
             'from': self.agent_address,
+            'to': self._vault_cs,
             'value': gmx_fee,
-            'gas': 500000,
-            'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(self.agent_address),
-            'chainId': 42161
+            'data': _encode_call(_CLOSE_POSITION_SELECTOR, _CLOSE_POSITION_TYPES, (
+                position_id,
+                min_exit_price,
+                bridge_back,
+                destination_chain,
+                recipient,
+                bridge_data
+            )),
+        }
+        gas_limit = await self._gas_limit('closePosition', tx)
+        max_fee, priority_fee, nonce = await self._fetch_tx_params()
+        
+        tx.update({
+            'gas': gas_limit,
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': priority_fee,
+            'type': 2,  # EIP-1559
+            'nonce': nonce,
+            'chainId': self._chain_id
         })
         
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.agent_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = await self._sign_and_send(tx)
         
-        print(f"✅ Close transaction sent: {tx_hash.hex()}")
+        logger.info("✅ Close transaction sent: %s", tx_hash.hex())
         
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = await self._wait_for_receipt(tx_hash)
         
         if receipt['status'] == 1:
-            print(f"✅ Position closed successfully")
+            logger.info("✅ Position closed successfully")
         else:
-            print(f"❌ Close transaction failed")
+            logger.error("❌ Close transaction failed")
+            self._gas_cache.pop('closePosition', None)  # Re-estimate in case it ran out of gas
         
         return tx_hash.hex()
     
-    def get_vault_balance(self) -> float:
+    async def _wait_for_receipt(self, tx_hash: bytes, timeout: float = _RECEIPT_TIMEOUT_S) -> Dict:
+        """
+        Poll eth_getTransactionReceipt until the transaction is mined
+        
+        Polls every 50ms at first and backs off by 1.3x up to 1s, so fast
+        confirmations are seen within a block or two without hammering the
+        RPC on slow ones. Raises TimeExhausted after timeout seconds, like
+        web3's wait_for_transaction_receipt.
+        """
+        deadline = time.monotonic() + timeout
+        poll_interval = _RECEIPT_POLL_INITIAL_S
+        while True:
+            try:
+                return await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                pass
+            
+            if time.monotonic() >= deadline:
+                raise TimeExhausted(f"Transaction {tx_hash.hex()} not mined after {timeout}s")
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * _RECEIPT_POLL_BACKOFF, _RECEIPT_POLL_MAX_S)
+    
+    async def _gas_limit(self, method: str, call_tx: Dict) -> int:
+        """
+        Gas limit for a contract method: estimated once (from the call's
+        from/to/value/data), padded by _GAS_LIMIT_BUFFER and cached until a
+        transaction of that method reverts
+        """
+        gas_limit = self._gas_cache.get(method)
+        if gas_limit is not None:
+            return gas_limit
+        
+        try:
+            estimate = await self.w3.eth.estimate_gas(call_tx)
+        except Exception as e:
+            logger.warning("Gas estimation for %s failed, using default limit: %s", method, e)
+            return _DEFAULT_GAS_LIMITS[method]
+        
+        gas_limit = self._gas_cache[method] = int(estimate * _GAS_LIMIT_BUFFER)
+        return gas_limit
+    
+    async def _fetch_tx_params(self) -> Tuple[int, int, int]:
+        """
+        Fetch EIP-1559 fees and reserve a nonce for a new transaction
+        
+        Fees come from one eth_feeHistory call: the priority fee is the median
+        of the recent per-block rewards, and maxFeePerGas leaves room for the
+        next block's base fee to double. The nonce is tracked locally: it is only fetched (as the 'pending'
+        transaction count) the first time and after reset_nonce(), then
+        incremented per transaction. Whatever has to come from the node - fee
+        history, plus the nonce and chain ID when not known yet - goes out as one
+        JSON-RPC batch round trip, falling back to concurrent individual calls
+        for providers (or web3 versions) without batch support. Every reserved
+        nonce must be handed to _settle_nonce once its transaction is sent or dropped.
+        
+        Returns:
+            (max_fee_per_gas, max_priority_fee_per_gas, nonce)
+        """
+        async with self._nonce_lock:
+            eth = self._batch_w3.eth
+            calls = [lambda: eth.fee_history(_FEE_HISTORY_BLOCKS, 'latest', [_FEE_HISTORY_PERCENTILE])]
+            if self._nonce is None:
+                calls.append(lambda: eth.get_transaction_count(self.agent_address, 'pending'))
+            if self._chain_id is None:
+                calls.append(lambda: eth.chain_id)
+            
+            try:
+                async with self._batch_w3.batch_requests() as batch:
+                    for call in calls:
+                        batch.add(call())
+                    results = await batch.async_execute()
+            except Exception as e:
+                logger.warning("RPC batching unavailable, fetching tx params individually: %s", e)
+                results = await asyncio.gather(*(call() for call in calls))
+            
+            results = iter(results)
+            fee_history = next(results)
+            if self._nonce is None:
+                self._nonce = int(next(results))
+            if self._chain_id is None:
+                self._chain_id = int(next(results))
+            
+            nonce = self._nonce
+            self._nonce += 1
+            self._nonces_in_flight += 1
+        
+        # baseFeePerGas has one extra entry: the base fee of the next block
+        base_fee = fee_history['baseFeePerGas'][-1]
+        priority_fee = int(median(reward[0] for reward in fee_history['reward']))
+        return 2 * base_fee + priority_fee, priority_fee, nonce
+    
+    async def aclose(self):
+        """Close the pooled RPC connections"""
+        await self._http.aclose()
+    
+    async def reset_nonce(self):
+        """Forget the local nonce so the next transaction re-syncs it from the node"""
+        async with self._nonce_lock:
+            self._nonce = None
+    
+    async def _settle_nonce(self, nonce: int, sent: bool, rejected: bool = False):
+        """
+        Release a nonce reserved by _fetch_tx_params once its transaction went out or was dropped
+        
+        A nonce that never reached the node is handed back if no later one has
+        been reserved since. Otherwise (a gap, or a node rejection such as a
+        stale nonce) the local nonce is re-synced from the node, but only once
+        no other reserved nonce is still waiting to be sent: re-reading the
+        'pending' count earlier would hand out nonces in-flight trades hold.
+        """
+        async with self._nonce_lock:
+            self._nonces_in_flight -= 1
+            if not sent:
+                if not rejected and self._nonce == nonce + 1:
+                    self._nonce = nonce
+                else:
+                    self._nonce_stale = True
+            if self._nonce_stale and self._nonces_in_flight == 0:
+                self._nonce = None
+                self._nonce_stale = False
+    
+    async def _sign_and_send(self, tx: Dict) -> bytes:
+        """Sign and submit a transaction, releasing its nonce whether or not it went out"""
+        try:
+            signed_tx = self.account.sign_transaction(tx)
+        except Exception:
+            await self._settle_nonce(tx['nonce'], sent=False)
+            raise
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception:
+            # Rejected (stale nonce, underpriced replacement, ...) or lost in transit
+            await self._settle_nonce(tx['nonce'], sent=False, rejected=True)
+            raise
+        await self._settle_nonce(tx['nonce'], sent=True)
+        return tx_hash
+    
+    async def get_vault_balance(self) -> float:
         """Get total USDC in vault"""
-        balance = self.vault.functions.getTotalVaultValue().call()
+        balance = await self.vault.functions.getTotalVaultValue().call()
         return balance / 1e6  # Convert to USDC
     
-    def get_open_positions(self) -> List[Dict]:
+    async def get_open_positions(self) -> List[Dict]:
         """Get all open positions"""
-        positions = self.vault.functions.getOpenPositions().call()
+        positions = await self.vault.functions.getOpenPositions().call()
         
         result = []
         for pos in positions:
@@ -392,10 +664,11 @@ class ContractExecutor:
     
     def _prepare_bridge_data(self, lifi_route: Dict) -> tuple:
         """Convert LI.FI route to Solidity bridge data struct"""
+        route_id = lifi_route.get('id')
         return (
-            Web3.to_bytes(hexstr=lifi_route.get('id', '0x' + '00' * 32)),  # Transaction ID
+            bytes.fromhex(route_id.removeprefix('0x')) if route_id else _ZERO_TXID,  # Transaction ID
             lifi_route.get('steps', [{}])[0].get('toolDetails', {}).get('name', 'stargate'),  # Bridge name
-            Web3.to_checksum_address(self.agent_address),  # Receiver
+            self.agent_address,  # Receiver (already checksummed by eth-account)
             lifi_route.get('toChainId', 42161),  # Destination chain ID
             int(lifi_route.get('toAmountMin', '0'))  # Min amount
         )
@@ -403,24 +676,24 @@ class ContractExecutor:
     def _parse_position_id(self, receipt: Dict) -> Optional[int]:
         """Parse position ID from transaction receipt"""
         try:
-            # Look for ShortExecuted event
+            # Look for the vault's ShortExecuted event (web3 returns log addresses
+            # checksummed); its second topic is the position ID
             for log in receipt['logs']:
-                if log['address'].lower() == self.vault_address.lower():
-                    # First topic is event signature, second is position ID
-                    if len(log['topics']) >= 2:
-                        position_id = int.from_bytes(log['topics'][1], 'big')
-                        return position_id
+                topics = log['topics']
+                if topics and topics[0] == _SHORT_EXECUTED_TOPIC and log['address'] == self._vault_cs:
+                    return int.from_bytes(topics[1], 'big')
         except Exception as e:
-            print(f"Warning: Could not parse position ID: {e}")
+            logger.warning("Could not parse position ID: %s", e)
         
         return None
 
 # Example usage
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
     executor = ContractExecutor()
     
     # Check vault balance
-    balance = executor.get_vault_balance()
+    balance = asyncio.run(executor.get_vault_balance())
     print(f"Vault balance: ${balance:,.2f} USDC")
     
     # Example trade plan
@@ -436,5 +709,5 @@ if __name__ == '__main__':
     )
     
     # Execute (uncomment to actually execute)
-    # tx_hash = executor.execute_short(trade)
+    # tx_hash = asyncio.run(executor.execute_short(trade))
     # print(f"Transaction: https://arbiscan.io/tx/{tx_hash}")
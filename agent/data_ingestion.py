@@ -5,13 +5,16 @@ Generates mock crypto token signals for Tier 1 screening
 
 import random
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterator
+from dataclasses import dataclass, asdict, fields
 import json
 
+import numpy as np
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class TokenSignal:
     """Represents a complete signal bundle for a crypto token"""
     token_symbol: str
@@ -51,6 +54,15 @@ class TokenSignal:
     category: str  # "memecoin", "defi", "lsd", "gaming", "infra"
 
 
+# TokenSignal field names in constructor order (for building signals from columns)
+_SIGNAL_FIELDS = tuple(f.name for f in fields(TokenSignal))
+
+
+def _utc_timestamp() -> str:
+    """Signal timestamp: UTC, second resolution"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
 class DataIngestion:
     """Generates realistic mock token signals for testing"""
     
@@ -58,32 +70,38 @@ class DataIngestion:
     CATEGORIES = ["memecoin", "defi", "lsd", "gaming", "infra"]
     
     # Realistic token name prefixes for each category
-    MEMECOIN_PREFIXES = ["PEPE", "DOGE", "SHIB", "FLOKI", "WOJAK", "BONK", "MEME", "MOON", "SAFE", "ELON"]
-    DEFI_PREFIXES = ["PROTOCOL", "SWAP", "VAULT", "LEND", "YIELD", "FARM", "STAKE", "LIQUID", "SYNTH", "CURVE"]
-    LSD_PREFIXES = ["stETH", "rETH", "cbETH", "frxETH", "sfrxETH", "wstETH", "ankrETH", "stMATIC"]
+    MEMECOIN_PREFIXES = ("PEPE", "DOGE", "SHIB", "FLOKI", "WOJAK", "BONK", "MEME", "MOON", "SAFE", "ELON")
+    MEMECOIN_SUFFIXES = ("", "INU", "COIN", "TOKEN", "2.0", "AI")
+    DEFI_PREFIXES = ("PROTOCOL", "SWAP", "VAULT", "LEND", "YIELD", "FARM", "STAKE", "LIQUID", "SYNTH", "CURVE")
+    LSD_PREFIXES = ("stETH", "rETH", "cbETH", "frxETH", "sfrxETH", "wstETH", "ankrETH", "stMATIC")
+    OTHER_PREFIXES = ("GAME", "PLAY", "META", "BUILD")  # Numbered 1-999 (gaming, infra)
     
     def __init__(self, seed: int = 42):
         """Initialize with optional random seed for reproducibility"""
         random.seed(seed)
+        self.rng = np.random.default_rng(seed)  # Vectorized batch generation
         self.generated_count = 0
     
     def generate_token_address(self) -> str:
         """Generate realistic Ethereum-style address"""
-        return "0x" + "".join(random.choices("0123456789abcdef", k=40))
+        return "0x" + random.randbytes(20).hex()
+    
+    def _generate_token_addresses(self, n: int) -> List[str]:
+        """n addresses from one bulk RNG draw, hex-encoded in a single call"""
+        hexed = self.rng.bytes(20 * n).hex()
+        return ["0x" + hexed[i:i + 40] for i in range(0, 40 * n, 40)]
     
     def generate_token_symbol(self, category: str) -> str:
         """Generate realistic token symbol based on category"""
-        if category == "memecoin":
-            prefix = random.choice(self.MEMECOIN_PREFIXES)
-            suffix = random.choice(["", "INU", "COIN", "TOKEN", "2.0", "AI"])
-            return f"${prefix}{suffix}"
-        elif category == "defi":
-            prefix = random.choice(self.DEFI_PREFIXES)
-            return f"${prefix}"
-        elif category == "lsd":
-            return random.choice(self.LSD_PREFIXES)
-        else:
-            return f"${random.choice(['GAME', 'PLAY', 'META', 'BUILD'])}{random.randint(1, 999)}"
+        return random.choice(_SYMBOL_POOLS.get(category, _OTHER_SYMBOLS))
+    
+    def _generate_token_symbols(self, categories: np.ndarray) -> np.ndarray:
+        """Symbols for a column of categories, one bulk draw per category"""
+        symbols = np.empty(len(categories), dtype=_SYMBOL_DTYPE)
+        for category in np.unique(categories).tolist():
+            mask = categories == category
+            symbols[mask] = self.rng.choice(_SYMBOL_ARRAYS.get(category, _OTHER_SYMBOL_ARRAY), np.count_nonzero(mask))
+        return symbols
     
     def generate_rug_pull_signal(self) -> TokenSignal:
         """Generate high-confidence rug pull signal (for testing)"""
@@ -92,7 +110,7 @@ class DataIngestion:
             token_symbol=self.generate_token_symbol(category),
             token_address=self.generate_token_address(),
             chain=random.choice(self.CHAINS),
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_utc_timestamp(),
             
             # Strong negative on-chain signals
             tvl_change_24h=random.uniform(-60, -30),  # Major TVL drop
@@ -133,7 +151,7 @@ class DataIngestion:
             token_symbol=self.generate_token_symbol(category),
             token_address=self.generate_token_address(),
             chain=random.choice(self.CHAINS),
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_utc_timestamp(),
             
             # Positive on-chain signals
             tvl_change_24h=random.uniform(-5, 15),  # Stable or growing
@@ -174,7 +192,7 @@ class DataIngestion:
             token_symbol=self.generate_token_symbol(category),
             token_address=self.generate_token_address(),
             chain=random.choice(self.CHAINS),
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_utc_timestamp(),
             
             # Mixed on-chain signals
             tvl_change_24h=random.uniform(-25, -10),  # Moderate decline
@@ -208,46 +226,167 @@ class DataIngestion:
             category=category
         )
     
-    def generate_batch(self, size: int = 100, rug_pull_ratio: float = 0.05) -> List[TokenSignal]:
+    def _rug_pull_columns(self, n: int) -> Dict[str, np.ndarray]:
+        """Column-wise generate_rug_pull_signal for n tokens"""
+        rng = self.rng
+        return {
+            "chain": rng.choice(self.CHAINS, n),
+            "tvl_change_24h": rng.uniform(-60, -30, n),
+            "tvl_usd": rng.uniform(500_000, 5_000_000, n),
+            "liquidity_change_24h": rng.uniform(-70, -40, n),
+            "holder_concentration_top10": rng.uniform(70, 95, n),
+            "insider_sells_24h": rng.integers(5, 15, n, endpoint=True),
+            "insider_sell_volume_usd": rng.uniform(200_000, 1_000_000, n),
+            "twitter_engagement_change_48h": rng.uniform(-80, -50, n),
+            "twitter_mentions_24h": rng.integers(100, 500, n, endpoint=True),
+            "twitter_sentiment_score": rng.uniform(-0.8, -0.4, n),
+            "influencer_silence_hours": rng.uniform(48, 120, n),
+            "github_commits_7d": rng.integers(0, 2, n, endpoint=True),
+            "github_commit_change": rng.uniform(-90, -60, n),
+            "dev_departures_30d": rng.integers(2, 5, n, endpoint=True),
+            "recent_vote_type": rng.choice(["inflation", "treasury_raid"], n),
+            "vote_passed": np.ones(n, dtype=bool),
+            "price_change_24h": rng.uniform(-70, -40, n),
+            "volume_24h_usd": rng.uniform(1_000_000, 10_000_000, n),
+            "market_cap_usd": rng.uniform(5_000_000, 50_000_000, n),
+            "category": np.full(n, "memecoin"),
+        }
+    
+    def _healthy_columns(self, n: int) -> Dict[str, np.ndarray]:
+        """Column-wise generate_healthy_signal for n tokens"""
+        rng = self.rng
+        return {
+            "chain": rng.choice(self.CHAINS, n),
+            "tvl_change_24h": rng.uniform(-5, 15, n),
+            "tvl_usd": rng.uniform(10_000_000, 500_000_000, n),
+            "liquidity_change_24h": rng.uniform(-3, 10, n),
+            "holder_concentration_top10": rng.uniform(15, 35, n),
+            "insider_sells_24h": rng.integers(0, 2, n, endpoint=True),
+            "insider_sell_volume_usd": rng.uniform(0, 50_000, n),
+            "twitter_engagement_change_48h": rng.uniform(-10, 20, n),
+            "twitter_mentions_24h": rng.integers(500, 5000, n, endpoint=True),
+            "twitter_sentiment_score": rng.uniform(0.2, 0.7, n),
+            "influencer_silence_hours": rng.uniform(0, 24, n),
+            "github_commits_7d": rng.integers(10, 50, n, endpoint=True),
+            "github_commit_change": rng.uniform(-10, 30, n),
+            "dev_departures_30d": np.zeros(n, dtype=np.int64),
+            "recent_vote_type": np.full(n, "neutral"),
+            "vote_passed": rng.random(n) < 0.5,
+            "price_change_24h": rng.uniform(-10, 15, n),
+            "volume_24h_usd": rng.uniform(5_000_000, 100_000_000, n),
+            "market_cap_usd": rng.uniform(50_000_000, 1_000_000_000, n),
+            "category": rng.choice(["defi", "infra", "gaming"], n),
+        }
+    
+    def _moderate_risk_columns(self, n: int) -> Dict[str, np.ndarray]:
+        """Column-wise generate_moderate_risk_signal for n tokens"""
+        rng = self.rng
+        return {
+            "chain": rng.choice(self.CHAINS, n),
+            "tvl_change_24h": rng.uniform(-25, -10, n),
+            "tvl_usd": rng.uniform(2_000_000, 20_000_000, n),
+            "liquidity_change_24h": rng.uniform(-20, 5, n),
+            "holder_concentration_top10": rng.uniform(40, 60, n),
+            "insider_sells_24h": rng.integers(2, 5, n, endpoint=True),
+            "insider_sell_volume_usd": rng.uniform(50_000, 200_000, n),
+            "twitter_engagement_change_48h": rng.uniform(-40, -10, n),
+            "twitter_mentions_24h": rng.integers(200, 1000, n, endpoint=True),
+            "twitter_sentiment_score": rng.uniform(-0.3, 0.1, n),
+            "influencer_silence_hours": rng.uniform(12, 48, n),
+            "github_commits_7d": rng.integers(3, 10, n, endpoint=True),
+            "github_commit_change": rng.uniform(-30, 10, n),
+            "dev_departures_30d": rng.integers(0, 1, n, endpoint=True),
+            "recent_vote_type": rng.choice(["fee_increase", "neutral"], n),
+            "vote_passed": rng.random(n) < 0.5,
+            "price_change_24h": rng.uniform(-30, -5, n),
+            "volume_24h_usd": rng.uniform(500_000, 5_000_000, n),
+            "market_cap_usd": rng.uniform(10_000_000, 100_000_000, n),
+            "category": rng.choice(self.CATEGORIES, n),
+        }
+    
+    def _profile_columns(self, profiles: np.ndarray, timestamp: str) -> Dict[str, np.ndarray]:
         """
-        Generate batch of mixed signals
+        Columns for rows whose risk profiles are given in order
+        (0 = rug pull, 1 = moderate risk, 2 = healthy)
         
-        Args:
-            size: Number of signals to generate
-            rug_pull_ratio: Percentage of signals that should be rug pulls (0-1)
-        
-        Returns:
-            List of TokenSignal objects
+        Each numeric field is drawn for a whole risk profile with one NumPy
+        call instead of one random call per token, then scattered to that
+        profile's rows.
         """
-        signals = []
+        counts = np.bincount(profiles, minlength=3)
+        drawn = (
+            self._rug_pull_columns(counts[0]),
+            self._moderate_risk_columns(counts[1]),
+            self._healthy_columns(counts[2]),
+        )
+        
+        # Profile-by-profile draws line up with the rows in stable sorted order
+        rows = np.argsort(profiles, kind="stable")
+        columns = {}
+        for field in drawn[0]:
+            stacked = np.concatenate([p[field] for p in drawn])
+            columns[field] = np.empty_like(stacked)
+            columns[field][rows] = stacked
         
+        size = len(profiles)
+        columns["token_symbol"] = self._generate_token_symbols(columns["category"])
+        columns["token_address"] = np.array(self._generate_token_addresses(size))
+        columns["timestamp"] = np.full(size, timestamp)
+        return columns
+    
+    def _shuffled_profiles(self, size: int, rug_pull_ratio: float) -> np.ndarray:
+        """Risk profile code per row, in shuffled order (only the codes are shuffled)"""
         num_rug_pulls = int(size * rug_pull_ratio)
         num_moderate = int(size * 0.15)  # 15% moderate risk
         num_healthy = size - num_rug_pulls - num_moderate
         
-        # Generate signals
-        for _ in range(num_rug_pulls):
-            signals.append(self.generate_rug_pull_signal())
-        
-        for _ in range(num_moderate):
-            signals.append(self.generate_moderate_risk_signal())
+        return self.rng.permutation(np.repeat(np.arange(3), (num_rug_pulls, num_moderate, num_healthy)))
+    
+    def generate_batch_columns(self, size: int = 100, rug_pull_ratio: float = 0.05) -> Dict[str, np.ndarray]:
+        """Generate a batch of mixed signals as columns (field name -> array, SoA)"""
+        columns = self._profile_columns(self._shuffled_profiles(size, rug_pull_ratio), _utc_timestamp())
+        self.generated_count += size
+        return columns
+    
+    def generate_batch_iter(
+        self, size: int = 100, rug_pull_ratio: float = 0.05, chunk_size: int = 1024
+    ) -> Iterator[TokenSignal]:
+        """
+        Generate a batch of mixed signals as a stream
         
-        for _ in range(num_healthy):
-            signals.append(self.generate_healthy_signal())
+        The shuffled profile order is fixed up front; signals are then drawn
+        and yielded chunk_size at a time, so large batches never hold more
+        than one chunk of TokenSignals and consumers can start screening
+        before generation finishes. The whole stream shares one timestamp.
+        """
+        profiles = self._shuffled_profiles(size, rug_pull_ratio)
+        timestamp = _utc_timestamp()
+        for start in range(0, size, chunk_size):
+            columns = self._profile_columns(profiles[start:start + chunk_size], timestamp)
+            self.generated_count += len(columns["timestamp"])
+            for row in zip(*(columns[field].tolist() for field in _SIGNAL_FIELDS)):
+                yield TokenSignal(*row)
+    
+    def generate_batch(self, size: int = 100, rug_pull_ratio: float = 0.05) -> List[TokenSignal]:
+        """
+        Generate batch of mixed signals
         
-        # Shuffle to mix them up
-        random.shuffle(signals)
+        Args:
+            size: Number of signals to generate
+            rug_pull_ratio: Percentage of signals that should be rug pulls (0-1)
         
-        self.generated_count += len(signals)
-        return signals
+        Returns:
+            List of TokenSignal objects
+        """
+        return list(self.generate_batch_iter(size, rug_pull_ratio))
     
     def signal_to_dict(self, signal: TokenSignal) -> Dict[str, Any]:
         """Convert TokenSignal to dictionary"""
         return asdict(signal)
     
     def batch_to_json(self, signals: List[TokenSignal]) -> str:
-        """Convert batch of signals to JSON string"""
-        return json.dumps([self.signal_to_dict(s) for s in signals], indent=2)
+        """Convert batch of signals to JSON string (orjson serializes the dataclasses natively)"""
+        return orjson.dumps(signals, option=orjson.OPT_INDENT_2).decode()
     
     def get_stats(self) -> Dict[str, int]:
         """Get generation statistics"""
@@ -257,23 +396,46 @@ class DataIngestion:
         }
 
 
+# Every symbol generate_token_symbol can produce, per category; drawing uniformly
+# from these pools matches drawing each symbol part independently
+_SYMBOL_POOLS = {
+    "memecoin": tuple(
+        f"${prefix}{suffix}"
+        for prefix in DataIngestion.MEMECOIN_PREFIXES
+        for suffix in DataIngestion.MEMECOIN_SUFFIXES
+    ),
+    "defi": tuple(f"${prefix}" for prefix in DataIngestion.DEFI_PREFIXES),
+    "lsd": DataIngestion.LSD_PREFIXES,
+}
+_OTHER_SYMBOLS = tuple(f"${prefix}{n}" for prefix in DataIngestion.OTHER_PREFIXES for n in range(1, 1000))
+
+# NumPy copies of the pools for batch generation
+_SYMBOL_ARRAYS = {category: np.array(pool) for category, pool in _SYMBOL_POOLS.items()}
+_OTHER_SYMBOL_ARRAY = np.array(_OTHER_SYMBOLS)
+_SYMBOL_DTYPE = np.result_type(_OTHER_SYMBOL_ARRAY, *_SYMBOL_ARRAYS.values())
+
+
 # Example usage
 if __name__ == "__main__":
     ingestion = DataIngestion()
     
-    # Generate a batch of 10 signals for testing
-    signals = ingestion.generate_batch(size=10, rug_pull_ratio=0.2)
+    # Generate a batch of 10 signals for testing (columns kept for the rug-pull mask below)
+    columns = ingestion.generate_batch_columns(size=10, rug_pull_ratio=0.2)
+    signals = [TokenSignal(*row) for row in zip(*(columns[field].tolist() for field in _SIGNAL_FIELDS))]
     
     print(f"Generated {len(signals)} signals")
     print("\nFirst signal:")
     print(json.dumps(ingestion.signal_to_dict(signals[0]), indent=2))
     
-    # Show which ones are likely rug pulls
+    # Show which ones are likely rug pulls (one boolean mask over the same batch's columns)
+    likely_rug = (
+        (columns["tvl_change_24h"] < -30)
+        & (columns["twitter_engagement_change_48h"] < -50)
+        & (columns["insider_sells_24h"] > 3)
+    )
+    
     print("\n" + "="*80)
     print("LIKELY RUG PULLS (for validation):")
-    for signal in signals:
-        if (signal.tvl_change_24h < -30 and 
-            signal.twitter_engagement_change_48h < -50 and
-            signal.insider_sells_24h > 3):
-            print(f"  🚩 {signal.token_symbol} on {signal.chain} - TVL: {signal.tvl_change_24h:.1f}%, "
-                  f"Engagement: {signal.twitter_engagement_change_48h:.1f}%")
+    for i in np.flatnonzero(likely_rug):
+        print(f"  🚩 {columns['token_symbol'][i]} on {columns['chain'][i]} - TVL: {columns['tvl_change_24h'][i]:.1f}%, "
+              f"Engagement: {columns['twitter_engagement_change_48h'][i]:.1f}%")
@@ -3,17 +3,42 @@ Gemini Analyzer (Tier 2)
 Deep analysis using Google Gemini with intelligent rate limiting and batch splitting
 """
 
+import asyncio
+import hashlib
+import io
 import logging
-import json
+import multiprocessing
+import struct
+import threading
 import time
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Tuple, Union, Iterable, Iterator, Callable
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import attrgetter
+from string import Template
 import os
 import math
 
-import google.generativeai as genai
-from google.generativeai import types
+import msgspec
+import numpy as np
+import orjson
+
+try:
+    from numba import njit, prange
+except ImportError:  # Mock scoring falls back to plain NumPy
+    njit = None
+    prange = range
+
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:  # google-genai is only needed outside mock mode
+    genai = None
+    types = None
 
 from .local_llm_screener import FlaggedToken
 
@@ -21,7 +46,427 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _format_token_block(idx: int, s, f: FlaggedToken) -> str:
+    """
+    Separator plus per-token block of the batch prompt (s = TokenSignal, f = FlaggedToken)
+    
+    An f-string is compiled once, so unlike str.format on a template string
+    the field references and format specs aren't re-parsed for every token.
+    """
+    return f"""
+================================================================================
+
+TOKEN {idx}:
+Symbol: {s.token_symbol}
+Address: {s.token_address}
+Chain: {s.chain}
+Category: {s.category}
+Market Cap: ${s.market_cap_usd:,.0f}
+Urgency Score: {f.urgency_score}/10
+
+ON-CHAIN SIGNALS (24h):
+- TVL: ${s.tvl_usd:,.0f} ({s.tvl_change_24h:+.1f}%)
+- Liquidity Change: {s.liquidity_change_24h:+.1f}%
+- Top 10 Holder Concentration: {s.holder_concentration_top10:.1f}%
+- Insider Sells: {s.insider_sells_24h} transactions, ${s.insider_sell_volume_usd:,.0f}
+
+SOCIAL SIGNALS:
+- Twitter Engagement Change (48h): {s.twitter_engagement_change_48h:+.1f}%
+- Twitter Mentions (24h): {s.twitter_mentions_24h}
+- Sentiment Score: {s.twitter_sentiment_score:.2f}
+- Influencer Silence: {s.influencer_silence_hours:.0f} hours
+
+PROTOCOL HEALTH:
+- GitHub Commits (7d): {s.github_commits_7d}
+- Commit Change: {s.github_commit_change:+.1f}%
+- Developer Departures (30d): {s.dev_departures_30d}
+
+GOVERNANCE:
+- Recent Vote: {s.recent_vote_type}
+- Vote Passed: {s.vote_passed}
+
+TIER 1 REASONING: {f.reasoning}
+"""
+
+# Mock red flags: confidence points and risk-factor text (formatted against the
+# TokenSignal), in the column order of the flag matrix in _mock_analyze_batch
+_MOCK_RISK_POINTS = np.array([15, 15, 10, 10, 5, 10], dtype=np.int64)
+_MOCK_RISK_TEMPLATES = (
+    "Insider selling: {s.insider_sells_24h} transactions",
+    "Liquidity removal: {s.liquidity_change_24h:.1f}%",
+    "TVL decline: {s.tvl_change_24h:.1f}%",
+    "Social media engagement declining",
+    "{s.dev_departures_30d} developer exits",
+    "Inflationary governance vote passed",
+)
+
+# Mock liquidity split is a fixed share of TVL per chain (ethereum 50%, arbitrum 30%,
+# base 15%, optimism 5%): ethereum is deepest for any non-negative TVL, and a
+# negative TVL would flip the order so the smallest share (optimism) wins
+_MOCK_BEST_CHAIN = "ethereum"
+_MOCK_BEST_CHAIN_NEGATIVE_TVL = "optimism"
+
+# Estimated gas per execution chain (USD)
+_GAS_COSTS_USD = {
+    "ethereum": 25.0,
+    "arbitrum": 2.0,
+    "base": 0.5,
+    "optimism": 1.5
+}
+
+# TokenSignal fields scored by the mock analyzer, packed one array per field
+# in the dtype the scoring kernel takes
+_SOA_FIELDS = {
+    "insider_sells_24h": np.int64,
+    "liquidity_change_24h": np.float64,
+    "tvl_change_24h": np.float64,
+    "twitter_engagement_change_48h": np.float64,
+    "dev_departures_30d": np.int64,
+    "vote_passed": np.bool_,
+    "market_cap_usd": np.float64,
+}
+
+# Kernel encodings: recent_vote_type -> int code, decision code -> decision
+_VOTE_TYPE_CODES = {"treasury_raid": 1, "inflation": 2}
+_DECISIONS = ("PASS", "MONITOR", "SHORT")
+
+# Mock take-profit levels (%), one row per category code (0 = any other category)
+_CATEGORY_CODES = {"memecoin": 1, "defi": 2}
+_TP_LEVELS = np.array([
+    [-20, -40, -60],
+    [-33, -67, -85],
+    [-25, -50, -70],
+], dtype=np.int64)
+
+
+def _score_kernel(urgency, insider_sells, liq_chg, tvl_chg, tw_chg, devs,
+                  vote_passed, vote_type_code, market_cap):
+    """
+    Mock scoring over a batch in one fused pass (compiled with numba)
+    
+    Returns (confidence, decision_code, position_size, current_price, flags)
+    where row i of flags holds the red flags of token i in
+    _MOCK_RISK_TEMPLATES order.
+    """
+    n = urgency.shape[0]
+    confidence = np.empty(n, np.int64)
+    decision_code = np.empty(n, np.int64)
+    position_size = np.empty(n, np.float64)
+    current_price = np.empty(n, np.float64)
+    flags = np.empty((n, 6), np.bool_)
+    
+    for i in prange(n):
+        flags[i, 0] = insider_sells[i] > 3
+        flags[i, 1] = liq_chg[i] < -20
+        flags[i, 2] = tvl_chg[i] < -25
+        flags[i, 3] = tw_chg[i] < -40
+        flags[i, 4] = devs[i] > 0
+        flags[i, 5] = vote_passed[i] and vote_type_code[i] == 2
+        
+        c = urgency[i] * 10
+        for j in range(6):
+            c += _MOCK_RISK_POINTS[j] * flags[i, j]
+        c = min(c, 100)
+        
+        # 0 = PASS, 1 = MONITOR, 2 = SHORT; size steps 10% / 15% / 20% at 70 / 80 / 90
+        confidence[i] = c
+        decision_code[i] = int(c >= 75) + int(c >= 60)
+        position_size[i] = 10.0 * (c >= 70) + 5.0 * (c >= 80) + 5.0 * (c >= 90)
+        
+        # Mock price: $1.00 above $10M market cap, else $0.50 (compare + mask, no branch)
+        current_price[i] = 0.5 + 0.5 * (market_cap[i] > 10_000_000)
+    
+    return confidence, decision_code, position_size, current_price, flags
+
+
+def _score_numpy(urgency, insider_sells, liq_chg, tvl_chg, tw_chg, devs,
+                 vote_passed, vote_type_code, market_cap):
+    """Vectorized NumPy equivalent of _score_kernel, used when numba isn't installed"""
+    flags = np.stack([
+        # High-impact signals
+        insider_sells > 3,
+        liq_chg < -20,
+        tvl_chg < -25,
+        # Medium-impact signals
+        tw_chg < -40,
+        devs > 0,
+        # Governance risks
+        vote_passed & (vote_type_code == 2),
+    ], axis=1)
+    
+    # Base confidence from Tier 1 urgency (urgency 7 = 70%) plus red flags, capped at 100%
+    confidence = np.minimum(urgency * 10 + flags.astype(np.int64) @ _MOCK_RISK_POINTS, 100)
+    
+    decision_code = (confidence >= 75).astype(np.int64) + (confidence >= 60)
+    position_size = np.select(
+        [confidence >= 90, confidence >= 80, confidence >= 70], [20.0, 15.0, 10.0], 0.0
+    )
+    current_price = 0.5 + 0.5 * (market_cap > 10_000_000)
+    
+    return confidence, decision_code, position_size, current_price, flags
+
+
+if njit is not None:
+    _score_batch = njit(cache=True, parallel=True)(_score_kernel)
+    # Compile at import, not on the first analysis
+    _score_batch(
+        np.zeros(1, np.int64), np.zeros(1, np.int64), np.zeros(1), np.zeros(1), np.zeros(1),
+        np.zeros(1, np.int64), np.zeros(1, np.bool_), np.zeros(1, np.int64), np.zeros(1)
+    )
+else:
+    _score_batch = _score_numpy
+
+# Numeric TokenSignal fields (+ urgency) packed for the result-cache digest
+_SIGNAL_KEY_STRUCT = struct.Struct("!10d5i?")
+
+
+def _result_cache_key(flagged: FlaggedToken) -> tuple:
+    """(address, chain, category, vote type, 16-byte BLAKE2b of the numeric signals)"""
+    s = flagged.signal
+    packed = _SIGNAL_KEY_STRUCT.pack(
+        s.market_cap_usd, s.tvl_usd, s.tvl_change_24h, s.liquidity_change_24h,
+        s.holder_concentration_top10, s.insider_sell_volume_usd,
+        s.twitter_engagement_change_48h, s.twitter_sentiment_score,
+        s.influencer_silence_hours, s.github_commit_change,
+        s.insider_sells_24h, s.twitter_mentions_24h, s.github_commits_7d,
+        s.dev_departures_30d, flagged.urgency_score,
+        s.vote_passed
+    )
+    return (
+        s.token_address, s.chain, s.category, s.recent_vote_type,
+        hashlib.blake2b(packed, digest_size=16).digest()
+    )
+
+
+class _TakeProfitLevel(msgspec.Struct):
+    """One entry of take_profit_levels in Gemini's output"""
+    price_target: float
+    level: int = 0
+    close_percent: float = 0.0
+
+
+class _GeminiAnalysis(msgspec.Struct):
+    """Per-token object in Gemini's JSON output (unknown fields are ignored)"""
+    token_address: str
+    decision: str
+    confidence: int
+    position_size_percent: float
+    take_profit_levels: List[_TakeProfitLevel]
+    stop_loss_percent: float
+    best_execution_chain: str
+    reasoning: str
+    risk_factors: List[str]
+    position_size_usd: Optional[float] = None
+    leverage: int = 2
+
+
+# Built once; lax mode accepts e.g. 85.0 or "85" for integer fields
+_ANALYSES_DECODER = msgspec.json.Decoder(Union[List[_GeminiAnalysis], _GeminiAnalysis], strict=False)
+
+
+def _decode_analyses(content: str) -> List[_GeminiAnalysis]:
+    """
+    Decode Gemini's JSON output straight into _GeminiAnalysis structs
+    
+    response_mime_type is JSON, so the text is decoded as-is first; only if
+    that fails is a markdown code fence stripped and the body decoded. If some
+    entries don't match the schema, the array is re-decoded entry by entry so
+    the valid ones survive. Raises msgspec.DecodeError on invalid JSON.
+    """
+    try:
+        return _decode_analyses_json(content)
+    except msgspec.DecodeError:
+        return _decode_analyses_json(_strip_json_fence(content))
+
+
+def _decode_analyses_json(content: str) -> List[_GeminiAnalysis]:
+    """_decode_analyses for text that is bare JSON"""
+    try:
+        analyses = _ANALYSES_DECODER.decode(content)
+    except msgspec.ValidationError:
+        items = msgspec.json.decode(content)
+        if not isinstance(items, list):
+            items = [items]
+        analyses = []
+        for item in items:
+            try:
+                analyses.append(msgspec.convert(item, _GeminiAnalysis, strict=False))
+            except msgspec.ValidationError:
+                continue
+        return analyses
+    
+    return analyses if isinstance(analyses, list) else [analyses]
+
+
+class _AnalysisStream:
+    """
+    Iterates a streamed Gemini JSON reply, yielding each analysis object as
+    soon as its closing brace arrives (before the rest of the array)
+    
+    Tracks bracket depth over the text chunks; records the full text and the
+    last usage_metadata for cost accounting.
+    """
+    __slots__ = ("chunks", "usage", "parts", "item_parts", "depth", "top_is_array",
+                 "started", "in_string", "escape")
+    
+    def __init__(self, chunks: Iterable):
+        self.chunks = chunks
+        self.usage = None
+        self.parts: List[str] = []
+        self.item_parts: Optional[List[str]] = None  # Text of the object being read, if any
+        self.depth = 0
+        self.top_is_array = False
+        self.started = False
+        self.in_string = False
+        self.escape = False
+    
+    def __iter__(self) -> Iterator[_GeminiAnalysis]:
+        for chunk in self.chunks:
+            self.usage = chunk.usage_metadata or self.usage
+            if not chunk.text:
+                continue
+            for item in self._feed(chunk.text):
+                try:
+                    yield msgspec.json.decode(item, type=_GeminiAnalysis, strict=False)
+                except msgspec.DecodeError as e:
+                    logger.warning(f"⚠️  Skipping malformed analysis in stream: {e}")
+        
+        if not self.started:
+            raise ValueError(f"No JSON in Gemini response: {self.text[:200]!r}")
+    
+    def _feed(self, text: str) -> List[str]:
+        """Scan one chunk; returns the texts of the objects it completed"""
+        self.parts.append(text)
+        completed = []
+        item_from = 0
+        item_depth = 1 if self.top_is_array else 0  # Depth an element returns to when it closes
+        
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == "[" or ch == "{":
+                if not self.started:
+                    self.started = True
+                    self.top_is_array = ch == "["
+                    item_depth = 1 if self.top_is_array else 0
+                if ch == "{" and self.depth == item_depth and self.item_parts is None:
+                    self.item_parts = []
+                    item_from = i
+                self.depth += 1
+            elif (ch == "]" or ch == "}") and self.started:
+                self.depth -= 1
+                if self.depth == item_depth and self.item_parts is not None:
+                    self.item_parts.append(text[item_from:i + 1])
+                    completed.append("".join(self.item_parts))
+                    self.item_parts = None
+        
+        if self.item_parts is not None:
+            self.item_parts.append(text[item_from:])
+        return completed
+    
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class _TokenBucket:
+    """
+    Token-bucket rate limiter: refills at rate per second up to burst
+    
+    acquire() reserves n tokens under the lock and then sleeps off any deficit
+    outside it, so the balance can go negative and concurrent callers queue
+    up in arrival order instead of all waking at once. Usable from worker
+    threads (acquire) and from the event loop (acquire_async).
+    """
+    __slots__ = ("rate", "burst", "tokens", "last", "lock")
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _reserve(self, n: float) -> float:
+        """Take n tokens; returns how long to wait before they are actually available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= n
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+    
+    def acquire(self, n: float = 1):
+        wait = self._reserve(n)
+        if wait:
+            time.sleep(wait)
+    
+    async def acquire_async(self, n: float = 1):
+        wait = self._reserve(n)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+def _run_coroutine(coro):
+    """
+    asyncio.run the sub-batch fan-out from synchronous code
+    
+    When the caller is itself running inside an event loop (where asyncio.run
+    refuses to start), the coroutine gets its own loop on a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 with millisecond precision"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _strip_json_fence(text: str) -> str:
+    """Return the body of the first markdown code fence (```json ... ```), or the text itself"""
+    start = text.find("```")
+    if start < 0:
+        return text.strip()
+    start += 3
+    if text.startswith("json", start):
+        start += 4
+    end = text.find("```", start)
+    return text[start:end if end >= 0 else len(text)].strip()
+
+
+def _batch_to_soa(flagged_tokens: List[FlaggedToken]) -> Dict[str, np.ndarray]:
+    """Pack the scored signal fields of a batch into one array per field (SoA)"""
+    n = len(flagged_tokens)
+    signals = [flagged.signal for flagged in flagged_tokens]
+    # fromiter fills each typed array straight from the attribute stream (no
+    # intermediate list, no dtype inference or conversion copy)
+    soa = {
+        field: np.fromiter(map(attrgetter(field), signals), dtype, count=n)
+        for field, dtype in _SOA_FIELDS.items()
+    }
+    soa["vote_type_code"] = np.fromiter(
+        map(_VOTE_TYPE_CODES.get, map(attrgetter("recent_vote_type"), signals), repeat(0)), np.int64, count=n
+    )
+    soa["category_code"] = np.fromiter(
+        map(_CATEGORY_CODES.get, map(attrgetter("category"), signals), repeat(0)), np.int64, count=n
+    )
+    soa["urgency_score"] = np.fromiter(map(attrgetter("urgency_score"), flagged_tokens), np.int64, count=n)
+    return soa
+
+
+@dataclass(slots=True)
 class TradePlan:
     """Structured trade recommendation from Gemini"""
     token_symbol: str
@@ -54,6 +499,146 @@ class TradePlan:
     
     analyzed_at: str
     urgency_score: int  # From Tier 1
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON (orjson encodes dataclasses natively, no asdict copy)"""
+        return orjson.dumps(self)
+
+
+# Mock batches at least this large are scored in a process pool instead of inline
+PARALLEL_MOCK_MIN_TOKENS = 1024
+
+_MOCK_POOL_WORKERS = os.cpu_count() or 1
+_mock_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_mock_pool() -> ProcessPoolExecutor:
+    """
+    Create the mock-analysis process pool on first use
+    
+    Workers are spawned, not forked: the pool starts lazily inside a process
+    that already runs threads (server, to_thread workers, HTTP clients), and
+    forking a multi-threaded process is unsafe.
+    """
+    global _mock_pool
+    if _mock_pool is None:
+        _mock_pool = ProcessPoolExecutor(
+            max_workers=_MOCK_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _mock_pool
+
+
+def _shutdown_mock_pool():
+    """Stop the mock-analysis workers; the next large mock batch starts a new pool"""
+    global _mock_pool
+    if _mock_pool is not None:
+        _mock_pool.shutdown()
+        _mock_pool = None
+
+
+def _mock_trade_plans(flagged_tokens: List[FlaggedToken], analyzed_at: str) -> List[TradePlan]:
+    """
+    Rule-based TradePlans for one shard of a mock batch
+    
+    Scoring runs over the whole shard at once (numba kernel, or NumPy
+    without numba); TradePlan objects are only built at the end, one per row.
+    Module-level so it can be shipped to the process pool.
+    """
+    if not flagged_tokens:
+        return []
+    
+    soa = _batch_to_soa(flagged_tokens)
+    
+    confidence, decision_codes, position_sizes, current_prices, flags = _score_batch(
+        soa["urgency_score"],
+        soa["insider_sells_24h"],
+        soa["liquidity_change_24h"],
+        soa["tvl_change_24h"],
+        soa["twitter_engagement_change_48h"],
+        soa["dev_departures_30d"],
+        soa["vote_passed"],
+        soa["vote_type_code"],
+        soa["market_cap_usd"]
+    )
+    
+    # Take-profit levels by category, priced off the mock entry price
+    tp_pcts = _TP_LEVELS[soa["category_code"]]
+    tp_prices = current_prices[:, None] * (1 + tp_pcts / 100)
+    stop_losses = current_prices * 1.12
+    
+    return [
+        _build_mock_trade_plan(
+            flagged,
+            decision=_DECISIONS[decision_code],
+            confidence=conf,
+            position_size_pct=position_size,
+            risk_factors=[tmpl.format(s=flagged.signal) for tmpl in compress(_MOCK_RISK_TEMPLATES, flag_row)],
+            current_price=price,
+            tp_pcts=tp_pct_row,
+            tp_prices=tp_price_row,
+            stop_loss=stop_loss,
+            analyzed_at=analyzed_at
+        )
+        for flagged, decision_code, conf, position_size, flag_row, price, tp_pct_row, tp_price_row, stop_loss
+        in zip(flagged_tokens, decision_codes.tolist(), confidence.tolist(), position_sizes.tolist(),
+               flags.tolist(), current_prices.tolist(), tp_pcts.tolist(), tp_prices.tolist(),
+               stop_losses.tolist())
+    ]
+
+
+def _build_mock_trade_plan(flagged: FlaggedToken, decision: str, confidence: int,
+                           position_size_pct: float, risk_factors: List[str],
+                           current_price: float, tp_pcts: List[int], tp_prices: List[float],
+                           stop_loss: float, analyzed_at: str) -> TradePlan:
+    """Fill in the confidence-independent parts of a mock TradePlan"""
+    signal = flagged.signal
+    
+    # Position size in USD (max $10k per trade for testing)
+    position_size_usd = position_size_pct * 500  # $10k if 20% 
+    
+    # leverage
+    leverage = 2 if confidence < 85 else 5
+    
+    # Best chain selection (prefer deepest liquidity)
+    best_chain = _MOCK_BEST_CHAIN if signal.tvl_usd >= 0 else _MOCK_BEST_CHAIN_NEGATIVE_TVL
+    
+    # Generate reasoning
+    if decision == "SHORT":
+        top_risks = risk_factors[:3]
+        reasoning = f"High-confidence short opportunity. {' + '.join(top_risks)}. "
+        reasoning += f"Execute on {best_chain} for optimal liquidity."
+    elif decision == "MONITOR":
+        reasoning = f"Moderate concerns detected: {', '.join(risk_factors[:2])}. "
+        reasoning += "Requires additional confirmation before entering position."
+    else:
+        reasoning = "Insufficient evidence for short position. Signals below confidence threshold."
+    
+    return TradePlan(
+        token_symbol=signal.token_symbol,
+        token_address=signal.token_address,
+        chain=signal.chain,
+        decision=decision,
+        confidence=confidence,
+        position_size_percent=position_size_pct,
+        position_size_usd=position_size_usd,
+        leverage=leverage,
+        entry_price=current_price,
+        take_profit_1=tp_prices[0],
+        take_profit_1_percent=tp_pcts[0],
+        take_profit_2=tp_prices[1],
+        take_profit_2_percent=tp_pcts[1],
+        take_profit_3=tp_prices[2],
+        take_profit_3_percent=tp_pcts[2],
+        stop_loss=stop_loss,
+        stop_loss_percent=12.0,
+        best_execution_chain=best_chain,
+        estimated_gas_usd=_GAS_COSTS_USD[best_chain],
+        reasoning=reasoning,
+        risk_factors=risk_factors,
+        analyzed_at=analyzed_at,
+        urgency_score=flagged.urgency_score
+    )
 
 
 class GeminiAnalyzer:
@@ -69,8 +654,17 @@ class GeminiAnalyzer:
     # Configuration constants
     MAX_TOKENS_PER_BATCH = 30000  # Conservative estimate for free tier
     MAX_BATCH_SIZE = 20  # Max tokens per API call
+    MAX_CONCURRENT_REQUESTS = 4  # In-flight sub-batch requests when a batch is split
+    RESULT_CACHE_SIZE = 1024  # API results kept for re-flagged tokens with unchanged signals
+    RESULT_CACHE_TTL_S = 300  # Replays one temperature-1.0 sample; set to 0 to always resample
+    PROCESSING_TIME_EMA_ALPHA = 0.1  # Weight of the latest batch in avg_processing_time_ms
+    TOKEN_ESTIMATE_EMA_ALPHA = 0.3  # Weight of the latest exact count in the chars-per-token ratio
     RETRY_DELAYS = [3, 6, 12]  # Exponential backoff delays (seconds)
     
+    # Proactive rate limits (token buckets holding a tenth of a minute's budget as burst)
+    REQUESTS_PER_MINUTE = 60
+    TOKENS_PER_MINUTE = 1_000_000
+    
     # Models in order of preference (will fallback if quota exceeded)
     MODELS = [
         "gemini-2.0-flash",       # Latest Gemini 2.0 Flash
@@ -79,13 +673,33 @@ class GeminiAnalyzer:
         "gemini-1.5-pro",         # Gemini 1.5 Pro fallback
     ]
     
-    # Gemini batch analysis prompt
-    BATCH_ANALYSIS_PROMPT = """You are an expert crypto trading analyst specializing in short-selling opportunities. 
-
-I will provide you with {num_tokens} flagged tokens that have been pre-screened. Analyze ALL of them in a SINGLE response and provide trade recommendations for each.
+    # Batch Mode (mode="batch"): half price, results within hours instead of seconds
+    BATCH_MODEL = "gemini-3-pro-preview"
+    BATCH_POLL_INTERVAL_S = 30
+    BATCH_TIMEOUT_S = 3600
+    BATCH_DONE_STATES = {
+        "JOB_STATE_SUCCEEDED",
+        "JOB_STATE_FAILED",
+        "JOB_STATE_CANCELLED",
+        "JOB_STATE_EXPIRED",
+    }
+    MODES = ("priority", "batch")
+    
+    # Per-call service tier, routed on the batch's highest Tier 1 urgency score
+    PRIORITY_URGENCY_MIN = 8  # >= this: PRIORITY (strict latency SLO, premium price)
+    FLEX_URGENCY_MAX = 4      # <= this: FLEX (sheddable, ~50% discount)
+    SERVICE_TIER_COST_MULTIPLIER = {
+        "PRIORITY": 1.8,  # Approximate premium over Standard
+        "STANDARD": 1.0,
+        "FLEX": 0.5,
+    }
+    
+    # Gemini batch analysis prompt: the static analyst role, criteria and output
+    # schema go in the system instruction (served from a context cache when
+    # possible), so each call's contents carry only the per-batch token data
+    SYSTEM_INSTRUCTION = """You are an expert crypto trading analyst specializing in short-selling opportunities. 
 
-FLAGGED TOKENS DATA:
-{tokens_data}
+You will be given a batch of flagged tokens that have been pre-screened. Analyze ALL of them in a SINGLE response and provide trade recommendations for each.
 
 ANALYSIS REQUIREMENTS FOR EACH TOKEN:
 1. Evaluate if this is a HIGH-CONFIDENCE short opportunity (≥70% confidence)
@@ -96,7 +710,7 @@ ANALYSIS REQUIREMENTS FOR EACH TOKEN:
 
 OUTPUT FORMAT (JSON ARRAY - ONE OBJECT PER TOKEN):
 [
-  {{
+  {
     "token_symbol": "TOKEN1",
     "token_address": "0x...",
     "chain": "ethereum",
@@ -104,16 +718,16 @@ OUTPUT FORMAT (JSON ARRAY - ONE OBJECT PER TOKEN):
     "confidence": 0-100,
     "position_size_percent": 0-20,
     "take_profit_levels": [
-      {{"level": 1, "price_target": -20.0, "close_percent": 30}},
-      {{"level": 2, "price_target": -50.0, "close_percent": 40}},
-      {{"level": 3, "price_target": -75.0, "close_percent": 30}}
+      {"level": 1, "price_target": -20.0, "close_percent": 30},
+      {"level": 2, "price_target": -50.0, "close_percent": 40},
+      {"level": 3, "price_target": -75.0, "close_percent": 30}
     ],
     "stop_loss_percent": 12.0,
     "leverage": 2-10,
     "best_execution_chain": "ethereum" | "arbitrum" | "base" | "optimism",
     "reasoning": "2-3 sentence explanation focusing on strongest signals",
     "risk_factors": ["list", "of", "3-5", "key", "risks"]
-  }},
+  },
   ... (repeat for all tokens)
 ]
 
@@ -128,22 +742,62 @@ CRITICAL CONSIDERATIONS:
 - Governance risks alone = MONITOR unless severe
 - Position sizing: Higher confidence = larger position (max 20%)
 - Chain selection: Deepest liquidity = best execution
+- token_address must be copied exactly from each token's Address field; it is used to match your analysis to the token"""
 
-Analyze all tokens and return a JSON array with complete analysis for each token:"""
+    # Per-request user payload (only the dynamic token data), parsed once at class load.
+    # The batch size goes after the token data so every request (and the implicit
+    # prefix cache when no explicit cache exists) starts with identical bytes
+    USER_PAYLOAD_TEMPLATE = Template("""FLAGGED TOKENS DATA:
+$tokens_data
+
+Analyze all $num_tokens tokens and return a JSON array with complete analysis for each token:""")
+    
+    PROMPT_CACHE_TTL_S = 3600
+    PROMPT_CACHE_REFRESH_MARGIN_S = 60  # Recreate slightly before the server-side expiry
+    CACHED_INPUT_DISCOUNT = 0.1  # Cached prefix tokens bill at ~10% of the input rate
 
-    def __init__(self, api_key: Optional[str] = None, mock_mode: bool = True):
+    def __init__(self, api_key: Optional[str] = None, mock_mode: bool = True,
+                 mode: str = "priority",
+                 on_trade_plan: Optional[Callable[[TradePlan], None]] = None):
         """
         Initialize Gemini Analyzer with intelligent rate limiting
         
         Args:
             api_key: Google API key (or set GEMINI_API_KEY env var)
             mock_mode: If True, use rule-based analysis instead of API calls
+            mode: "priority" for synchronous requests, "batch" to route
+                non-urgent flows (monitor scans, backtests) through Batch Mode
+            on_trade_plan: Called once per token with each TradePlan
+                analyze_batch produces, as soon as it exists: API plans while
+                the rest of the reply is still streaming, plus cache hits and
+                mock fallbacks, so execution can start early. analyze_batch
+                still returns every plan. Runs on worker threads (sub-batch
+                fan-out, background event loop), so hand plans off with a
+                queue.Queue or loop.call_soon_threadsafe and don't block;
+                exceptions it raises are logged and ignored. If a retry later
+                rebuilds a token's plan, only the first one is delivered.
         """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {self.MODES}")
+        
         self.mock_mode = mock_mode
-        self.model = None
+        self.mode = mode
+        self.on_trade_plan = on_trade_plan
+        self._emitted_tokens: set = set()  # id() of flagged tokens already sent to on_trade_plan
+        self._emit_lock = threading.Lock()
+        self.client = None
+        self.prompt_cache = None  # CachedContent holding SYSTEM_INSTRUCTION
+        self._prompt_cache_model = None
+        self._prompt_cache_expires_at = 0.0
+        self._prompt_cache_unsupported = set()  # Models where cache creation failed
+        self._gen_configs: Dict[Tuple[Optional[str], str], Any] = {}  # (cache name, tier) -> GenerateContentConfig
+        self._batch_jobs: Dict[str, List[FlaggedToken]] = {}  # job name -> submitted tokens
+        self._result_cache: "OrderedDict[tuple, Tuple[float, TradePlan]]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # Sub-batches may finish on worker threads
         self.current_model_index = 0  # Track which model we're using
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum seconds between requests
+        self._request_bucket = _TokenBucket(self.REQUESTS_PER_MINUTE / 60, self.REQUESTS_PER_MINUTE / 10)
+        self._token_bucket = _TokenBucket(self.TOKENS_PER_MINUTE / 60, self.TOKENS_PER_MINUTE / 10)
+        self._chars_per_token = 4.0  # Token estimate ratio, calibrated from count_tokens results
         
         self.stats = {
             "total_analyzed": 0,
@@ -151,12 +805,18 @@ Analyze all tokens and return a JSON array with complete analysis for each token
             "total_monitors": 0,
             "total_passes": 0,
             "total_api_cost_usd": 0.0,
-            "avg_processing_time_ms": 0,
+            "avg_processing_time_ms": 0.0,
             "api_errors": 0,
             "batch_requests": 0,
             "rate_limit_hits": 0,
             "model_fallbacks": 0,
-            "batches_split": 0
+            "batches_split": 0,
+            "batch_jobs_submitted": 0,
+            "batch_jobs_failed": 0,
+            "prompt_cache_hits": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cost_by_tier": {tier: 0.0 for tier in self.SERVICE_TIER_COST_MULTIPLIER}
         }
         
         if not mock_mode:
@@ -170,17 +830,59 @@ Analyze all tokens and return a JSON array with complete analysis for each token
         if not api_key:
             raise ValueError("Gemini API key required. Set GEMINI_API_KEY env var.")
         
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(self.MODELS[0])
-        logger.info(f"✅ Gemini API client initialized (model: {self.MODELS[0]})")
+        if genai is None:
+            raise ImportError("google-genai is required when mock_mode=False (pip install google-genai)")
+        
+        self._api_key = api_key
+        self.client = genai.Client(api_key=api_key)
+        logger.info(f"✅ Gemini API client initialized (model: {self.MODELS[0]}, mode: {self.mode})")
+        self._get_prompt_cache()
     
-    def _rate_limit(self):
-        """Enforce minimum time between API requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+    def _get_prompt_cache(self) -> Optional[str]:
+        """
+        Return the cached-content name holding the system instruction for the current model
+        
+        Cached contents are bound to a model, so the cache is recreated after a model
+        fallback or shortly before its TTL runs out. Returns None if caching is
+        unavailable (e.g. instruction below the model's minimum cacheable size).
+        """
+        model = self._get_current_model()
+        if (self.prompt_cache is not None and self._prompt_cache_model == model
+                and time.time() < self._prompt_cache_expires_at):
+            return self.prompt_cache.name
+        
+        self.prompt_cache = None
+        if model in self._prompt_cache_unsupported:
+            return None
+        
+        try:
+            self.prompt_cache = self.client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=self.SYSTEM_INSTRUCTION,
+                    ttl=f"{self.PROMPT_CACHE_TTL_S}s"
+                )
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Prompt caching unavailable for {model}, sending system instruction inline: {e}")
+            self._prompt_cache_unsupported.add(model)
+            return None
+        
+        self._prompt_cache_model = model
+        self._gen_configs.clear()  # Configs pinned to the previous cache name
+        self._prompt_cache_expires_at = time.time() + self.PROMPT_CACHE_TTL_S - self.PROMPT_CACHE_REFRESH_MARGIN_S
+        logger.info(f"🗄️  Cached system instruction as {self.prompt_cache.name} ({model})")
+        return self.prompt_cache.name
+    
+    def _rate_limit(self, prompt_tokens: int):
+        """Wait for request and token budget (RPM/TPM buckets) before an API request"""
+        self._request_bucket.acquire()
+        self._token_bucket.acquire(prompt_tokens)
+    
+    async def _rate_limit_async(self, prompt_tokens: int):
+        """_rate_limit without blocking the event loop"""
+        await self._request_bucket.acquire_async()
+        await self._token_bucket.acquire_async(prompt_tokens)
     
     def _get_current_model(self) -> str:
         """Get the current model to use"""
@@ -196,9 +898,61 @@ Analyze all tokens and return a JSON array with complete analysis for each token
             return True
         return False
     
+    def _select_service_tier(self, flagged_tokens: List[FlaggedToken]) -> str:
+        """Pick PRIORITY/STANDARD/FLEX from the most urgent token in the batch"""
+        max_urgency = max(flagged.urgency_score for flagged in flagged_tokens)
+        if max_urgency >= self.PRIORITY_URGENCY_MIN:
+            return "PRIORITY"
+        if max_urgency <= self.FLEX_URGENCY_MAX:
+            return "FLEX"
+        return "STANDARD"
+    
     def _estimate_token_count(self, text: str) -> int:
-        """Rough estimate of token count"""
-        return len(text) // 4  # Rough approximation
+        """
+        Estimate of token count from text length
+        
+        Starts at ~4 chars per token and tracks the ratio seen in exact
+        count_tokens results, so packing and split decisions follow how the
+        model actually tokenizes these prompts.
+        """
+        return int(len(text) / self._chars_per_token)
+    
+    def _count_prompt_tokens(self, prompt: str) -> int:
+        """Exact token count for the current model (one count_tokens RPC), estimate on failure"""
+        try:
+            total_tokens = self.client.models.count_tokens(
+                model=self._get_current_model(),
+                contents=prompt
+            ).total_tokens
+        except Exception as e:
+            logger.debug(f"count_tokens failed, estimating instead: {e}")
+            return self._estimate_token_count(prompt)
+        
+        if total_tokens:
+            self._chars_per_token += self.TOKEN_ESTIMATE_EMA_ALPHA * (
+                len(prompt) / total_tokens - self._chars_per_token
+            )
+        return total_tokens
+    
+    def _billed_tokens(self, usage, prompt: str, content: str,
+                       cache_name: Optional[str]) -> Tuple[float, float]:
+        """
+        (input_tokens, output_tokens) for cost accounting, with cached
+        prompt tokens weighted by CACHED_INPUT_DISCOUNT
+        
+        Uses the response's usage_metadata; falls back to estimating from text length.
+        """
+        if usage is not None and usage.prompt_token_count is not None:
+            cached_tokens = usage.cached_content_token_count or 0
+            input_tokens = (usage.prompt_token_count - cached_tokens
+                            + cached_tokens * self.CACHED_INPUT_DISCOUNT)
+            return input_tokens, usage.candidates_token_count or 0
+        
+        instruction_tokens = self._estimate_token_count(self.SYSTEM_INSTRUCTION)
+        if cache_name:
+            instruction_tokens *= self.CACHED_INPUT_DISCOUNT
+        input_tokens = self._estimate_token_count(prompt) + instruction_tokens
+        return input_tokens, self._estimate_token_count(content)
     
     def _should_split_batch(self, flagged_tokens: List[FlaggedToken]) -> bool:
         """Determine if batch should be split based on size"""
@@ -213,182 +967,79 @@ Analyze all tokens and return a JSON array with complete analysis for each token
         return total_estimated > self.MAX_TOKENS_PER_BATCH
     
     def _format_tokens_batch(self, flagged_tokens: List[FlaggedToken]) -> str:
-        """Format multiple flagged tokens for batch analysis"""
-        tokens_text = []
+        """
+        Format multiple flagged tokens for batch analysis
         
+        Written into one growable buffer, so large batches don't hold a list of
+        per-token strings alongside the joined result.
+        """
+        buf = io.StringIO()
         for idx, flagged in enumerate(flagged_tokens, 1):
-            signal = flagged.signal
-            token_text = f"""
-TOKEN {idx}:
-Symbol: {signal.token_symbol}
-Address: {signal.token_address}
-Chain: {signal.chain}
-Category: {signal.category}
-Market Cap: ${signal.market_cap_usd:,.0f}
-Urgency Score: {flagged.urgency_score}/10
-
-ON-CHAIN SIGNALS (24h):
-- TVL: ${signal.tvl_usd:,.0f} ({signal.tvl_change_24h:+.1f}%)
-- Liquidity Change: {signal.liquidity_change_24h:+.1f}%
-- Top 10 Holder Concentration: {signal.holder_concentration_top10:.1f}%
-- Insider Sells: {signal.insider_sells_24h} transactions, ${signal.insider_sell_volume_usd:,.0f}
-
-SOCIAL SIGNALS:
-- Twitter Engagement Change (48h): {signal.twitter_engagement_change_48h:+.1f}%
-- Twitter Mentions (24h): {signal.twitter_mentions_24h}
-- Sentiment Score: {signal.twitter_sentiment_score:.2f}
-- Influencer Silence: {signal.influencer_silence_hours:.0f} hours
-
-PROTOCOL HEALTH:
-- GitHub Commits (7d): {signal.github_commits_7d}
-- Commit Change: {signal.github_commit_change:+.1f}%
-- Developer Departures (30d): {signal.dev_departures_30d}
-
-GOVERNANCE:
-- Recent Vote: {signal.recent_vote_type}
-- Vote Passed: {signal.vote_passed}
-
-TIER 1 REASONING: {flagged.reasoning}
-"""
-            tokens_text.append(token_text)
-        
-        return "\n" + "="*80 + "\n".join(tokens_text)
+            buf.write(_format_token_block(idx, flagged.signal, flagged))
+        return buf.getvalue()
+    
+    def _format_request(self, flagged_tokens: List[FlaggedToken]) -> str:
+        """Build the dynamic part of the prompt for a batch"""
+        return self.USER_PAYLOAD_TEMPLATE.substitute(
+            num_tokens=len(flagged_tokens),
+            tokens_data=self._format_tokens_batch(flagged_tokens)
+        )
+    
+    def _build_full_prompt(self, request: str) -> str:
+        """System instruction plus request as one text, for sizing the whole prompt"""
+        return self.SYSTEM_INSTRUCTION + "\n\n" + request
     
     def _mock_analyze_batch(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
         """
         Rule-based batch analysis for testing (mock Gemini)
+        
+        Large batches (backtests) are sharded across CPU cores; smaller ones
+        are scored inline, where process start-up and pickling would dominate.
         """
-        trade_plans = []
+        if not flagged_tokens:
+            return []
         
-        for flagged in flagged_tokens:
-            signal = flagged.signal
-            
-            # Start with base confidence from Tier 1 urgency
-            confidence = flagged.urgency_score * 10  # urgency 7 = 70% base confidence
-            risk_factors = []
-            
-            # High-impact signals (boost confidence)
-            if signal.insider_sells_24h > 3:
-                confidence += 15
-                risk_factors.append(f"Insider selling: {signal.insider_sells_24h} transactions")
-            
-            if signal.liquidity_change_24h < -20:
-                confidence += 15
-                risk_factors.append(f"Liquidity removal: {signal.liquidity_change_24h:.1f}%")
-            
-            if signal.tvl_change_24h < -25:
-                confidence += 10
-                risk_factors.append(f"TVL decline: {signal.tvl_change_24h:.1f}%")
-            
-            # Medium-impact signals
-            if signal.twitter_engagement_change_48h < -40:
-                confidence += 10
-                risk_factors.append("Social media engagement declining")
-            
-            if signal.dev_departures_30d > 0:
-                confidence += 5
-                risk_factors.append(f"{signal.dev_departures_30d} developer exits")
-            
-            # Governance risks
-            if signal.vote_passed and signal.recent_vote_type == "inflation":
-                confidence += 10
-                risk_factors.append("Inflationary governance vote passed")
-            
-            # Cap at 100%
-            confidence = min(confidence, 100)
-            
-            # Determine decision
-            if confidence >= 75:
-                decision = "SHORT"
-            elif confidence >= 60:
-                decision = "MONITOR"
-            else:
-                decision = "PASS"
-            
-            # Position sizing based on confidence
-            if confidence >= 90:
-                position_size_pct = 20.0
-            elif confidence >= 80:
-                position_size_pct = 15.0
-            elif confidence >= 70:
-                position_size_pct = 10.0
-            else:
-                position_size_pct = 0.0
-            
-            # Position size in USD (max $10k per trade for testing)
-            position_size_usd = position_size_pct * 500  # $10k if 20% 
-            
-            # leverage
-            leverage = 2 if confidence < 85 else 5
-            
-            # Estimate current price (mock)
-            current_price = 1.0 if signal.market_cap_usd > 10_000_000 else 0.50
-            
-            # Take-profit levels based on category
-            if signal.category == "memecoin":
-                tp1_pct, tp2_pct, tp3_pct = -33, -67, -85
-            elif signal.category == "defi":
-                tp1_pct, tp2_pct, tp3_pct = -25, -50, -70
-            else:
-                tp1_pct, tp2_pct, tp3_pct = -20, -40, -60
-            
-            # Best chain selection (prefer deepest liquidity)
-            chain_liquidity = {
-                "ethereum": signal.tvl_usd * 0.5,
-                "arbitrum": signal.tvl_usd * 0.3,
-                "base": signal.tvl_usd * 0.15,
-                "optimism": signal.tvl_usd * 0.05
-            }
-            best_chain = max(chain_liquidity, key=chain_liquidity.get)
-            
-            # Estimate gas
-            gas_costs = {
-                "ethereum": 25.0,
-                "arbitrum": 2.0,
-                "base": 0.5,
-                "optimism": 1.5
-            }
-            
-            # Generate reasoning
-            if decision == "SHORT":
-                top_risks = risk_factors[:3]
-                reasoning = f"High-confidence short opportunity. {' + '.join(top_risks)}. "
-                reasoning += f"Execute on {best_chain} for optimal liquidity."
-            elif decision == "MONITOR":
-                reasoning = f"Moderate concerns detected: {', '.join(risk_factors[:2])}. "
-                reasoning += "Requires additional confirmation before entering position."
-            else:
-                reasoning = "Insufficient evidence for short position. Signals below confidence threshold."
-            
-            trade_plan = TradePlan(
-                token_symbol=signal.token_symbol,
-                token_address=signal.token_address,
-                chain=signal.chain,
-                decision=decision,
-                confidence=min(confidence, 100),
-                position_size_percent=position_size_pct,
-                position_size_usd=position_size_usd,
-                leverage=leverage,
-                entry_price=current_price,
-                take_profit_1=current_price * (1 + tp1_pct/100),
-                take_profit_1_percent=tp1_pct,
-                take_profit_2=current_price * (1 + tp2_pct/100),
-                take_profit_2_percent=tp2_pct,
-                take_profit_3=current_price * (1 + tp3_pct/100),
-                take_profit_3_percent=tp3_pct,
-                stop_loss=current_price * 1.12,
-                stop_loss_percent=12.0,
-                best_execution_chain=best_chain,
-                estimated_gas_usd=gas_costs.get(best_chain, 5.0),
-                reasoning=reasoning,
-                risk_factors=risk_factors,
-                analyzed_at=datetime.utcnow().isoformat(),
-                urgency_score=flagged.urgency_score
-            )
-            trade_plans.append(trade_plan)
+        analyzed_at = _utc_now_iso()  # One timestamp for the whole batch
         
+        if len(flagged_tokens) < PARALLEL_MOCK_MIN_TOKENS or _MOCK_POOL_WORKERS < 2:
+            trade_plans = _mock_trade_plans(flagged_tokens, analyzed_at)
+        else:
+            shard_size = -(-len(flagged_tokens) // _MOCK_POOL_WORKERS)  # ceil division
+            shards = [flagged_tokens[i:i + shard_size] for i in range(0, len(flagged_tokens), shard_size)]
+            trade_plans = [
+                plan
+                for shard in _get_mock_pool().map(_mock_trade_plans, shards, [analyzed_at] * len(shards))
+                for plan in shard
+            ]
+        
+        for flagged, trade_plan in zip(flagged_tokens, trade_plans):
+            self._emit_trade_plan(flagged, trade_plan)
         return trade_plans
     
+    def _emit_trade_plan(self, flagged: FlaggedToken, trade_plan: TradePlan):
+        """
+        Hand a plan to on_trade_plan, at most once per token per analyze_batch
+        
+        Retries, split fallbacks and duplicate addresses in a reply can build
+        a token's plan more than once; only the first one is delivered. Hook
+        errors are logged here so they never look like a Gemini failure.
+        """
+        if self.on_trade_plan is None:
+            return
+        with self._emit_lock:
+            if id(flagged) in self._emitted_tokens:
+                return
+            self._emitted_tokens.add(id(flagged))
+        try:
+            self.on_trade_plan(trade_plan)
+        except Exception as e:
+            logger.error(f"on_trade_plan hook failed for {trade_plan.token_symbol}: {e}")
+    
+    def _clear_emitted(self, flagged_tokens: List[FlaggedToken]):
+        """Forget emitted tokens once their batch has returned, so later batches emit again"""
+        with self._emit_lock:
+            self._emitted_tokens.difference_update(id(flagged) for flagged in flagged_tokens)
+    
     def _gemini_analyze_batch(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
         """
         Use Gemini for batch analysis with intelligent retry and rate limiting
@@ -401,59 +1052,39 @@ TIER 1 REASONING: {flagged.reasoning}
             return self._analyze_with_splitting(flagged_tokens)
         
         # Single batch processing with retry logic
-        tokens_data = self._format_tokens_batch(flagged_tokens)
-        prompt = self.BATCH_ANALYSIS_PROMPT.format(
-            num_tokens=len(flagged_tokens),
-            tokens_data=tokens_data
-        )
+        request = self._format_request(flagged_tokens)
+        
+        # Pre-flight: exact prompt size from the API, split before submitting if over budget
+        prompt_tokens = self._count_prompt_tokens(self._build_full_prompt(request))
+        if prompt_tokens > self.MAX_TOKENS_PER_BATCH and len(flagged_tokens) > 1:
+            logger.info(f"📏 Prompt is {prompt_tokens} tokens (> {self.MAX_TOKENS_PER_BATCH}), splitting batch...")
+            return self._analyze_with_splitting(flagged_tokens)
+        
+        service_tier = self._select_service_tier(flagged_tokens)
         
         # Try with retries and model fallbacks
         for retry_attempt in range(len(self.RETRY_DELAYS) + 1):
             try:
                 # Rate limiting
-                self._rate_limit()
+                self._rate_limit(prompt_tokens)
                 
                 current_model = self._get_current_model()
-                logger.info(f"📡 Sending BATCH request to Gemini ({current_model}) for {len(flagged_tokens)} tokens...")
+                logger.info(f"📡 Sending BATCH request to Gemini ({current_model}, {service_tier}) for {len(flagged_tokens)} tokens...")
                 
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config={
-                        "temperature": 1.0,
-                        "response_mime_type": "application/json"
-                    }
-                )
-                
-                # Parse JSON response
-                content = response.text
-                
-                # Extract JSON if wrapped in markdown
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0]
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0]
+                cache_name = self._get_prompt_cache()
+                prompt = self._prompt_for(request, cache_name)
                 
-                analyses = json.loads(content.strip())
+                # Stream the reply; TradePlans are built as each object arrives
+                with closing(self.client.models.generate_content_stream(
+                    model=current_model,
+                    contents=prompt,
+                    config=self._generation_config(cache_name, service_tier)
+                )) as chunks:
+                    stream = _AnalysisStream(chunks)
+                    trade_plans = self._parse_gemini_response(stream, flagged_tokens)
                 
-                # Estimate API cost (Gemini Flash is free tier friendly)
-                input_chars = len(prompt)
-                output_chars = len(content)
-                input_tokens = input_chars / 4
-                output_tokens = output_chars / 4
-                
-                # Cost varies by model (Flash is essentially free)
-                if "flash" in current_model.lower():
-                    cost = 0.0  # Free tier
-                else:
-                    cost = (input_tokens / 1_000_000 * 1.25) + (output_tokens / 1_000_000 * 5.0)
-                
-                self.stats["total_api_cost_usd"] += cost
-                self.stats["batch_requests"] += 1
-                
-                logger.info(f"✅ Received Gemini batch analysis for {len(analyses)} tokens (cost: ${cost:.4f})")
-                
-                # Build TradePlans from Gemini response
-                return self._parse_gemini_response(analyses, flagged_tokens)
+                self._record_cost(stream.usage, prompt, stream.text, cache_name, current_model, service_tier)
+                return trade_plans
                 
             except Exception as e:
                 error_str = str(e)
@@ -462,13 +1093,13 @@ TIER 1 REASONING: {flagged.reasoning}
                 # Try to parse error JSON
                 try:
                     if hasattr(e, 'message'):
-                        error_dict = json.loads(str(e.message)) if isinstance(e.message, str) else {}
+                        error_dict = orjson.loads(e.message) if isinstance(e.message, str) else {}
                     elif 'error' in error_str:
-                        # Extract JSON from error string
-                        import re
-                        json_match = re.search(r'\{.*\}', error_str, re.DOTALL)
-                        if json_match:
-                            error_dict = json.loads(json_match.group())
+                        # Extract JSON from error string (first '{' through last '}')
+                        json_start = error_str.find('{')
+                        json_end = error_str.rfind('}')
+                        if 0 <= json_start < json_end:
+                            error_dict = orjson.loads(error_str[json_start:json_end + 1])
                 except:
                     pass
                 
@@ -531,79 +1162,408 @@ TIER 1 REASONING: {flagged.reasoning}
         # Should never reach here, but fallback to mock
         return self._mock_analyze_batch(flagged_tokens)
     
+    def _prompt_for(self, request: str, cache_name: Optional[str]) -> str:
+        """Contents for a batch call: only the per-batch request, the instruction rides in the config"""
+        if cache_name:
+            self.stats["prompt_cache_hits"] += 1
+        return request
+    
+    def _generation_config(self, cache_name: Optional[str], service_tier: str) -> "types.GenerateContentConfig":
+        """Request config for a batch analysis call, built once per (cache, tier) and reused"""
+        config = self._gen_configs.get((cache_name, service_tier))
+        if config is not None:
+            return config
+        
+        # STANDARD is the API default; the pinned SDK has no typed service_tier
+        # field, so non-default tiers go through the raw request body
+        tier_http_options = (
+            types.HttpOptions(extra_body={"serviceTier": service_tier})
+            if service_tier != "STANDARD" else None
+        )
+        # A cached content already carries the system instruction, and the API
+        # rejects setting it again alongside cached_content
+        config = self._gen_configs[(cache_name, service_tier)] = types.GenerateContentConfig(
+            temperature=1.0,
+            response_mime_type="application/json",
+            system_instruction=None if cache_name else self.SYSTEM_INSTRUCTION,
+            cached_content=cache_name,
+            http_options=tier_http_options
+        )
+        return config
+    
+    def _handle_batch_response(self, response, prompt: str, cache_name: Optional[str],
+                               current_model: str, service_tier: str,
+                               flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """Parse a batch response, account its cost and build the TradePlans"""
+        content = response.text
+        analyses = _decode_analyses(content)
+        
+        self._record_cost(response.usage_metadata, prompt, content, cache_name, current_model, service_tier)
+        
+        # Build TradePlans from Gemini response
+        return self._parse_gemini_response(analyses, flagged_tokens)
+    
+    def _record_cost(self, usage, prompt: str, content: str, cache_name: Optional[str],
+                     current_model: str, service_tier: str):
+        """Account the cost of one Gemini request in stats"""
+        # API cost from the billed token counts (Gemini Flash is free tier friendly)
+        input_tokens, output_tokens = self._billed_tokens(usage, prompt, content, cache_name)
+        
+        # Cost varies by model (Flash is essentially free)
+        if "flash" in current_model.lower():
+            cost = 0.0  # Free tier
+        else:
+            cost = (input_tokens / 1_000_000 * 1.25) + (output_tokens / 1_000_000 * 5.0)
+        cost *= self.SERVICE_TIER_COST_MULTIPLIER[service_tier]
+        
+        self.stats["total_api_cost_usd"] += cost
+        self.stats["cost_by_tier"][service_tier] += cost
+        self.stats["batch_requests"] += 1
+        
+        logger.info(f"✅ Received Gemini batch analysis (cost: ${cost:.4f})")
+    
+    def _pack_by_token_budget(self, flagged_tokens: List[FlaggedToken]) -> List[List[FlaggedToken]]:
+        """
+        Greedily pack tokens into sub-batches whose estimated prompt stays
+        within MAX_TOKENS_PER_BATCH (and at most MAX_BATCH_SIZE tokens each)
+        """
+        budget = self.MAX_TOKENS_PER_BATCH - self._estimate_token_count(
+            self.SYSTEM_INSTRUCTION + self.USER_PAYLOAD_TEMPLATE.template
+        )
+        
+        chunks = []
+        current = []
+        used = 0
+        for flagged in flagged_tokens:
+            size = self._estimate_token_count(
+                _format_token_block(len(current) + 1, flagged.signal, flagged)
+            )
+            if current and (used + size > budget or len(current) >= self.MAX_BATCH_SIZE):
+                chunks.append(current)
+                current = []
+                used = 0
+            current.append(flagged)
+            used += size
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
+    async def _gemini_analyze_chunk_async(self, aio, chunk: List[FlaggedToken],
+                                          cache_name: Optional[str],
+                                          semaphore: asyncio.Semaphore) -> List[TradePlan]:
+        """
+        One non-blocking request for a sub-batch; on any error the chunk goes
+        through the synchronous path, which owns retries, fallbacks and splitting
+        """
+        request = self._format_request(chunk)
+        prompt = self._prompt_for(request, cache_name)
+        service_tier = self._select_service_tier(chunk)
+        current_model = self._get_current_model()
+        
+        try:
+            async with semaphore:
+                await self._rate_limit_async(self._estimate_token_count(self._build_full_prompt(request)))
+                response = await aio.models.generate_content(
+                    model=current_model,
+                    contents=prompt,
+                    config=self._generation_config(cache_name, service_tier)
+                )
+            return self._handle_batch_response(
+                response, prompt, cache_name, current_model, service_tier, chunk
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Async request for {len(chunk)} tokens failed ({e}), retrying synchronously...")
+            return await asyncio.to_thread(self._gemini_analyze_batch, chunk)
+    
+    async def _analyze_chunks_async(self, chunks: List[List[FlaggedToken]]) -> List[TradePlan]:
+        """Submit all sub-batches concurrently and concatenate their TradePlans in order"""
+        cache_name = await asyncio.to_thread(self._get_prompt_cache)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        # Async client scoped to this event loop (analyze_batch runs one loop per call)
+        async with genai.Client(api_key=self._api_key).aio as aio:
+            results = await asyncio.gather(*[
+                self._gemini_analyze_chunk_async(aio, chunk, cache_name, semaphore)
+                for chunk in chunks
+            ])
+        
+        return [trade_plan for trade_plans in results for trade_plan in trade_plans]
+    
     def _analyze_with_splitting(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
-        """Split large batch into smaller chunks and process sequentially"""
+        """
+        Split large batch into smaller chunks and send them concurrently
+        
+        Chunks share the MAX_CONCURRENT_REQUESTS semaphore instead of going out
+        one by one with a fixed gap; a chunk that errors (e.g. is rate limited
+        again) retries through the synchronous path with its own backoff.
+        """
         chunk_size = min(self.MAX_BATCH_SIZE, math.ceil(len(flagged_tokens) / 3))
         chunks = [flagged_tokens[i:i + chunk_size] for i in range(0, len(flagged_tokens), chunk_size)]
         
         self.stats["batches_split"] += 1
         logger.info(f"📦 Splitting {len(flagged_tokens)} tokens into {len(chunks)} batches of ~{chunk_size}")
         
-        all_trade_plans = []
-        for idx, chunk in enumerate(chunks, 1):
-            logger.info(f"  Processing chunk {idx}/{len(chunks)} ({len(chunk)} tokens)...")
-            trade_plans = self._gemini_analyze_batch(chunk)
-            all_trade_plans.extend(trade_plans)
-            
-            # Add delay between chunks to avoid rate limits
-            if idx < len(chunks):
-                time.sleep(2)
+        return _run_coroutine(self._analyze_chunks_async(chunks))
+    
+    def submit_batch_async(self, flagged_tokens: List[FlaggedToken]) -> str:
+        """
+        Submit tokens as a Batch Mode job (one request per token)
+        
+        Returns:
+            Job name to pass to poll_batch()
+        """
+        lines = []
+        for flagged in flagged_tokens:
+            lines.append(orjson.dumps({
+                "key": flagged.signal.token_address,
+                "request": {
+                    "system_instruction": {"parts": [{"text": self.SYSTEM_INSTRUCTION}]},
+                    "contents": [{"role": "user", "parts": [{"text": self._format_request([flagged])}]}],
+                    "generation_config": {
+                        "temperature": 1.0,
+                        "response_mime_type": "application/json"
+                    }
+                }
+            }))
+        
+        uploaded = self.client.files.upload(
+            file=io.BytesIO(b"\n".join(lines)),
+            config=types.UploadFileConfig(
+                display_name=f"tier2-batch-{int(time.time())}",
+                mime_type="jsonl"
+            )
+        )
+        job = self.client.batches.create(model=self.BATCH_MODEL, src=uploaded.name)
         
-        return all_trade_plans
+        self._batch_jobs[job.name] = list(flagged_tokens)
+        self.stats["batch_jobs_submitted"] += 1
+        logger.info(f"📨 Submitted batch job {job.name} for {len(flagged_tokens)} tokens ({self.BATCH_MODEL})")
+        return job.name
     
-    def _parse_gemini_response(self, analyses: List[Dict], flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
-        """Parse Gemini JSON response into TradePlan objects"""
-        trade_plans = []
+    def poll_batch(self, job_name: str) -> Optional[List[TradePlan]]:
+        """
+        Check a Batch Mode job
         
-        # Ensure we don't have length mismatch
-        if len(analyses) != len(flagged_tokens):
-            logger.warning(f"⚠️  Response mismatch: got {len(analyses)} analyses for {len(flagged_tokens)} tokens")
-            # Fallback to mock if mismatch
+        Returns:
+            TradePlans once the job has finished, None while it is still queued/running.
+            Tokens without a usable response fall back to mock analysis.
+        """
+        job = self.client.batches.get(name=job_name)
+        state = job.state.name
+        if state not in self.BATCH_DONE_STATES:
+            return None
+        
+        flagged_tokens = self._batch_jobs.pop(job_name, [])
+        try:
+            return self._read_batch_results(job, job_name, state, flagged_tokens)
+        finally:
+            self._clear_emitted(flagged_tokens)
+    
+    def _read_batch_results(self, job, job_name: str, state: str,
+                            flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """TradePlans for a finished Batch Mode job, mock analysis for tokens without a usable response"""
+        if state != "JOB_STATE_SUCCEEDED":
+            self.stats["batch_jobs_failed"] += 1
+            logger.error(f"Batch job {job_name} ended in {state}, using mock analysis")
             return self._mock_analyze_batch(flagged_tokens)
         
-        for analysis, flagged in zip(analyses, flagged_tokens):
+        by_address = {flagged.signal.token_address: flagged for flagged in flagged_tokens}
+        result_lines = self.client.files.download(file=job.dest.file_name).splitlines()
+        
+        trade_plans = []
+        for line in result_lines:
+            if not line.strip():
+                continue
             try:
-                signal = flagged.signal
-                current_price = 1.0  # Would come from price oracle
-                
-                trade_plan = TradePlan(
-                    token_symbol=analysis["token_symbol"],
-                    token_address=analysis["token_address"],
-                    chain=analysis["chain"],
-                    decision=analysis["decision"],
-                    confidence=analysis["confidence"],
-                    position_size_percent=analysis["position_size_percent"],
-                    position_size_usd=analysis.get("position_size_usd", analysis["position_size_percent"] * 500),
-                    leverage=analysis.get("leverage", 2),
-                    entry_price=current_price,
-                    take_profit_1=current_price * (1 + analysis["take_profit_levels"][0]["price_target"]/100),
-                    take_profit_1_percent=analysis["take_profit_levels"][0]["price_target"],
-                    take_profit_2=current_price * (1 + analysis["take_profit_levels"][1]["price_target"]/100),
-                    take_profit_2_percent=analysis["take_profit_levels"][1]["price_target"],
-                    take_profit_3=current_price * (1 + analysis["take_profit_levels"][2]["price_target"]/100),
-                    take_profit_3_percent=analysis["take_profit_levels"][2]["price_target"],
-                    stop_loss=current_price * (1 + analysis["stop_loss_percent"]/100),
-                    stop_loss_percent=analysis["stop_loss_percent"],
-                    best_execution_chain=analysis["best_execution_chain"],
-                    estimated_gas_usd=5.0,  # Would come from gas oracle
-                    reasoning=analysis["reasoning"],
-                    risk_factors=analysis["risk_factors"],
-                    analyzed_at=datetime.utcnow().isoformat(),
-                    urgency_score=flagged.urgency_score
-                )
+                result = orjson.loads(line)
+                flagged = by_address.pop(result["key"])
+                content = result["response"]["candidates"][0]["content"]["parts"][0]["text"]
+                analyses = _decode_analyses(content)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                logger.error(f"Failed to read batch result line in {job_name}: {e}")
+                continue
+            trade_plans.extend(self._parse_gemini_response(analyses, [flagged]))
+        
+        if by_address:
+            logger.warning(f"⚠️  {len(by_address)} tokens missing from batch results, using mock analysis")
+            trade_plans.extend(self._mock_analyze_batch(list(by_address.values())))
+        
+        self.stats["batch_requests"] += 1
+        logger.info(f"✅ Batch job {job_name} returned {len(trade_plans)} trade plans")
+        return trade_plans
+    
+    def _batch_mode_analyze(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """Submit a Batch Mode job and block until it finishes or BATCH_TIMEOUT_S elapses"""
+        try:
+            job_name = self.submit_batch_async(flagged_tokens)
+        except Exception as e:
+            logger.error(f"Batch submission failed ({e}), falling back to priority request")
+            self.stats["api_errors"] += 1
+            return self._gemini_analyze_batch(flagged_tokens)
+        
+        deadline = time.time() + self.BATCH_TIMEOUT_S
+        while time.time() < deadline:
+            try:
+                trade_plans = self.poll_batch(job_name)
+            except Exception as e:
+                logger.error(f"Batch poll failed for {job_name}: {e}")
+                self.stats["api_errors"] += 1
+                trade_plans = None
+            if trade_plans is not None:
+                return trade_plans
+            time.sleep(self.BATCH_POLL_INTERVAL_S)
+        
+        logger.error(f"Batch job {job_name} did not finish within {self.BATCH_TIMEOUT_S}s, using mock analysis")
+        return self._mock_analyze_batch(self._batch_jobs.pop(job_name, flagged_tokens))
+    
+    def _parse_gemini_response(self, analyses: Iterable[_GeminiAnalysis], flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """
+        Parse Gemini JSON response into TradePlan objects, in input order
+        
+        Analyses are matched to tokens by address, not position, and each plan
+        is built as its analysis is produced (analyses may be a live stream).
+        Tokens with no (or an unparseable) analysis fall back to mock analysis
+        individually.
+        """
+        trade_plans: List[Optional[TradePlan]] = [None] * len(flagged_tokens)
+        analyzed_at = _utc_now_iso()  # One timestamp for the whole response
+        
+        idx_by_addr: Dict[str, List[int]] = {}
+        for i, flagged in enumerate(flagged_tokens):
+            idx_by_addr.setdefault(flagged.signal.token_address.lower(), []).append(i)
+        
+        for analysis in analyses:
+            for i in idx_by_addr.get(analysis.token_address.lower(), ()):
+                if trade_plans[i] is not None:  # Repeated address in the reply, first analysis wins
+                    continue
+                flagged = flagged_tokens[i]
+                try:
+                    trade_plan = self._build_trade_plan(analysis, flagged, analyzed_at)
+                except ValueError as e:  # Fewer than 3 take-profit levels
+                    logger.error(f"Failed to parse analysis for {flagged.signal.token_symbol}: {e}")
+                    continue
                 
-                trade_plans.append(trade_plan)
+                trade_plans[i] = trade_plan
+                self._cache_put(flagged, trade_plan)
+                self._emit_trade_plan(flagged, trade_plan)
                 
                 logger.info(
                     f"  └─ {trade_plan.token_symbol}: {trade_plan.decision} "
                     f"(conf: {trade_plan.confidence}%)"
                 )
-            except (KeyError, IndexError) as e:
-                logger.error(f"Failed to parse analysis for {flagged.signal.token_symbol}: {e}")
-                continue
+        
+        fallback_idx = [i for i, trade_plan in enumerate(trade_plans) if trade_plan is None]
+        if fallback_idx:
+            logger.warning(
+                f"⚠️  No usable analysis for {len(fallback_idx)}/{len(flagged_tokens)} tokens, using mock analysis for those"
+            )
+            mock_plans = self._mock_analyze_batch([flagged_tokens[i] for i in fallback_idx])
+            for i, mock_plan in zip(fallback_idx, mock_plans):
+                trade_plans[i] = mock_plan
         
         return trade_plans
     
+    def _build_trade_plan(self, analysis: _GeminiAnalysis, flagged: FlaggedToken, analyzed_at: str) -> TradePlan:
+        """Convert one Gemini analysis into a TradePlan for its flagged token"""
+        signal = flagged.signal
+        current_price = 1.0  # Would come from price oracle
+        tp1, tp2, tp3 = (level.price_target for level in analysis.take_profit_levels[:3])
+        position_size_usd = analysis.position_size_usd
+        if position_size_usd is None:
+            position_size_usd = analysis.position_size_percent * 500
+        
+        return TradePlan(
+            token_symbol=signal.token_symbol,
+            token_address=signal.token_address,
+            chain=signal.chain,
+            decision=analysis.decision,
+            confidence=analysis.confidence,
+            position_size_percent=analysis.position_size_percent,
+            position_size_usd=position_size_usd,
+            leverage=analysis.leverage,
+            entry_price=current_price,
+            take_profit_1=current_price * (1 + tp1/100),
+            take_profit_1_percent=tp1,
+            take_profit_2=current_price * (1 + tp2/100),
+            take_profit_2_percent=tp2,
+            take_profit_3=current_price * (1 + tp3/100),
+            take_profit_3_percent=tp3,
+            stop_loss=current_price * (1 + analysis.stop_loss_percent/100),
+            stop_loss_percent=analysis.stop_loss_percent,
+            best_execution_chain=analysis.best_execution_chain,
+            estimated_gas_usd=5.0,  # Would come from gas oracle
+            reasoning=analysis.reasoning,
+            risk_factors=analysis.risk_factors,
+            analyzed_at=analyzed_at,
+            urgency_score=flagged.urgency_score
+        )
+    
+    def _cache_get(self, flagged: FlaggedToken) -> Optional[TradePlan]:
+        """Return a cached API plan for this token if its signals are unchanged and fresh"""
+        key = _result_cache_key(flagged)
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._result_cache[key]
+                return None
+            return entry[1]
+    
+    def _cache_put(self, flagged: FlaggedToken, trade_plan: TradePlan):
+        """Remember an API plan for RESULT_CACHE_TTL_S, evicting the oldest entry when full"""
+        key = _result_cache_key(flagged)
+        with self._cache_lock:
+            self._result_cache[key] = (time.monotonic() + self.RESULT_CACHE_TTL_S, trade_plan)
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _analyze_with_result_cache(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """
+        Reuse cached plans for tokens whose signals haven't changed, send the
+        rest to Gemini, and merge both back in input order
+        """
+        trade_plans = [self._cache_get(flagged) for flagged in flagged_tokens]
+        pending = [flagged for flagged, plan in zip(flagged_tokens, trade_plans) if plan is None]
+        
+        for flagged, plan in zip(flagged_tokens, trade_plans):
+            if plan is not None:
+                self._emit_trade_plan(flagged, plan)
+        
+        cache_hits = len(flagged_tokens) - len(pending)
+        self.stats["cache_misses"] += len(pending)
+        if cache_hits:
+            self.stats["cache_hits"] += cache_hits
+            logger.info(f"♻️  Reusing {cache_hits}/{len(flagged_tokens)} cached analyses")
+        if not pending:
+            return trade_plans
+        
+        fresh = {tp.token_address.lower(): tp for tp in self._analyze_uncached(pending)}
+        
+        # Tokens Gemini failed to return are dropped, as before
+        merged = []
+        for flagged, plan in zip(flagged_tokens, trade_plans):
+            if plan is None:
+                plan = fresh.get(flagged.signal.token_address.lower())
+            if plan is not None:
+                merged.append(plan)
+        return merged
+    
+    def _analyze_uncached(self, flagged_tokens: List[FlaggedToken]) -> List[TradePlan]:
+        """Send tokens to Gemini through Batch Mode or (concurrent) priority requests"""
+        if self.mode == "batch":
+            return self._batch_mode_analyze(flagged_tokens)
+        
+        chunks = self._pack_by_token_budget(flagged_tokens)
+        if len(chunks) == 1:
+            return self._gemini_analyze_batch(flagged_tokens)
+        
+        self.stats["batches_split"] += 1
+        logger.info(f"📦 Packed {len(flagged_tokens)} tokens into {len(chunks)} sub-batches, sending concurrently")
+        return _run_coroutine(self._analyze_chunks_async(chunks))
+    
     def analyze(self, flagged: FlaggedToken) -> TradePlan:
         """
         Analyze a single token (redirects to batch analysis for consistency)
@@ -635,10 +1595,13 @@ TIER 1 REASONING: {flagged.reasoning}
         
         logger.info(f"🔍 Analyzing {len(flagged_tokens)} tokens in SINGLE BATCH request...")
         
-        if self.mock_mode:
-            trade_plans = self._mock_analyze_batch(flagged_tokens)
-        else:
-            trade_plans = self._gemini_analyze_batch(flagged_tokens)
+        try:
+            if self.mock_mode:
+                trade_plans = self._mock_analyze_batch(flagged_tokens)
+            else:
+                trade_plans = self._analyze_with_result_cache(flagged_tokens)
+        finally:
+            self._clear_emitted(flagged_tokens)
         
         processing_time_ms = (time.time() - start_time) * 1000
         
@@ -652,13 +1615,10 @@ TIER 1 REASONING: {flagged.reasoning}
             else:
                 self.stats["total_passes"] += 1
         
-        # Update avg processing time
-        if self.stats["total_analyzed"] > 0:
-            self.stats["avg_processing_time_ms"] = (
-                (self.stats["avg_processing_time_ms"] * (self.stats["total_analyzed"] - len(trade_plans)) 
-                 + processing_time_ms)
-                / self.stats["total_analyzed"]
-            )
+        # Update avg processing time (EMA over batches)
+        self.stats["avg_processing_time_ms"] += self.PROCESSING_TIME_EMA_ALPHA * (
+            processing_time_ms - self.stats["avg_processing_time_ms"]
+        )
         
         # Log batch results
         shorts = sum(1 for tp in trade_plans if tp.decision == "SHORT")
@@ -672,13 +1632,19 @@ TIER 1 REASONING: {flagged.reasoning}
         
         return trade_plans
     
+    def close(self):
+        """Shut down the mock-analysis process pool (blocks until its workers exit)"""
+        _shutdown_mock_pool()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get analysis statistics including rate limiting info"""
         return {
             **self.stats,
+            "cost_by_tier": dict(self.stats["cost_by_tier"]),
             "short_rate": self.stats["total_shorts"] / max(self.stats["total_analyzed"], 1),
+            "cache_hit_rate": self.stats["cache_hits"] / max(self.stats["cache_hits"] + self.stats["cache_misses"], 1),
             "current_model": self._get_current_model() if not self.mock_mode else "mock",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _utc_now_iso()
         }
 
 
@@ -714,4 +1680,4 @@ if __name__ == "__main__":
     
     print("\n" + "="*80)
     print("STATS:")
-    print(json.dumps(analyzer.get_stats(), indent=2))
+    print(orjson.dumps(analyzer.get_stats(), option=orjson.OPT_INDENT_2).decode())
@@ -5,6 +5,7 @@ Uses Llama 3.2 3B Instruct for fast binary classification
 
 import logging
 from typing import List, Dict, Any, Tuple
+from dataclasses import asdict
 from datetime import datetime
 import json
 import time
@@ -32,7 +33,7 @@ class FlaggedToken:
             "urgency_score": self.urgency_score,
             "reasoning": self.reasoning,
             "flagged_at": self.flagged_at,
-            "full_signal": self.signal.__dict__
+            "full_signal": asdict(self.signal)
         }
 
 
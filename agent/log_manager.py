@@ -4,8 +4,8 @@ Stores logs in memory and provides API access
 """
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from collections import deque
+from typing import List, Dict, Any, Optional, Iterator
+from collections import deque, defaultdict
 from dataclasses import dataclass, asdict
 import threading
 
@@ -31,6 +31,10 @@ class LogManager:
         self.logs: deque = deque(maxlen=max_logs)
         self.log_counter = 0
         self.lock = threading.Lock()
+        
+        # Per-type / per-severity indexes over self.logs (same entries, same order)
+        self._by_type: Dict[str, deque] = defaultdict(deque)
+        self._by_severity: Dict[str, deque] = defaultdict(deque)
     
     def add_log(
         self,
@@ -52,7 +56,15 @@ class LogManager:
                 metadata=metadata or {}
             )
             
+            # Evict the oldest entry from the indexes when the main buffer is full
+            if len(self.logs) == self.max_logs:
+                oldest = self.logs[0]
+                self._by_type[oldest.type].popleft()
+                self._by_severity[oldest.severity].popleft()
+            
             self.logs.append(log_entry)
+            self._by_type[log_type].append(log_entry)
+            self._by_severity[severity].append(log_entry)
             
             # Print to console
             emoji_map = {
@@ -74,30 +86,52 @@ class LogManager:
         severity: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get logs with optional filtering"""
+        return list(self.iter_logs(limit=limit, log_type=log_type, severity=severity))
+    
+    def iter_logs(
+        self,
+        limit: Optional[int] = None,
+        log_type: Optional[str] = None,
+        severity: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield matching logs newest first, converting each entry lazily"""
+        if log_type == "all":
+            log_type = None
+        
         with self.lock:
-            logs = list(self.logs)
-            
-            # Filter by type
-            if log_type and log_type != "all":
-                logs = [log for log in logs if log.type == log_type]
-            
-            # Filter by severity
-            if severity:
-                logs = [log for log in logs if log.severity == severity]
-            
-            # Reverse to get newest first
-            logs.reverse()
-            
-            # Limit results
-            if limit:
-                logs = logs[:limit]
+            # Scan the narrowest index; only a two-filter query needs a per-entry check
+            if log_type and severity:
+                by_type = self._by_type.get(log_type, ())
+                by_severity = self._by_severity.get(severity, ())
+                if len(by_type) <= len(by_severity):
+                    source, attr, value = by_type, "severity", severity
+                else:
+                    source, attr, value = by_severity, "type", log_type
+            elif log_type:
+                source, attr, value = self._by_type.get(log_type, ()), None, None
+            elif severity:
+                source, attr, value = self._by_severity.get(severity, ()), None, None
+            else:
+                source, attr, value = self.logs, None, None
             
-            return [log.to_dict() for log in logs]
+            # Snapshot up to `limit` entry references, newest first
+            logs = []
+            for log in reversed(source):
+                if attr and getattr(log, attr) != value:
+                    continue
+                logs.append(log)
+                if limit and len(logs) >= limit:
+                    break
+        
+        for log in logs:
+            yield log.to_dict()
     
     def clear_logs(self):
         """Clear all logs"""
         with self.lock:
             self.logs.clear()
+            self._by_type.clear()
+            self._by_severity.clear()
             self.log_counter = 0
     
     def get_stats(self) -> Dict[str, Any]:
@@ -6,10 +6,12 @@ Coordinates Tier 1 → Tier 2 flow with batching, caching, and error handling
 import logging
 import time
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from collections import deque
 
+import orjson
+
 from .data_ingestion import DataIngestion, TokenSignal
 from .local_llm_screener import LocalLLMScreener, FlaggedToken
 from .gemini_analyzer import GeminiAnalyzer, TradePlan
@@ -68,6 +70,7 @@ class OrchestrationEngine:
         self.signal_queue = deque()  # Incoming raw signals
         self.flagged_queue = deque()  # Tier 1 flagged tokens
         self.trade_plans = []  # Tier 2 outputs
+        self.trade_plans_version = 0  # Bumped whenever trade_plans changes
         
         # Aggregated stats
         self.stats = {
@@ -85,6 +88,9 @@ class OrchestrationEngine:
         }
         
         self.is_running = False
+        
+        # Pre-serialized get_full_stats() payload, refreshed after each cycle
+        self._stats_cache_bytes: Optional[bytes] = None
     
     def ingest_signals(self, count: int = 100, rug_pull_ratio: float = 0.05):
         """
@@ -197,7 +203,28 @@ class OrchestrationEngine:
             })
             return []
     
-    def process_tier2_batch(self, flagged: List[FlaggedToken]) -> List[TradePlan]:
+    def _ingest_and_screen(self, signals_per_cycle: int):
+        """
+        Ingest new signals and drain the queue through Tier 1
+        
+        Returns:
+            (number of Tier 1 batches, all flagged tokens)
+        """
+        # Step 1: Ingest new signals
+        self.ingest_signals(count=signals_per_cycle)
+        
+        # Step 2: Process all pending signals through Tier 1
+        tier1_batches = 0
+        total_flagged = []
+        
+        while self.signal_queue:
+            flagged = self.process_tier1_batch()
+            total_flagged.extend(flagged)
+            tier1_batches += 1
+        
+        return tier1_batches, total_flagged
+    
+    async def process_tier2_batch(self, flagged: List[FlaggedToken]) -> List[TradePlan]:
         """
         Process flagged tokens through Tier 2 analysis
         
@@ -213,7 +240,7 @@ class OrchestrationEngine:
         logger.info(f"Processing Tier 2 batch ({len(flagged)} tokens)...")
         
         try:
-            trade_plans = self.tier2_analyzer.analyze_batch(flagged)
+            trade_plans = await asyncio.to_thread(self.tier2_analyzer.analyze_batch, flagged)
             
             # Update stats
             self.stats["tier2_analyzed"] += len(trade_plans)
@@ -227,9 +254,10 @@ class OrchestrationEngine:
             
             # Store trade plans
             self.trade_plans.extend(trade_plans)
+            self.trade_plans_version += 1
             
             # Execute trade plans with hybrid strategy routing
-            self._execute_trade_plans(trade_plans)
+            await self._execute_trade_plans(trade_plans)
             
             logger.info(
                 f"Tier 2 complete: {self.stats['tier2_shorts']} shorts, "
@@ -247,7 +275,7 @@ class OrchestrationEngine:
             })
             return []
     
-    def _execute_trade_plans(self, trade_plans: List[TradePlan]):
+    async def _execute_trade_plans(self, trade_plans: List[TradePlan]):
         """
         Execute trade plans using hybrid strategy routing
         Routes to GMX shorts, correlated shorts, or dip buys
@@ -277,13 +305,13 @@ class OrchestrationEngine:
                 
                 # Route to appropriate execution method
                 if classification.strategy == Strategy.GMX_SHORT:
-                    self._execute_gmx_short(plan, classification)
+                    await self._execute_gmx_short(plan, classification)
                     
                 elif classification.strategy == Strategy.CORRELATED_SHORT:
-                    self._execute_correlated_short(plan, classification)
+                    await self._execute_correlated_short(plan, classification)
                     
                 elif classification.strategy == Strategy.DIP_BUY:
-                    self._execute_dip_buy(plan, classification)
+                    await self._execute_dip_buy(plan, classification)
                     
                 else:
                     logger.info(f"Skipping {plan.token_symbol}: {classification.reason}")
@@ -291,14 +319,14 @@ class OrchestrationEngine:
             except Exception as e:
                 logger.error(f"Execution error for {plan.token_symbol}: {e}")
     
-    def _execute_gmx_short(self, plan: TradePlan, classification: Classification):
+    async def _execute_gmx_short(self, plan: TradePlan, classification: Classification):
         """Execute GMX perpetual short on blue-chip token"""
         
         logger.info(f"Executing GMX SHORT for {plan.token_symbol}")
         
         # PROACTIVE FUND MANAGEMENT: Check vault balance first
         try:
-            vault_balance = self.blockchain.get_vault_balance()
+            vault_balance = await self.blockchain.get_vault_balance()
             required_balance = plan.position_size_usd
             
             source_chain = 'arbitrum' # Default: same chain execution
@@ -308,7 +336,7 @@ class OrchestrationEngine:
                 # In production, this would be the chain where the agent's main treasury lives
                 source_chain = 'base' 
             
-            result = self.blockchain.execute_short(
+            result = await self.blockchain.execute_short(
                 index_token=plan.token_symbol,
                 collateral_usdc=int(plan.position_size_usd * 1_000_000),  # Convert to 6 decimals
                 leverage=min(plan.leverage, 10),  # Cap at 10x leverage
@@ -324,7 +352,7 @@ class OrchestrationEngine:
         except Exception as e:
             logger.error(f"GMX SHORT failed for {plan.token_symbol}: {e}")
     
-    def _execute_correlated_short(self, plan: TradePlan, classification: Classification):
+    async def _execute_correlated_short(self, plan: TradePlan, classification: Classification):
         """Short correlated blue-chip when memecoin about to rug"""
         
         correlated = classification.correlated_asset or 'WETH'
@@ -335,7 +363,7 @@ class OrchestrationEngine:
         adjusted_confidence = int(plan.confidence * 0.7)  # 70% of original confidence
         
         try:
-                result = self.blockchain.execute_short(
+                result = await self.blockchain.execute_short(
                     index_token=correlated,
                     collateral_usdc=int(adjusted_size * 1_000_000),
                     leverage=2,  # Conservative 2x leverage
@@ -354,7 +382,7 @@ class OrchestrationEngine:
         except Exception as e:
             logger.error(f"CORRELATED SHORT failed for {plan.token_symbol}: {e}")
     
-    def _execute_dip_buy(self, plan: TradePlan, classification: Classification):
+    async def _execute_dip_buy(self, plan: TradePlan, classification: Classification):
         """Buy memecoin dip after rug for dead cat bounce"""
         
         logger.info(f"Executing DIP BUY for {plan.token_symbol} (dropped {classification.price_drop_24h}%)")
@@ -365,7 +393,7 @@ class OrchestrationEngine:
             return
         
         # Small position size for high-risk dip buys (max 5% of vault)
-        max_size_usdc = self.blockchain.get_vault_balance() * 0.05 if hasattr(self.blockchain, 'get_vault_balance') else 5000
+        max_size_usdc = (await self.blockchain.get_vault_balance()) * 0.05 if hasattr(self.blockchain, 'get_vault_balance') else 5000
         position_size = min(plan.position_size_usd, max_size_usdc)
         
         # Calculate targets
@@ -374,7 +402,7 @@ class OrchestrationEngine:
         stop_loss = current_price * 0.85   # -15% stop loss
         
         try:
-                result = self.blockchain.execute_dip_buy(
+                result = await self.blockchain.execute_dip_buy(
                     token=plan.token_address or '',
                     chain=plan.chain or 'base',
                     amount_usdc=int(position_size * 1_000_000),
@@ -394,7 +422,7 @@ class OrchestrationEngine:
         except Exception as e:
             logger.error(f"DIP BUY failed for {plan.token_symbol}: {e}")
     
-    def run_cycle(self, signals_per_cycle: int = 500) -> Dict[str, Any]:
+    async def run_cycle(self, signals_per_cycle: int = 500) -> Dict[str, Any]:
         """
         Run one complete screening cycle
         
@@ -410,21 +438,14 @@ class OrchestrationEngine:
         logger.info(f"STARTING CYCLE #{self.stats['cycles_completed'] + 1}")
         logger.info("="*80)
         
-        # Step 1: Ingest new signals
-        self.ingest_signals(count=signals_per_cycle)
-        
-        # Step 2: Process all pending signals through Tier 1
-        tier1_batches = 0
-        total_flagged = []
-        
-        while self.signal_queue:
-            flagged = self.process_tier1_batch()
-            total_flagged.extend(flagged)
-            tier1_batches += 1
+        # Steps 1-2 are CPU-bound - run them off the event loop
+        tier1_batches, total_flagged = await asyncio.to_thread(
+            self._ingest_and_screen, signals_per_cycle
+        )
         
         # Step 3: Process all flagged tokens through Tier 2
         if total_flagged:
-            trade_plans = self.process_tier2_batch(total_flagged)
+            trade_plans = await self.process_tier2_batch(total_flagged)
         else:
             trade_plans = []
         
@@ -459,6 +480,8 @@ class OrchestrationEngine:
         logger.info(f"  Cost: ${tier2_stats.get('total_api_cost_usd', 0.0):.4f}")
         logger.info("="*80)
         
+        self._stats_cache_bytes = orjson.dumps(self.get_full_stats())
+        
         return cycle_summary
     
     def get_short_recommendations(self, min_confidence: int = 70) -> List[TradePlan]:
@@ -497,6 +520,21 @@ class OrchestrationEngine:
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    async def warmup(self):
+        """Prime the stats snapshot and the worker thread pool used by run_cycle"""
+        await asyncio.to_thread(self.get_stats_snapshot)
+    
+    async def aclose(self):
+        """Release network resources and worker processes held by the engine"""
+        await self.blockchain.aclose()
+        await asyncio.to_thread(self.tier2_analyzer.close)
+    
+    def get_stats_snapshot(self) -> bytes:
+        """Get get_full_stats() as JSON bytes, cached until the next cycle completes"""
+        if self._stats_cache_bytes is None:
+            self._stats_cache_bytes = orjson.dumps(self.get_full_stats())
+        return self._stats_cache_bytes
+    
     def clear_old_plans(self, max_age_hours: int = 24):
         """Clear trade plans older than max_age_hours"""
         # TODO: Implement based on analyzed_at timestamp
@@ -513,7 +551,7 @@ if __name__ == "__main__":
     )
     
     # Run a single cycle
-    summary = engine.run_cycle(signals_per_cycle=500)
+    summary = asyncio.run(engine.run_cycle(signals_per_cycle=500))
     
     # Get short recommendations
     shorts = engine.get_short_recommendations(min_confidence=75)
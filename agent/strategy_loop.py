@@ -92,7 +92,7 @@ class NEXUSStrategyLoop:
                 await self._manage_positions()
                 
                 # PHASE 5: REPORT - Display status
-                self._report_status()
+                await self._report_status()
                 
             except Exception as e:
                 print(f"❌ Error in cycle {cycle_count}: {e}")
@@ -137,7 +137,7 @@ class NEXUSStrategyLoop:
         try:
             # Run orchestration cycle
             print("   🧠 Running Tier 1 + Tier 2 analysis...")
-            results = self.orchestration.run_cycle()
+            results = await self.orchestration.run_cycle()
             
             # Extract SHORT recommendations
             shorts = results.get('shorts', [])
@@ -198,28 +198,31 @@ class NEXUSStrategyLoop:
         
         print(f"   📊 Position slots: {current_positions}/{self.max_positions}")
         
-        # Execute top N trades (up to available slots)
-        for i, trade_plan in enumerate(trade_plans[:slots_available]):
-            try:
-                print(f"\n   ⚡ Executing trade {i+1}/{min(len(trade_plans), slots_available)}")
-                
-                # Execute via contract
-                tx_hash = self.executor.execute_short(trade_plan)
-                
-                # Track position
-                position_id = i + 1  # Simplified (parse from contract events in production)
-                self.active_positions[position_id] = {
-                    'trade_plan': trade_plan,
-                    'tx_hash': tx_hash,
-                    'timestamp': datetime.now(),
-                    'status': 'OPEN'
-                }
-                
-                print(f"   ✅ Position #{position_id} opened")
-                print(f"      TX: https://arbiscan.io/tx/{tx_hash}")
-                
-            except Exception as e:
-                print(f"   ❌ Trade execution failed: {e}")
+        # Execute top N trades (up to available slots) concurrently, so their
+        # RPC round trips and confirmation waits overlap
+        selected = trade_plans[:slots_available]
+        print(f"\n   ⚡ Executing {len(selected)} trades")
+        results = await asyncio.gather(
+            *(self.executor.execute_short(trade_plan) for trade_plan in selected),
+            return_exceptions=True
+        )
+        
+        for i, (trade_plan, tx_hash) in enumerate(zip(selected, results)):
+            if isinstance(tx_hash, Exception):
+                print(f"   ❌ Trade execution failed: {tx_hash}")
+                continue
+            
+            # Track position
+            position_id = i + 1  # Simplified (parse from contract events in production)
+            self.active_positions[position_id] = {
+                'trade_plan': trade_plan,
+                'tx_hash': tx_hash,
+                'timestamp': datetime.now(),
+                'status': 'OPEN'
+            }
+            
+            print(f"   ✅ Position #{position_id} opened")
+            print(f"      TX: https://arbiscan.io/tx/{tx_hash}")
     
     async def _manage_positions(self):
         """
@@ -234,7 +237,7 @@ class NEXUSStrategyLoop:
         
         try:
             # Get current positions from contract
-            contract_positions = self.executor.get_open_positions()
+            contract_positions = await self.executor.get_open_positions()
             
             print(f"   📊 Active positions: {len(contract_positions)}")
             
@@ -254,12 +257,12 @@ class NEXUSStrategyLoop:
                 # Example: Close after 24 hours
                 if age_hours > 24:
                     print(f"      ⚠️  Position aged out, closing...")
-                    # self.executor.close_position(position_id, min_exit_price=...)
+                    # await self.executor.close_position(position_id, min_exit_price=...)
                 
         except Exception as e:
             print(f"   ⚠️  Position management failed: {e}")
     
-    def _report_status(self):
+    async def _report_status(self):
         """
         PHASE 5: Report overall system status
         """
@@ -268,7 +271,7 @@ class NEXUSStrategyLoop:
         
         try:
             # Get vault balance
-            vault_balance = self.executor.get_vault_balance()
+            vault_balance = await self.executor.get_vault_balance()
             print(f"   Vault Balance: ${vault_balance:,.2f} USDC")
             
             # Position count
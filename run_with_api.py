@@ -106,7 +106,7 @@ async def run_live_system():
             log_analysis(f"Tier 1 flagged {len(flagged_tokens)} tokens", severity="high")
             
             log_analysis(f"Tier 2 analyzing {len(flagged_tokens)} tokens", severity="info")
-            trade_plans = orchestration.process_tier2_batch(flagged_tokens)
+            trade_plans = await orchestration.process_tier2_batch(flagged_tokens)
             
             if trade_plans:
                 print(f"\n✅ Generated {len(trade_plans)} trade recommendations")
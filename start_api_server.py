@@ -35,6 +35,8 @@ if __name__ == "__main__":
         "agent.api_server:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=False,
         log_level="info"
     )
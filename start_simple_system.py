@@ -48,7 +48,7 @@ async def run_trading_cycle():
         # Run orchestration
         log_analysis("🧠 Running AI orchestration (Tier 1 + Tier 2)")
         orchestrator = OrchestrationEngine()
-        result = orchestrator.run_cycle(signals_per_cycle=len(signals))
+        result = await orchestrator.run_cycle(signals_per_cycle=len(signals))
         
         # Log results
         flagged_count = result.get('tier1_flagged_count', 0)
@@ -5,6 +5,7 @@ Runs a complete screening cycle and displays results
 """
 
 import sys
+import asyncio
 import json
 from agent.orchestration import OrchestrationEngine
 
@@ -27,7 +28,7 @@ def main():
     # Run a cycle
     print("Running screening cycle (500 signals)...")
     print("-"*80)
-    summary = engine.run_cycle(signals_per_cycle=500)
+    summary = asyncio.run(engine.run_cycle(signals_per_cycle=500))
     print()
     
     # Get results
@@ -3,6 +3,7 @@ Full Integration Demo: AI Agent → Blockchain Execution
 Shows signals → Tier 1 → Tier 2 → Publish to SignalOracle → Execute shorts via NexusVault
 """
 
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -21,7 +22,7 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-def main():
+async def main():
     print("\n" + "="*80)
     print("🚀 NEXUS FULL INTEGRATION DEMO")
     print("AI Agent → Blockchain Execution Pipeline")
@@ -70,7 +71,7 @@ def main():
                 'chain': 'arbitrum'
             })
         
-        tx_hash = engine.blockchain.publish_signals(signals_to_publish)
+        tx_hash = await engine.blockchain.publish_signals(signals_to_publish)
         if tx_hash:
             print(f"✅ Signals published on-chain: {tx_hash}")
     else:
@@ -80,7 +81,7 @@ def main():
     print("-" * 80)
     
     # Process through Tier 2
-    trade_plans = engine.process_tier2_batch(flagged)
+    trade_plans = await engine.process_tier2_batch(flagged)
     
     # Show shorts
     shorts = [tp for tp in trade_plans if tp.decision == "SHORT"]
@@ -101,7 +102,7 @@ def main():
         top_short = shorts[0]
         
         if top_short.confidence >= 75:
-            result = engine.blockchain.execute_short(
+            result = await engine.blockchain.execute_short(
                 token_symbol=top_short.token_symbol,
                 chain='arbitrum',  # Or extract from short
                 amount_usdc=20_000_000,  # 20 USDC (6 decimals)
@@ -138,7 +139,7 @@ def main():
         print(f"   Shorts executed: {blockchain_stats['shorts_executed']}")
         
         # Get on-chain metrics
-        metrics = engine.blockchain.get_performance_metrics()
+        metrics = await engine.blockchain.get_performance_metrics()
         if metrics:
             print(f"\n📊 On-Chain Performance:")
             print(f"   Total positions: {metrics.get('totalPositions', 0)}")
@@ -157,4 +158,4 @@ def main():
     print("   5. Monitor positions via frontend dashboard\n")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
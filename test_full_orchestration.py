@@ -6,6 +6,7 @@ Demonstrates complete pipeline: Social + Token signals → Tier 1 → Tier 2
 
 import os
 import sys
+import asyncio
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -86,7 +87,7 @@ def main():
     print("RUNNING PROCESSING CYCLE")
     print("="*80 + "\n")
     
-    summary = engine.run_cycle()
+    summary = asyncio.run(engine.run_cycle())
     
     # Display results
     print("\n" + "="*80)
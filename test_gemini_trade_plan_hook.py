@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+GeminiAnalyzer on_trade_plan Hook Test
+Checks that every trade plan reaches the hook exactly once, even when the
+streamed reply fails midway and the batch is retried
+"""
+
+import json
+import re
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import agent.gemini_analyzer as gemini_analyzer
+from agent.data_ingestion import DataIngestion
+from agent.local_llm_screener import LocalLLMScreener
+from agent.gemini_analyzer import GeminiAnalyzer
+
+
+API_REASONING = "from the fake Gemini stream"
+
+
+def _flagged_tokens(count):
+    batch = DataIngestion().generate_batch(size=60, rug_pull_ratio=0.3)
+    return LocalLLMScreener(mock_mode=True).screen_batch(batch)[:count]
+
+
+def _analysis(address):
+    return {
+        "token_symbol": "X", "token_address": address, "chain": "ethereum",
+        "decision": "SHORT", "confidence": 80, "position_size_percent": 10,
+        "take_profit_levels": [{"price_target": -20}, {"price_target": -40}, {"price_target": -60}],
+        "stop_loss_percent": 12, "best_execution_chain": "base",
+        "reasoning": API_REASONING, "risk_factors": ["test"],
+    }
+
+
+class FakeModels:
+    """Streams a JSON array of analyses for every address in the prompt"""
+
+    def __init__(self, fail_first_after_chunks=None, duplicate=False, drop_last=False):
+        self.fail_first_after_chunks = fail_first_after_chunks
+        self.duplicate = duplicate
+        self.drop_last = drop_last
+        self.calls = 0
+
+    def generate_content_stream(self, model, contents, config):
+        self.calls += 1
+        addresses = re.findall(r"Address: (\S+)", contents)
+        if self.drop_last:
+            addresses = addresses[:-1]
+        if self.duplicate:
+            addresses = addresses + addresses
+        text = json.dumps([_analysis(address) for address in addresses])
+        fail_after = self.fail_first_after_chunks if self.calls == 1 else None
+
+        def chunks():
+            for n, i in enumerate(range(0, len(text), 64)):
+                if fail_after is not None and n == fail_after:
+                    raise RuntimeError("connection reset mid-stream")
+                yield SimpleNamespace(text=text[i:i + 64], usage_metadata=None)
+        return chunks()
+
+
+class FakeCaches:
+    def create(self, model, config):
+        return SimpleNamespace(name="cachedContents/" + model)
+
+
+@pytest.fixture
+def make_analyzer(monkeypatch):
+    """Build a non-mock GeminiAnalyzer whose SDK client and config types are fakes"""
+    monkeypatch.setattr(gemini_analyzer, "types", SimpleNamespace(
+        GenerateContentConfig=SimpleNamespace,
+        HttpOptions=SimpleNamespace,
+        CreateCachedContentConfig=SimpleNamespace,
+    ))
+    monkeypatch.setattr(GeminiAnalyzer, "RETRY_DELAYS", [0, 0, 0])
+    
+    def build(models, hook):
+        client = SimpleNamespace(models=models, caches=FakeCaches())
+        monkeypatch.setattr(gemini_analyzer, "genai", SimpleNamespace(Client=lambda api_key: client))
+        return GeminiAnalyzer(api_key="test-key", mock_mode=False, on_trade_plan=hook)
+    return build
+
+
+def test_mid_stream_failure_emits_each_plan_once(make_analyzer):
+    flagged = _flagged_tokens(5)
+    emitted = []
+    models = FakeModels(fail_first_after_chunks=12)  # Past the first few analyses
+    trade_plans = make_analyzer(models, emitted.append).analyze_batch(flagged)
+
+    assert models.calls == 2
+    assert len(trade_plans) == len(flagged)
+    addresses = [plan.token_address for plan in emitted]
+    assert sorted(addresses) == sorted(f.signal.token_address for f in flagged)
+    assert all(plan.reasoning == API_REASONING for plan in emitted)
+
+
+def test_duplicate_addresses_emit_once(make_analyzer):
+    flagged = _flagged_tokens(4)
+    emitted = []
+    models = FakeModels(duplicate=True)
+    make_analyzer(models, emitted.append).analyze_batch(flagged)
+
+    assert models.calls == 1
+    assert len(emitted) == len(flagged)
+    assert all(plan.reasoning == API_REASONING for plan in emitted)
+    assert len({plan.token_address for plan in emitted}) == len(flagged)
+
+
+def test_hook_errors_are_not_retried(make_analyzer):
+    flagged = _flagged_tokens(3)
+    seen = []
+
+    def failing_hook(plan):
+        seen.append(plan)
+        raise RuntimeError("consumer queue full")
+
+    models = FakeModels()
+    trade_plans = make_analyzer(models, failing_hook).analyze_batch(flagged)
+
+    assert models.calls == 1
+    assert len(trade_plans) == len(flagged)
+    assert len(seen) == len(flagged)
+    assert all(plan.reasoning == API_REASONING for plan in trade_plans)
+
+
+def test_mock_fallback_and_cache_hits_are_emitted(make_analyzer):
+    flagged = _flagged_tokens(4)
+    emitted = []
+    models = FakeModels(drop_last=True)
+    analyzer = make_analyzer(models, emitted.append)
+
+    analyzer.analyze_batch(flagged)
+    assert models.calls == 1
+    assert len(emitted) == len(flagged)
+    assert [plan.reasoning == API_REASONING for plan in emitted] == [True, True, True, False]
+
+    analyzer.analyze_batch(flagged)  # Only the mock-analyzed token goes back to Gemini
+    assert models.calls == 2
+    assert analyzer.stats["cache_hits"] == len(flagged) - 1
+    assert len(emitted) == 2 * len(flagged)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))